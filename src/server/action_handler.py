@@ -2,53 +2,94 @@
 Web Player - 액션 처리
 """
 import logging
-from typing import Optional
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
 
-import pyautogui
-
-from .models import ActionRequest, ActionResponse
+from .input_backends import InputBackend, PyAutoGuiBackend
+from .input_worker import COALESCED, InputWorker
+from .models import (
+    MAX_SCROLL_AMOUNT, ActionBatchRequest, ActionBatchResponse, ActionBatchStep, ActionRequest, ActionResponse,
+    ActionStepResult
+)
 
 logger = logging.getLogger(__name__)
 
-# PyAutoGUI 안전 설정
-pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 0.1
+ACTION_TYPES = ("click", "double_click", "right_click", "drag", "type", "hotkey", "scroll", "hover")
+
+# x, y가 반드시 있어야 하는 액션 (영역 좌표를 전역 좌표로 바꿔 실행, 스크롤은 위치 생략 가능)
+POINTER_ACTIONS = ("click", "double_click", "right_click", "hover")
+
+# 입력 대기열에서 앞선 같은 종류의 대기 액션과 합칠 수 있는 액션
+COALESCING_ACTIONS = ("hover", "scroll")
+
+# 스크롤 한 단계(amount 1)의 휠 클릭 수
+SCROLL_CLICKS = 5
 
 
 class ActionHandler:
-    """액션 처리 핸들러"""
+    """
+    액션 처리 핸들러
 
-    def __init__(self, screen_width: int, screen_height: int):
+    액션 좌표는 캡처 영역 기준(영역 좌상단이 0,0)으로 받아 검증하고,
+    실행 직전에 영역 원점(offset)을 더해 전역 화면 좌표로 변환한다.
+    검증은 이벤트 루프에서, 입력 백엔드 호출은 입력 워커 스레드에서 순서대로 실행한다.
+    """
+
+    def __init__(
+        self,
+        screen_width: int,
+        screen_height: int,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        worker: Optional[InputWorker] = None,
+        backend: Optional[InputBackend] = None
+    ):
+        """
+        Args:
+            screen_width: 캡처 영역 너비
+            screen_height: 캡처 영역 높이
+            offset_x: 캡처 영역 원점의 전역 X 좌표
+            offset_y: 캡처 영역 원점의 전역 Y 좌표
+            worker: 입력 워커 (모니터별 핸들러가 공유, 기본값: 새 워커)
+            backend: 입력 백엔드 (모니터별 핸들러가 공유, 기본값: pyautogui)
+        """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        logger.info(f"ActionHandler initialized: {screen_width}x{screen_height}")
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.worker = worker or InputWorker()
+        self.backend = backend or PyAutoGuiBackend()
+        # 실행한 액션을 받을 콜백 (세션 녹화용, ScreenController.record_action)
+        self.on_action: Optional[Callable[[dict], None]] = None
+        logger.info(f"ActionHandler initialized: {screen_width}x{screen_height}+{offset_x}+{offset_y}")
+
+    def to_global(self, x: int, y: int) -> Tuple[int, int]:
+        """영역 좌표 → 전역 화면 좌표"""
+        return x + self.offset_x, y + self.offset_y
+
+    def to_local(self, x: int, y: int) -> Tuple[int, int]:
+        """전역 화면 좌표 → 영역 좌표"""
+        return x - self.offset_x, y - self.offset_y
 
     async def process_action(self, action: ActionRequest) -> ActionResponse:
-        """액션 처리"""
+        """
+        액션 처리
+
+        입력 워커 대기열에 넣고 실행이 끝날 때까지 기다린다 (이벤트 루프는 막지 않음).
+        호버/스크롤은 아직 실행되지 않은 직전 호버/스크롤과 합쳐질 수 있다
+        (호버는 마지막 위치만, 스크롤은 양을 더해 한 번 실행).
+        """
         try:
             self._validate_action(action)
-            action_type = action.action_type
-
-            if action_type == "click":
-                self._handle_click(action.x, action.y)
-            elif action_type == "double_click":
-                self._handle_double_click(action.x, action.y)
-            elif action_type == "right_click":
-                self._handle_right_click(action.x, action.y)
-            elif action_type == "drag":
-                self._handle_drag(action.start_x, action.start_y, action.end_x, action.end_y)
-            elif action_type == "type":
-                self._handle_type(action.text)
-            elif action_type == "hotkey":
-                self._handle_hotkey(action.key)
-            elif action_type == "scroll":
-                self._handle_scroll(action.x, action.y, action.direction)
-            elif action_type == "hover":
-                self._handle_hover(action.x, action.y)
-            else:
-                raise ValueError(f"Unknown action type: {action_type}")
-
-            logger.info(f"Action executed: {action_type}")
+            key = action.action_type if action.action_type in COALESCING_ACTIONS else None
+            executed = await self.worker.submit(self._execute, action, key=key, merge=self._merge)
+            if executed is COALESCED:
+                logger.debug(f"Action coalesced: {action.action_type}")
+                return ActionResponse(status="success")
+
+            logger.info(f"Action executed: {action.action_type}")
+            if self.on_action:
+                self.on_action(executed.model_dump(exclude_none=True))
             return ActionResponse(status="success")
 
         except ValueError as e:
@@ -58,8 +99,127 @@ class ActionHandler:
             logger.error(f"Action processing error: {e}", exc_info=True)
             return ActionResponse(status="error", code="EXECUTION_ERROR", message=str(e))
 
+    async def process_batch(self, batch: ActionBatchRequest) -> ActionBatchResponse:
+        """
+        매크로(action_batch) 처리
+
+        모든 단계를 먼저 검증하고(하나라도 잘못되면 아무것도 실행하지 않음),
+        입력 워커에 한 항목으로 넣어 다른 액션이 끼어들지 않게 연달아 실행한다.
+        단계 사이에는 백엔드의 고정 대기(pyautogui.PAUSE) 대신 단계별 delay_ms만큼 기다린다.
+        """
+        start = time.monotonic()
+        try:
+            for index, step in enumerate(batch.actions):
+                try:
+                    self._validate_action(step)
+                except ValueError as e:
+                    raise ValueError(f"Step {index}: {e}")
+            results = await self.worker.submit(self._execute_batch, batch.actions, batch.stop_on_error)
+        except ValueError as e:
+            logger.error(f"Validation error: {e}")
+            return ActionBatchResponse(
+                id=batch.id, status="error", skipped=len(batch.actions), code="INVALID_INPUT", message=str(e)
+            )
+        except Exception as e:
+            logger.error(f"Action batch error: {e}", exc_info=True)
+            return ActionBatchResponse(id=batch.id, status="error", code="EXECUTION_ERROR", message=str(e))
+
+        executed = sum(1 for r in results if r.status == "success")
+        failed = sum(1 for r in results if r.status == "error")
+        if self.on_action:
+            for step, result in zip(batch.actions, results):
+                if result.status == "success":
+                    self.on_action(step.model_dump(exclude_none=True, exclude={"delay_ms"}))
+        logger.info(f"Action batch executed: {executed}/{len(results)} ok, {failed} failed")
+
+        return ActionBatchResponse(
+            id=batch.id,
+            status="success" if executed == len(results) else "partial" if executed else "error",
+            executed=executed,
+            failed=failed,
+            skipped=len(results) - executed - failed,
+            duration_ms=round((time.monotonic() - start) * 1000, 1),
+            results=results
+        )
+
+    def _execute_batch(self, steps: Sequence[ActionBatchStep], stop_on_error: bool) -> List[ActionStepResult]:
+        """매크로 단계 연속 실행 (입력 워커 스레드, 단계 간 대기는 delay_ms만)"""
+        results: List[ActionStepResult] = []
+        failed = False
+        with self.backend.batch():
+            for index, step in enumerate(steps):
+                if failed and stop_on_error:
+                    results.append(ActionStepResult(index=index, action_type=step.action_type, status="skipped"))
+                    continue
+                try:
+                    self._execute(step)
+                    results.append(ActionStepResult(index=index, action_type=step.action_type, status="success"))
+                except Exception as e:
+                    failed = True
+                    code = "INVALID_INPUT" if isinstance(e, ValueError) else "EXECUTION_ERROR"
+                    logger.error(f"Action batch step {index} ({step.action_type}) failed: {e}")
+                    results.append(ActionStepResult(
+                        index=index, action_type=step.action_type, status="error", code=code, message=str(e)
+                    ))
+                if step.delay_ms and index < len(steps) - 1 and not (failed and stop_on_error):
+                    self.backend.pause(step.delay_ms / 1000)
+        return results
+
+    @staticmethod
+    def _merge(queued: Tuple[ActionRequest], new: Tuple[ActionRequest]) -> Optional[Tuple[ActionRequest]]:
+        """
+        대기 중인 호버/스크롤에 새 요청 합치기 (InputWorker.submit의 merge)
+
+        호버는 새 위치로 바꾸고, 스크롤은 방향을 부호로 보고 단계 수를 더해 새 위치에서 실행한다.
+        위치 지정 여부가 다른 스크롤, 합친 양이 MAX_SCROLL_AMOUNT를 넘는 스크롤은 합치지 않는다
+        (model_copy는 검증하지 않으므로 여기서 모델 한도를 지킨다).
+        """
+        (previous,), (action,) = queued, new
+        if action.action_type == "hover":
+            return new
+        if (previous.x is None) != (action.x is None):
+            return None
+
+        def steps(scroll: ActionRequest) -> int:
+            amount = 1 if scroll.amount is None else scroll.amount
+            return amount if scroll.direction == "up" else -amount
+
+        total = steps(previous) + steps(action)
+        if abs(total) > MAX_SCROLL_AMOUNT:
+            return None
+        return (action.model_copy(update={"direction": "up" if total > 0 else "down", "amount": abs(total)}),)
+
+    def _execute(self, action: ActionRequest) -> ActionRequest:
+        """검증된 액션 실행 (입력 워커 스레드, 실제로 실행한 액션 반환, 실행 시간은 백엔드 통계에 기록)"""
+        action_type = action.action_type
+        start = time.perf_counter()
+        if action_type == "click":
+            self._handle_click(action.x, action.y)
+        elif action_type == "double_click":
+            self._handle_double_click(action.x, action.y)
+        elif action_type == "right_click":
+            self._handle_right_click(action.x, action.y)
+        elif action_type == "drag":
+            self._handle_drag(action.start_x, action.start_y, action.end_x, action.end_y)
+        elif action_type == "type":
+            self._handle_type(action.text)
+        elif action_type == "hotkey":
+            self._handle_hotkey(action.key)
+        elif action_type == "scroll":
+            self._handle_scroll(action.x, action.y, action.direction, action.amount)
+        elif action_type == "hover":
+            self._handle_hover(action.x, action.y)
+        else:
+            raise ValueError(f"Unknown action type: {action_type}")
+        self.backend.latency.add(action_type, (time.perf_counter() - start) * 1000)
+        return action
+
     def _validate_action(self, action: ActionRequest):
         """액션 검증"""
+        if action.action_type not in ACTION_TYPES:
+            raise ValueError(f"Unknown action type: {action.action_type}")
+        if action.action_type in POINTER_ACTIONS and (action.x is None or action.y is None):
+            raise ValueError(f"{action.action_type} action requires x and y")
         if action.x is not None:
             if not (0 <= action.x <= self.screen_width):
                 raise ValueError(f"X coordinate {action.x} out of bounds (0-{self.screen_width})")
@@ -67,39 +227,42 @@ class ActionHandler:
             if not (0 <= action.y <= self.screen_height):
                 raise ValueError(f"Y coordinate {action.y} out of bounds (0-{self.screen_height})")
         if action.action_type == "drag":
-            for coord, name in [(action.start_x, "start_x"), (action.start_y, "start_y"),
-                               (action.end_x, "end_x"), (action.end_y, "end_y")]:
+            for coord, name, limit in [(action.start_x, "start_x", self.screen_width),
+                                       (action.start_y, "start_y", self.screen_height),
+                                       (action.end_x, "end_x", self.screen_width),
+                                       (action.end_y, "end_y", self.screen_height)]:
                 if coord is None:
                     raise ValueError(f"Drag action requires {name}")
+                if not (0 <= coord <= limit):
+                    raise ValueError(f"{name} {coord} out of bounds (0-{limit})")
         if action.action_type == "type" and not action.text:
             raise ValueError("Type action requires text")
         if action.action_type == "hotkey" and not action.key:
             raise ValueError("Hotkey action requires key")
 
     def _handle_click(self, x: int, y: int):
-        pyautogui.click(x, y, button='left')
+        x, y = self.to_global(x, y)
+        self.backend.click(x, y)
         logger.debug(f"Click at ({x}, {y})")
 
     def _handle_double_click(self, x: int, y: int):
-        pyautogui.doubleClick(x, y, button='left')
+        x, y = self.to_global(x, y)
+        self.backend.click(x, y, count=2)
         logger.debug(f"Double click at ({x}, {y})")
 
     def _handle_right_click(self, x: int, y: int):
-        pyautogui.click(x, y, button='right')
+        x, y = self.to_global(x, y)
+        self.backend.click(x, y, button='right')
         logger.debug(f"Right click at ({x}, {y})")
 
     def _handle_drag(self, start_x: int, start_y: int, end_x: int, end_y: int):
-        pyautogui.moveTo(start_x, start_y)
-        pyautogui.dragTo(end_x, end_y, duration=0.5)
+        start_x, start_y = self.to_global(start_x, start_y)
+        end_x, end_y = self.to_global(end_x, end_y)
+        self.backend.drag(start_x, start_y, end_x, end_y)
         logger.debug(f"Drag from ({start_x}, {start_y}) to ({end_x}, {end_y})")
 
     def _handle_type(self, text: str):
-        try:
-            import pyperclip
-            pyperclip.copy(text)
-            pyautogui.hotkey('ctrl', 'v')
-        except ImportError:
-            pyautogui.write(text, interval=0.05)
+        self.backend.type_text(text)
         logger.debug(f"Typed: {text[:50]}...")
 
     def _handle_hotkey(self, key: str):
@@ -114,20 +277,26 @@ class ActionHandler:
         }
         converted_keys = [key_map.get(k, k) for k in keys]
         if len(converted_keys) == 1:
-            pyautogui.press(converted_keys[0])
+            self.backend.press(converted_keys[0])
         else:
-            pyautogui.hotkey(*converted_keys)
+            self.backend.hotkey(*converted_keys)
         logger.debug(f"Hotkey: {converted_keys}")
 
-    def _handle_scroll(self, x: Optional[int], y: Optional[int], direction: Optional[str]):
+    def _handle_scroll(self, x: Optional[int], y: Optional[int], direction: Optional[str], amount: Optional[int] = None):
         direction = direction or "down"
-        clicks = 5 if direction == "up" else -5
+        amount = 1 if amount is None else amount
+        if amount == 0:
+            # 위아래 스크롤이 합쳐져 상쇄됨
+            return
+        clicks = SCROLL_CLICKS * amount if direction == "up" else -SCROLL_CLICKS * amount
         if x is not None and y is not None:
-            pyautogui.scroll(clicks, x=x, y=y)
+            x, y = self.to_global(x, y)
+            self.backend.scroll(clicks, x, y)
         else:
-            pyautogui.scroll(clicks)
-        logger.debug(f"Scroll {direction}")
+            self.backend.scroll(clicks)
+        logger.debug(f"Scroll {direction} x{amount}")
 
     def _handle_hover(self, x: int, y: int):
-        pyautogui.moveTo(x, y)
+        x, y = self.to_global(x, y)
+        self.backend.move(x, y)
         logger.debug(f"Hover at ({x}, {y})")
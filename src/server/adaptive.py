@@ -0,0 +1,220 @@
+"""
+Web Player - 적응형 품질/프레임레이트 제어
+측정된 전송 상태에 따라 클라이언트별 JPEG 품질, 해상도 배율, FPS를 조정한다.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 해상도 배율 단계 (큰 것부터)
+SCALE_STEPS: Tuple[float, ...] = (1.0, 0.75, 0.5, 0.33)
+
+
+@dataclass
+class StreamBounds:
+    """운영자가 정한 조정 범위"""
+    quality_min: int = 30
+    quality_max: int = 70
+    fps_min: int = 5
+    fps_max: int = 30
+    scale_min: float = 0.5
+    scale_max: float = 1.0
+
+    def scale_steps(self) -> Tuple[float, ...]:
+        """범위 안의 배율 단계"""
+        steps = tuple(s for s in SCALE_STEPS if self.scale_min <= s <= self.scale_max)
+        return steps or (self.scale_max,)
+
+
+@dataclass
+class _Window:
+    """한 평가 구간의 측정값"""
+    started: float = field(default_factory=time.monotonic)
+    frames_sent: int = 0
+    frames_dropped: int = 0
+    send_ms_total: float = 0.0
+
+
+class AdaptiveController:
+    """
+    클라이언트별 혼잡 제어 (AIMD)
+
+    평가 구간(interval)마다 다음 신호로 혼잡 여부를 판단한다:
+        - 송신 시간: 프레임 간격 예산의 절반 이상을 WebSocket 송신에 씀
+        - 대기열: 우편함에서 밀려나 버려진 프레임 비율
+        - 클라이언트 디코딩 시간: 프레임 간격 예산의 대부분을 디코딩에 씀
+
+    혼잡하면 품질 → FPS → 해상도 순으로 크게 낮추고,
+    여유가 있는 구간이 연속되면 해상도 → FPS → 품질 순으로 조금씩 올린다.
+    모든 값은 StreamBounds 범위 안에서만 움직인다.
+
+    클라이언트가 뷰포트 크기를 알려주면 그 크기를 채우는 가장 작은 배율 단계가
+    해상도 상한(scale_cap)이 된다. 화면에 보이지 않는 픽셀은 인코딩하지 않는다.
+    """
+
+    QUALITY_STEP_DOWN = 15
+    QUALITY_STEP_UP = 5
+    FPS_DECREASE_FACTOR = 0.75
+    FPS_STEP_UP = 2
+    DROP_RATIO_LIMIT = 0.1
+    HEALTHY_WINDOWS_TO_INCREASE = 3
+
+    def __init__(
+        self,
+        bounds: StreamBounds,
+        enabled: bool = True,
+        interval: float = 1.0
+    ):
+        self.bounds = bounds
+        self.enabled = enabled
+        self.interval = interval
+
+        self.quality = bounds.quality_max
+        self.fps = bounds.fps_max
+        self.scale = bounds.scale_max
+        self.scale_cap = bounds.scale_max
+
+        self.client_decode_ms: Optional[float] = None
+        self.adjustments = 0
+        self._window = _Window()
+        self._healthy_windows = 0
+
+    @property
+    def profile(self) -> Tuple[int, float]:
+        """인코딩 프로필 (품질, 배율) - 같은 프로필의 시청자는 인코딩 결과를 공유"""
+        return self.quality, self.scale
+
+    def set_quality(self, value: int):
+        """수동 품질 설정 (이 클라이언트의 상한이 됨)"""
+        self.bounds.quality_max = max(self.bounds.quality_min, min(100, value))
+        self.quality = self.bounds.quality_max
+
+    def set_fps(self, value: int):
+        """수동 FPS 설정 (이 클라이언트의 상한이 됨)"""
+        self.bounds.fps_max = max(self.bounds.fps_min, min(60, value))
+        self.fps = self.bounds.fps_max
+
+    def set_viewport(self, width: int, height: int, screen_width: int, screen_height: int):
+        """
+        클라이언트 뷰포트 크기(기기 픽셀)로 해상도 상한 결정
+
+        Args:
+            width, height: 클라이언트가 화면을 표시하는 영역 크기
+            screen_width, screen_height: 원격 화면(스트림 영역) 크기
+        """
+        required = max(width / screen_width, height / screen_height)
+        # 뷰포트를 채우는 가장 작은 단계 (확대해서 보여주지 않도록)
+        cap = next((s for s in reversed(SCALE_STEPS) if s >= required), SCALE_STEPS[0])
+        cap = min(cap, self.bounds.scale_max)
+        if cap != self.scale_cap:
+            logger.debug(f"Viewport {width}x{height}: scale cap {self.scale_cap} -> {cap}")
+        self.scale_cap = cap
+        # 뷰포트가 바뀌면 새 상한에서 다시 시작 (혼잡하면 update()가 다시 낮춤)
+        self.scale = cap
+
+    def on_frame_sent(self, send_ms: float):
+        """프레임 하나 송신 완료"""
+        self._window.frames_sent += 1
+        self._window.send_ms_total += send_ms
+
+    def on_frames_dropped(self, count: int = 1):
+        """우편함에서 프레임이 밀려남"""
+        self._window.frames_dropped += count
+
+    def on_client_report(self, decode_ms: float):
+        """클라이언트가 보고한 평균 디코딩 시간"""
+        self.client_decode_ms = decode_ms
+
+    def update(self) -> bool:
+        """
+        평가 구간이 지났으면 조정
+
+        Returns:
+            프로필 또는 FPS가 바뀌었으면 True
+        """
+        window = self._window
+        if time.monotonic() - window.started < self.interval:
+            return False
+        self._window = _Window()
+
+        if not self.enabled:
+            return False
+
+        budget_ms = 1000.0 / self.fps
+        attempts = window.frames_sent + window.frames_dropped
+        drop_ratio = window.frames_dropped / attempts if attempts else 0.0
+        avg_send_ms = window.send_ms_total / window.frames_sent if window.frames_sent else 0.0
+        decode_ms = self.client_decode_ms or 0.0
+
+        congested = (
+            drop_ratio > self.DROP_RATIO_LIMIT
+            or avg_send_ms > budget_ms * 0.5
+            or decode_ms > budget_ms * 0.8
+        )
+
+        before = (self.quality, self.fps, self.scale)
+        if congested:
+            self._healthy_windows = 0
+            self._decrease()
+        else:
+            self._healthy_windows += 1
+            if self._healthy_windows >= self.HEALTHY_WINDOWS_TO_INCREASE:
+                self._healthy_windows = 0
+                self._increase()
+
+        changed = (self.quality, self.fps, self.scale) != before
+        if changed:
+            self.adjustments += 1
+            logger.debug(
+                f"Adaptive stream: quality={self.quality} fps={self.fps} scale={self.scale} "
+                f"(drop={drop_ratio:.2f}, send={avg_send_ms:.1f}ms, decode={decode_ms:.1f}ms)"
+            )
+        return changed
+
+    def _scale_steps(self) -> Tuple[float, ...]:
+        """뷰포트 상한을 넘지 않는 배율 단계"""
+        steps = tuple(s for s in self.bounds.scale_steps() if s <= self.scale_cap)
+        return steps or (self.scale_cap,)
+
+    def _decrease(self):
+        bounds = self.bounds
+        if self.quality > bounds.quality_min:
+            self.quality = max(bounds.quality_min, self.quality - self.QUALITY_STEP_DOWN)
+        elif self.fps > bounds.fps_min:
+            self.fps = max(bounds.fps_min, int(self.fps * self.FPS_DECREASE_FACTOR))
+        else:
+            steps = self._scale_steps()
+            smaller = [s for s in steps if s < self.scale]
+            if smaller:
+                self.scale = smaller[0]
+
+    def _increase(self):
+        bounds = self.bounds
+        steps = self._scale_steps()
+        larger = [s for s in steps if s > self.scale]
+        if larger:
+            self.scale = larger[-1]
+        elif self.fps < bounds.fps_max:
+            self.fps = min(bounds.fps_max, self.fps + self.FPS_STEP_UP)
+        elif self.quality < bounds.quality_max:
+            self.quality = min(bounds.quality_max, self.quality + self.QUALITY_STEP_UP)
+
+    def get_stats(self) -> dict:
+        """현재 설정 및 범위"""
+        return {
+            "adaptive": self.enabled,
+            "quality": self.quality,
+            "fps": self.fps,
+            "scale": self.scale,
+            "scale_cap": self.scale_cap,
+            "client_decode_ms": self.client_decode_ms,
+            "adjustments": self.adjustments,
+            "bounds": {
+                "quality": [self.bounds.quality_min, self.bounds.quality_max],
+                "fps": [self.bounds.fps_min, self.bounds.fps_max],
+                "scale": [self.bounds.scale_min, self.bounds.scale_max],
+            },
+        }
@@ -0,0 +1,284 @@
+"""
+Web Player - Appium(WebDriver) 클라이언트
+keep-alive HTTP 연결 풀 위의 W3C WebDriver 세션과 W3C Actions 묶음
+"""
+import base64
+import http.client
+import json
+import logging
+import queue
+import threading
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 유지할 유휴 연결 수 (입력 스레드, 캡처 스레드, 스냅샷이 동시에 요청할 수 있음)
+POOL_SIZE = 4
+REQUEST_TIMEOUT = 60.0
+
+# 세션이 없어졌을 때의 W3C 오류 (같은 capabilities로 새 세션을 만들어 한 번 재시도)
+SESSION_ERRORS = ("invalid session id",)
+
+
+class WebDriverError(Exception):
+    """WebDriver 오류 응답"""
+
+    def __init__(self, error: str, message: str, status: int):
+        super().__init__(f"{error}: {message}")
+        self.error = error
+        self.status = status
+
+
+class HTTPPool:
+    """
+    keep-alive HTTP 연결 풀 (스레드 안전)
+
+    요청마다 유휴 연결을 빌려 응답을 끝까지 읽은 뒤 돌려놓으므로 TCP 연결을 계속 재사용한다.
+    유휴 중 서버가 닫은 연결은 새 연결로 한 번 다시 보낸다.
+    """
+
+    def __init__(self, url: str, size: int = POOL_SIZE, timeout: float = REQUEST_TIMEOUT):
+        parts = urlsplit(url)
+        self._https = parts.scheme == "https"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or (443 if self._https else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(size)
+
+        # 통계
+        self.connections_opened = 0
+        self.requests = 0
+
+    def request(self, method: str, path: str, body: Optional[dict] = None) -> Tuple[int, bytes]:
+        """
+        JSON 요청
+
+        Returns:
+            (HTTP 상태 코드, 응답 본문)
+        """
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json; charset=utf-8", "Accept": "application/json"}
+        for attempt in range(2):
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, self.base_path + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.ImproperConnectionState) as e:
+                connection.close()
+                if reused and attempt == 0:
+                    logger.debug(f"Stale WebDriver connection ({e}), reconnecting")
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            self.requests += 1
+            return response.status, data
+        raise ConnectionError("WebDriver request failed")
+
+    def close(self):
+        """유휴 연결 모두 닫기"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """(연결, 재사용 여부)"""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            pass
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        self.connections_opened += 1
+        return cls(self.host, self.port, timeout=self.timeout), False
+
+    def _release(self, connection: http.client.HTTPConnection):
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+class AppiumSession:
+    """
+    Appium W3C WebDriver 세션
+
+    처음 사용할 때 세션을 만들고 프로세스 수명 동안(여러 목표 자동화에 걸쳐) 재사용한다.
+    Appium이 세션을 잃으면(newCommandTimeout 등) 같은 capabilities로 다시 만들어 한 번 재시도한다.
+    """
+
+    def __init__(self, url: str, capabilities: dict, pool_size: int = POOL_SIZE):
+        """
+        Args:
+            url: Appium 서버 URL (Appium 1은 /wd/hub까지 포함)
+            capabilities: 세션 capabilities (W3C alwaysMatch)
+            pool_size: 유지할 keep-alive 연결 수
+        """
+        self.url = url
+        self.capabilities = capabilities
+        self.pool = HTTPPool(url, pool_size)
+        self.session_id: Optional[str] = None
+        self.session_capabilities: dict = {}  # 서버가 돌려준 실제 capabilities
+        self._lock = threading.Lock()
+        self.sessions_created = 0
+
+    def start(self) -> str:
+        """세션 ID (없으면 새로 만듦)"""
+        with self._lock:
+            if self.session_id is None:
+                status, data = self.pool.request(
+                    "POST", "/session", {"capabilities": {"alwaysMatch": self.capabilities, "firstMatch": [{}]}}
+                )
+                value = self._value(status, data)
+                self.session_id = value["sessionId"]
+                self.session_capabilities = value.get("capabilities") or {}
+                self.sessions_created += 1
+                logger.info(f"Appium session created: {self.session_id} ({self.url})")
+            return self.session_id
+
+    def command(self, method: str, path: str, body: Optional[dict] = None) -> Any:
+        """
+        세션 명령
+
+        Args:
+            path: /session/{id} 뒤의 경로 (예: "/actions")
+
+        Returns:
+            응답의 value
+
+        Raises:
+            WebDriverError: 오류 응답
+        """
+        session_id = self.start()
+        status, data = self.pool.request(method, f"/session/{session_id}{path}", body)
+        try:
+            return self._value(status, data)
+        except WebDriverError as e:
+            if e.error not in SESSION_ERRORS:
+                raise
+            logger.warning(f"Appium session {session_id} lost, creating a new one")
+            with self._lock:
+                if self.session_id == session_id:
+                    self.session_id = None
+            session_id = self.start()
+            return self._value(*self.pool.request(method, f"/session/{session_id}{path}", body))
+
+    def window_rect(self) -> dict:
+        """뷰포트 크기 {"x", "y", "width", "height"} (액션 좌표 단위)"""
+        return self.command("GET", "/window/rect")
+
+    def screenshot(self) -> bytes:
+        """화면 PNG"""
+        return base64.b64decode(self.command("GET", "/screenshot"))
+
+    def update_settings(self, values: dict):
+        """Appium 드라이버 설정 변경 (mjpegServerFramerate 등)"""
+        self.command("POST", "/appium/settings", {"settings": values})
+
+    def perform_actions(self, actions: List[dict]):
+        """W3C Actions 실행 (입력 소스 목록)"""
+        self.command("POST", "/actions", {"actions": actions})
+
+    def quit(self):
+        """세션 종료 후 연결 닫기"""
+        with self._lock:
+            session_id, self.session_id = self.session_id, None
+        if session_id:
+            try:
+                self.pool.request("DELETE", f"/session/{session_id}")
+                logger.info(f"Appium session closed: {session_id}")
+            except Exception as e:
+                logger.warning(f"Appium session close error: {e}")
+        self.pool.close()
+
+    def get_stats(self) -> dict:
+        """세션/연결 통계"""
+        return {
+            "session_id": self.session_id,
+            "sessions_created": self.sessions_created,
+            "requests": self.pool.requests,
+            "connections_opened": self.pool.connections_opened,
+        }
+
+    @staticmethod
+    def _value(status: int, data: bytes) -> Any:
+        """응답 본문의 value (오류면 WebDriverError)"""
+        try:
+            payload = json.loads(data) if data else {}
+        except ValueError:
+            raise WebDriverError("unknown error", f"HTTP {status}: {data[:200]!r}", status)
+        value = payload.get("value") if isinstance(payload, dict) else None
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            value = value if isinstance(value, dict) else {}
+            raise WebDriverError(value.get("error", "unknown error"), value.get("message", f"HTTP {status}"), status)
+        return value
+
+
+class ActionChain:
+    """
+    W3C Actions 묶음 (터치 포인터 하나 + 키보드 하나)
+
+    두 입력 소스의 틱을 맞춰 쌓는다: 한 소스가 동작하는 틱에 다른 소스는 0ms pause를 넣어
+    /actions 요청 하나 안에서 포인터와 키 동작이 쌓은 순서대로 실행된다.
+    """
+
+    POINTER_ID = "finger1"
+    KEYBOARD_ID = "keyboard"
+
+    def __init__(self):
+        self.pointer: List[dict] = []
+        self.keys: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.pointer)
+
+    def move(self, x: int, y: int, duration: int = 0) -> "ActionChain":
+        return self._tick(pointer={"type": "pointerMove", "duration": duration, "x": x, "y": y, "origin": "viewport"})
+
+    def down(self) -> "ActionChain":
+        return self._tick(pointer={"type": "pointerDown", "button": 0})
+
+    def up(self) -> "ActionChain":
+        return self._tick(pointer={"type": "pointerUp", "button": 0})
+
+    def key_down(self, value: str) -> "ActionChain":
+        return self._tick(key={"type": "keyDown", "value": value})
+
+    def key_up(self, value: str) -> "ActionChain":
+        return self._tick(key={"type": "keyUp", "value": value})
+
+    def pause(self, ms: int) -> "ActionChain":
+        """대기 틱 (두 소스 모두에 넣어 어느 소스만 보내도 대기가 남음)"""
+        return self._tick(
+            pointer={"type": "pause", "duration": ms},
+            key={"type": "pause", "duration": ms}
+        )
+
+    def to_json(self) -> List[dict]:
+        """/actions 요청의 actions (동작이 없는 소스는 뺌)"""
+        sources = []
+        if any(a["type"] != "pause" for a in self.pointer):
+            sources.append({
+                "type": "pointer",
+                "id": self.POINTER_ID,
+                "parameters": {"pointerType": "touch"},
+                "actions": self.pointer
+            })
+        if any(a["type"] != "pause" for a in self.keys):
+            sources.append({"type": "key", "id": self.KEYBOARD_ID, "actions": self.keys})
+        return sources
+
+    def _tick(self, pointer: Optional[dict] = None, key: Optional[dict] = None) -> "ActionChain":
+        self.pointer.append(pointer or {"type": "pause", "duration": 0})
+        self.keys.append(key or {"type": "pause", "duration": 0})
+        return self
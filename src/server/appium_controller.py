@@ -0,0 +1,367 @@
+"""
+Web Player - Appium 제어 모드
+CONTROL_MODE=appium: 모바일 기기 화면/입력을 ScreenController/ActionHandler 파이프라인에 연결한다.
+"""
+import io
+import json
+import logging
+import time
+import zlib
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from PIL import Image
+
+from .action_handler import ActionHandler
+from .appium_client import ActionChain, AppiumSession
+from .capture_worker import CaptureWorker
+from .config import settings
+from .input_backends import InputBackend
+from .mjpeg_stream import MjpegReader, jpeg_size
+from .screen_controller import ScreenController
+
+logger = logging.getLogger(__name__)
+
+# 제스처 시간 (ms)
+TAP_MS = 50
+LONG_PRESS_MS = 800
+DOUBLE_TAP_GAP_MS = 100
+SWIPE_MS = 300
+
+# 스크롤 한 단계(amount 1)의 스와이프 거리 (화면 높이 대비)
+SCROLL_FRACTION = 0.2
+# ActionHandler가 스크롤 한 단계로 보내는 휠 클릭 수 (action_handler.SCROLL_CLICKS)
+CLICKS_PER_STEP = 5
+
+# MJPEG 프레임을 기다리는 최대 시간 (연결이 없으면 그 프레임은 /screenshot으로)
+MJPEG_FRAME_TIMEOUT = 0.5
+# 시작 시 MJPEG 스트림 확인 대기 시간
+MJPEG_PROBE_TIMEOUT = 5.0
+
+# pyautogui 키 이름 → WebDriver 키 코드
+KEY_CODES = {
+    "ctrl": "\ue009", "shift": "\ue008", "alt": "\ue00a", "command": "\ue03d",
+    "enter": "\ue007", "return": "\ue006", "tab": "\ue004", "escape": "\ue00c", "esc": "\ue00c",
+    "space": "\ue00d", "backspace": "\ue003", "delete": "\ue017", "insert": "\ue016",
+    "home": "\ue011", "end": "\ue010", "pageup": "\ue00e", "pagedown": "\ue00f",
+    "left": "\ue012", "up": "\ue013", "right": "\ue014", "down": "\ue015",
+    **{f"f{n}": chr(0xE031 + n - 1) for n in range(1, 13)},
+}
+
+
+@dataclass
+class DeviceShot:
+    """기기 화면 한 장 (mss ScreenShot처럼 BGRX 바이트)"""
+    raw: bytes
+    width: int
+    height: int
+
+
+class JpegShot:
+    """
+    MJPEG 프레임 한 장 (JPEG 그대로)
+
+    전체 프레임 전송은 jpeg를 그대로 쓰고, 픽셀이 필요한 경로(타일 델타, 축소, 비디오, 녹화)가
+    raw를 처음 읽을 때만 BGRX로 디코딩한다.
+    """
+
+    def __init__(self, jpeg: bytes, width: int, height: int):
+        self.jpeg = jpeg
+        self.width = width
+        self.height = height
+        self._raw: Optional[bytes] = None
+
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            with Image.open(io.BytesIO(self.jpeg)) as image:
+                self._raw = image.convert("RGB").tobytes("raw", "BGRX")
+        return self._raw
+
+
+def screenshot_shot(session: AppiumSession, size: Optional[Tuple[int, int]] = None) -> DeviceShot:
+    """/screenshot PNG를 BGRX로 디코딩 (size를 주면 그 크기로 맞춤)"""
+    image = Image.open(io.BytesIO(session.screenshot())).convert("RGB")
+    if size and image.size != size:
+        image = image.resize(size, Image.BILINEAR)
+    return DeviceShot(raw=image.tobytes("raw", "BGRX"), width=image.width, height=image.height)
+
+
+class ScreenshotCaptureWorker(CaptureWorker):
+    """
+    Appium /screenshot 폴링 캡처 워커 (MJPEG를 쓸 수 없을 때)
+
+    PNG를 받아 BGRX로 디코딩해 데스크톱 캡처와 같은 RawFrame으로 게시한다.
+    요청 한 번이 수백 ms라 FPS는 기기/드라이버 속도에 묶인다.
+    """
+
+    def __init__(self, session: AppiumSession, fps: int, width: int, height: int):
+        super().__init__(fps=fps, region={"left": 0, "top": 0, "width": width, "height": height})
+        self.session = session
+
+    def _open(self):
+        return nullcontext(self.session)
+
+    def _shot(self, session: AppiumSession) -> DeviceShot:
+        return screenshot_shot(session)
+
+
+class MjpegCaptureWorker(CaptureWorker):
+    """
+    Appium MJPEG 스트림 캡처 워커
+
+    MjpegReader가 받은 최신 JPEG을 디코딩하지 않고 JpegShot으로 게시한다 (체크섬도 JPEG 바이트로).
+    새 프레임이 없으면 연결 상태를 본다: 연결되어 있으면 화면이 그대로인 것이므로 마지막 프레임을
+    다시 게시하고, 끊겨 있으면(재연결 중) 그 프레임만 /screenshot으로 캡처해 스트림 크기로 맞춘다.
+    """
+
+    def __init__(self, reader: MjpegReader, session: AppiumSession, fps: int, width: int, height: int):
+        super().__init__(fps=fps, region={"left": 0, "top": 0, "width": width, "height": height})
+        self.reader = reader
+        self.session = session
+        self._last: Optional[Tuple[int, JpegShot]] = None
+        self.fallback_frames = 0
+
+    @contextmanager
+    def _open(self) -> Iterator[MjpegReader]:
+        self.reader.start()
+        try:
+            yield self.reader
+        finally:
+            self.reader.stop()
+
+    def _shot(self, reader: MjpegReader) -> Any:
+        after = self._last[0] if self._last else 0
+        frame = reader.wait_for_frame(after, MJPEG_FRAME_TIMEOUT)
+        if frame is not None:
+            seq, jpeg = frame
+            self._last = (seq, JpegShot(jpeg, *jpeg_size(jpeg)))
+            return self._last[1]
+        if reader.connected and self._last:
+            return self._last[1]
+        self.fallback_frames += 1
+        return screenshot_shot(self.session, (self.region["width"], self.region["height"]))
+
+    def _digest(self, shot: Any) -> int:
+        if isinstance(shot, JpegShot):
+            return zlib.crc32(shot.jpeg)
+        return super()._digest(shot)
+
+    def get_stats(self) -> dict:
+        return {**self.reader.get_stats(), "fallback_frames": self.fallback_frames}
+
+
+class AppiumBackend(InputBackend):
+    """
+    Appium 입력 백엔드 (W3C Actions, 터치 포인터 + 키보드)
+
+    좌표는 스크린샷 픽셀(스트림 좌표)로 받아 뷰포트 좌표로 바꾼다 (iOS는 포인트 단위라 배율이 다름).
+    제스처 하나(탭, 더블 탭, 스와이프, 문자열 입력)는 /actions 요청 하나로 보내고,
+    batch() 구간(action_batch 매크로)은 모든 단계와 delay_ms 대기를 모아 요청 하나로 보낸다.
+    터치에는 호버가 없으므로 move()는 아무것도 하지 않는다.
+    """
+
+    name = "appium"
+
+    def __init__(self, session: AppiumSession, viewport: Tuple[int, int], scale: Tuple[float, float] = (1.0, 1.0)):
+        """
+        Args:
+            session: Appium 세션 (캡처 워커와 공유)
+            viewport: 뷰포트 (너비, 높이) (액션 좌표 단위)
+            scale: 스크린샷 픽셀 → 뷰포트 좌표 배율 (x, y)
+        """
+        super().__init__()
+        self.session = session
+        self.viewport = viewport
+        self.scale = scale
+        self._pending: Optional[ActionChain] = None
+
+    def set_geometry(self, viewport: Tuple[int, int], width: int, height: int):
+        """뷰포트와 프레임 크기(width, height)로 좌표 배율 갱신 (기기 회전)"""
+        self.viewport = viewport
+        self.scale = (viewport[0] / width, viewport[1] / height)
+
+    def move(self, x: int, y: int):
+        logger.debug(f"Hover ignored on touch device ({x}, {y})")
+
+    def click(self, x: int, y: int, button: str = "left", count: int = 1):
+        x, y = self._to_viewport(x, y)
+        hold = LONG_PRESS_MS if button == "right" else TAP_MS
+        with self._gesture() as chain:
+            for index in range(count):
+                if index:
+                    chain.pause(DOUBLE_TAP_GAP_MS)
+                chain.move(x, y).down().pause(hold).up()
+
+    def drag(self, start_x: int, start_y: int, end_x: int, end_y: int):
+        self._swipe(*self._to_viewport(start_x, start_y), *self._to_viewport(end_x, end_y))
+
+    def scroll(self, clicks: int, x: Optional[int] = None, y: Optional[int] = None):
+        """clicks > 0(위로)이면 손가락을 아래로, 아니면 위로 스와이프"""
+        width, height = self.viewport
+        if x is not None and y is not None:
+            x, y = self._to_viewport(x, y)
+        else:
+            x, y = width // 2, height // 2
+        distance = round(abs(clicks) / CLICKS_PER_STEP * SCROLL_FRACTION * height)
+        end_y = y + distance if clicks > 0 else y - distance
+        self._swipe(x, y, x, max(1, min(height - 1, end_y)))
+
+    def type_text(self, text: str):
+        with self._gesture() as chain:
+            for char in text:
+                chain.key_down(char).key_up(char)
+
+    def press(self, key: str):
+        self.hotkey(key)
+
+    def hotkey(self, *keys: str):
+        codes = [self._key_code(key) for key in keys]
+        with self._gesture() as chain:
+            for code in codes:
+                chain.key_down(code)
+            for code in reversed(codes):
+                chain.key_up(code)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        self._pending = ActionChain()
+        try:
+            yield
+            chain = self._pending
+        finally:
+            self._pending = None
+        start = time.perf_counter()
+        self._perform(chain)
+        self.latency.add("batch", (time.perf_counter() - start) * 1000)
+
+    def pause(self, seconds: float):
+        if self._pending is not None:
+            self._pending.pause(round(seconds * 1000))
+        else:
+            time.sleep(seconds)
+
+    def close(self):
+        self.session.quit()
+
+    def get_stats(self) -> dict:
+        return {**super().get_stats(), "appium": self.session.get_stats()}
+
+    @contextmanager
+    def _gesture(self) -> Iterator[ActionChain]:
+        """제스처를 쌓을 묶음 (매크로 중이면 매크로 묶음, 아니면 끝날 때 바로 실행)"""
+        if self._pending is not None:
+            yield self._pending
+            return
+        chain = ActionChain()
+        yield chain
+        self._perform(chain)
+
+    def _perform(self, chain: ActionChain):
+        actions = chain.to_json()
+        if actions:
+            self.session.perform_actions(actions)
+
+    def _swipe(self, start_x: int, start_y: int, end_x: int, end_y: int):
+        with self._gesture() as chain:
+            chain.move(start_x, start_y).down().move(end_x, end_y, duration=SWIPE_MS).up()
+
+    def _to_viewport(self, x: int, y: int) -> Tuple[int, int]:
+        return round(x * self.scale[0]), round(y * self.scale[1])
+
+    @staticmethod
+    def _key_code(key: str) -> str:
+        if len(key) == 1:
+            return key
+        code = KEY_CODES.get(key.lower())
+        if code is None:
+            raise ValueError(f"Unknown key: {key!r}")
+        return code
+
+
+def mjpeg_url(session: AppiumSession) -> str:
+    """
+    MJPEG 스트림 URL
+
+    APPIUM_MJPEG_URL이 있으면 그대로, 없으면 세션 capabilities의 mjpegServerPort로 Appium 호스트에서 찾는다.
+    (UiAutomator2는 mjpegServerPort를 지정해야 기기 포트가 호스트로 포워딩됨, XCUITest는 기본 9100)
+    """
+    if settings.appium_mjpeg_url:
+        return settings.appium_mjpeg_url
+    for caps in (session.session_capabilities, session.capabilities):
+        port = caps.get("mjpegServerPort") or caps.get("appium:mjpegServerPort")
+        if port:
+            return f"http://{urlsplit(session.url).hostname or '127.0.0.1'}:{port}"
+    return ""
+
+
+def create_mjpeg_capture(session: AppiumSession) -> Optional[MjpegCaptureWorker]:
+    """
+    MJPEG 캡처 워커 (스트림을 쓸 수 없으면 None)
+
+    첫 프레임이 MJPEG_PROBE_TIMEOUT 안에 오는지 확인하고 그 크기로 파이프라인 크기를 정한다.
+    """
+    url = mjpeg_url(session)
+    if not url:
+        logger.info("No MJPEG server configured (APPIUM_MJPEG_URL / mjpegServerPort), using screenshot polling")
+        return None
+    try:
+        session.update_settings({"mjpegServerFramerate": settings.screen_fps})
+    except Exception as e:
+        logger.debug(f"mjpegServerFramerate not applied: {e}")
+
+    reader = MjpegReader(url)
+    reader.start()
+    frame = reader.wait_for_frame(0, MJPEG_PROBE_TIMEOUT)
+    reader.stop()
+    if frame is None:
+        logger.warning(f"MJPEG stream unavailable ({url}), using screenshot polling")
+        return None
+    width, height = jpeg_size(frame[1])
+    return MjpegCaptureWorker(reader, session, fps=settings.screen_fps, width=width, height=height)
+
+
+def create_appium_pipeline(session: Optional[AppiumSession] = None) -> Tuple[ScreenController, ActionHandler]:
+    """
+    CONTROL_MODE=appium 파이프라인 (세션 하나를 화면 캡처와 입력이 공유)
+
+    화면은 MJPEG 스트림을 우선 쓰고(JPEG 그대로 전달), 없으면 /screenshot 폴링으로 받는다.
+    스트림/AI/액션 좌표는 프레임 픽셀 기준이고, 입력 백엔드가 뷰포트 좌표로 바꾼다.
+    기기를 회전해 프레임 크기가 바뀌면 뷰포트를 다시 조회해 화면 크기, 액션 범위, 좌표 배율을 갱신한다.
+
+    Args:
+        session: 사용할 세션 (기본값: APPIUM_URL, APPIUM_CAPABILITIES로 새 세션)
+
+    Raises:
+        WebDriverError, OSError: Appium 서버에 연결하거나 세션을 만들 수 없는 경우
+    """
+    if session is None:
+        session = AppiumSession(settings.appium_url, json.loads(settings.appium_capabilities))
+    rect = session.window_rect()
+
+    capture: CaptureWorker = create_mjpeg_capture(session)
+    if capture is None:
+        with Image.open(io.BytesIO(session.screenshot())) as image:
+            width, height = image.size
+        capture = ScreenshotCaptureWorker(session, fps=settings.screen_fps, width=width, height=height)
+    width, height = capture.region["width"], capture.region["height"]
+
+    screen = ScreenController(capture=capture)
+    backend = AppiumBackend(session, viewport=(rect["width"], rect["height"]))
+    backend.set_geometry(backend.viewport, width, height)
+    actions = ActionHandler(screen_width=width, screen_height=height, backend=backend)
+
+    def on_resize(new_width: int, new_height: int):
+        # 회전하면 뷰포트도 바뀌므로 다시 조회
+        rect = session.window_rect()
+        screen.resize(new_width, new_height)
+        actions.screen_width, actions.screen_height = new_width, new_height
+        backend.set_geometry((rect["width"], rect["height"]), new_width, new_height)
+        logger.info(f"Appium screen resized: {new_width}x{new_height}, viewport {rect['width']}x{rect['height']}")
+
+    capture.on_resize = on_resize
+    source = "mjpeg" if isinstance(capture, MjpegCaptureWorker) else "screenshot"
+    logger.info(f"Appium pipeline ready: {source} {width}x{height}, viewport {rect['width']}x{rect['height']}")
+    return screen, actions
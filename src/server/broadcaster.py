@@ -0,0 +1,272 @@
+"""
+Web Player - 프레임 브로드캐스터
+하나의 캡처/인코딩 파이프라인 결과를 여러 시청자에게 팬아웃
+"""
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple, Union
+
+from .adaptive import AdaptiveController, StreamBounds
+from .frame_protocol import merge_tile_messages
+from .latency import FrameTiming, LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# 전송 메시지: 바이너리 프레임(bytes) 또는 직렬화된 JSON(str)
+StreamMessage = Union[bytes, str]
+
+# 우편함 항목: (메시지, 서버 쪽 타이밍, 하트비트는 None)
+PendingFrame = Tuple[StreamMessage, Optional[FrameTiming]]
+
+_subscriber_ids = itertools.count(1)
+
+# 병합된 델타가 이보다 커지면 키프레임으로 다시 동기화
+MAX_MERGED_BYTES = 4 * 1024 * 1024
+
+# 병합할 수 없는 비디오 패킷은 이 개수까지 순서대로 대기, 넘으면 키프레임으로 재동기화
+MAX_VIDEO_BACKLOG = 15
+
+
+class StreamSubscriber:
+    """
+    스트림 구독자 (시청자 1명)
+
+    "최신 프레임 우선" 우편함을 가진다. 클라이언트가 느려 이전 프레임을
+    아직 보내지 못했으면 새 프레임이 그 자리를 대신하고, 밀려난 프레임은 버린다.
+    지연이 소켓 버퍼에 쌓이지 않으므로 느린 회선에서도 화면 지연이 한정된다.
+
+    델타 구독자는 밀려난 타일을 잃으면 화면이 깨지므로, 대기 중인 델타에
+    새 델타의 타일을 이어 붙여 병합한다. 아직 보내지 못한 키프레임 뒤에는
+    병합된 델타 하나까지만 대기한다. 병합할 수 없으면 대기 중인 프레임을 버리고
+    다음 키프레임이 올 때까지 델타 프레임을 받지 않는다.
+
+    비디오 코덱 구독자의 패킷은 병합할 수 없으므로 MAX_VIDEO_BACKLOG개까지
+    순서대로 쌓고, 그보다 밀리면 키프레임부터 다시 받는다.
+    """
+
+    def __init__(
+        self,
+        binary: bool,
+        delta: bool,
+        ready: Optional[asyncio.Event] = None,
+        adaptive: Optional[AdaptiveController] = None,
+        video_codec: Optional[str] = None
+    ):
+        """
+        Args:
+            binary: 바이너리 프레임 프로토콜 사용 여부
+            delta: 타일 델타 모드 사용 여부
+            ready: 프레임이 들어오면 set()할 이벤트 (송신 루프 깨우기용)
+            adaptive: 이 시청자의 품질/FPS 제어기
+            video_codec: 비디오 코덱 모드 ("h264", "vp8"), 지정하면 델타 구독자로 동작
+        """
+        self.id = next(_subscriber_ids)
+        self.binary = binary
+        self.video_codec = video_codec
+        self.delta = delta or video_codec is not None
+        self.awaiting_keyframe = self.delta
+        self.ready = ready or asyncio.Event()
+        self.adaptive = adaptive or AdaptiveController(StreamBounds(), enabled=False)
+        self.profile: Optional[Tuple[int, float]] = None  # 마지막으로 받은 인코딩 프로필
+        self.digest: Optional[int] = None  # 마지막으로 받은 화면의 체크섬 (유휴 감지용)
+        self._last_offered_at = 0.0
+
+        # 최대 [키프레임, 병합된 델타] 두 칸, 그 외에는 한 칸
+        self._pending: Deque[PendingFrame] = deque()
+        self._tail_is_delta = False
+
+        # 종단 간 지연 (클라이언트 frame_ack로 집계)
+        self.latency = LatencyTracker()
+
+        # 통계
+        self.frames_offered = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.frames_merged = 0
+        self.heartbeats = 0
+
+    def offer(
+        self,
+        message: StreamMessage,
+        keyframe: bool = True,
+        timing: Optional[FrameTiming] = None
+    ) -> bool:
+        """
+        프레임을 우편함에 넣음 (생산자 쪽, 블로킹 없음)
+
+        Args:
+            message: 전송할 메시지
+            keyframe: 단독으로 화면을 복원할 수 있는 프레임인지 여부
+            timing: 캡처/인코딩 타이밍 (지연 측정용)
+
+        Returns:
+            False면 이 구독자에게 키프레임이 필요함
+        """
+        self.frames_offered += 1
+        self._last_offered_at = time.monotonic()
+
+        if keyframe or not self.delta:
+            # 단독으로 화면을 복원하므로 대기 중인 프레임을 모두 대체
+            self._drop(len(self._pending))
+            self._pending.clear()
+            self._pending.append((message, timing))
+            self._tail_is_delta = False
+            self.awaiting_keyframe = False
+        elif self.awaiting_keyframe:
+            self._drop(1)
+            return False
+        elif self.video_codec:
+            if len(self._pending) >= MAX_VIDEO_BACKLOG:
+                return self._resync()
+            self._pending.append((message, timing))
+            self._tail_is_delta = True
+        elif self._tail_is_delta:
+            merged = merge_tile_messages(self._pending[-1][0], message)
+            if merged is None or len(merged) > MAX_MERGED_BYTES:
+                return self._resync()
+            # 병합된 메시지의 헤더는 새 프레임을 따르므로 타이밍도 새 프레임 것
+            self._pending[-1] = (merged, timing)
+            self.frames_merged += 1
+        else:
+            self._pending.append((message, timing))
+            self._tail_is_delta = True
+
+        self.ready.set()
+        return True
+
+    def _resync(self) -> bool:
+        """델타를 더 이어 붙일 수 없음: 대기 중인 프레임을 버리고 키프레임부터 다시 동기화"""
+        self._drop(len(self._pending) + 1)
+        self._pending.clear()
+        self._tail_is_delta = False
+        self.awaiting_keyframe = True
+        return False
+
+    def offer_heartbeat(self, message: StreamMessage, interval: float) -> bool:
+        """
+        화면 변화가 없을 때 생존 신호 전달
+
+        마지막 전달 후 interval이 지났고 대기 중인 프레임이 없을 때만 넣는다
+        (대기 중인 델타를 대체하지 않음).
+
+        Returns:
+            하트비트를 넣었으면 True
+        """
+        now = time.monotonic()
+        if self._pending or now - self._last_offered_at < interval:
+            return False
+        self._last_offered_at = now
+        self._pending.append((message, None))
+        self.heartbeats += 1
+        self.ready.set()
+        return True
+
+    @property
+    def is_up_to_date(self) -> bool:
+        """현재 프로필의 화면을 이미 받았는지 (새 구독자, 프로필 변경, 키프레임 대기면 False)"""
+        return self.profile == self.adaptive.profile and not self.awaiting_keyframe
+
+    def wants_frame(self, now: float) -> bool:
+        """이 시청자의 FPS 간격이 지났는지 (전체 프레임 구독자용)"""
+        interval = 1.0 / self.adaptive.fps
+        return now - self._last_offered_at >= interval * 0.9
+
+    def _drop(self, count: int):
+        if count:
+            self.frames_dropped += count
+            self.adaptive.on_frames_dropped(count)
+
+    def take(self) -> Optional[PendingFrame]:
+        """대기 중인 (메시지, 타이밍)을 순서대로 꺼냄 (없으면 None)"""
+        if not self._pending:
+            return None
+        pending = self._pending.popleft()
+        if not self._pending:
+            self._tail_is_delta = False
+        return pending
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def get_stats(self) -> dict:
+        """구독자 통계"""
+        return {
+            "id": self.id,
+            "transport": "binary" if self.binary else "json",
+            "delta": self.delta,
+            "video_codec": self.video_codec,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "frames_merged": self.frames_merged,
+            "heartbeats": self.heartbeats,
+            "latency_ms": self.latency.get_stats(),
+            **self.adaptive.get_stats(),
+        }
+
+
+class FrameBroadcaster:
+    """
+    단일 생산자 팬아웃
+
+    첫 구독자가 생기면 생산자 태스크를 시작하고, 마지막 구독자가 떠나면 중지한다.
+    캡처와 인코딩 비용은 시청자 수와 무관하게 한 번만 든다.
+    생산자는 각 구독자의 우편함에 넣기만 하므로 느린 시청자가 생산자를 막지 않는다.
+    """
+
+    def __init__(self, produce: Callable[[], Awaitable[None]]):
+        """
+        Args:
+            produce: 구독자가 있는 동안 실행할 생산자 코루틴 함수
+        """
+        self._produce = produce
+        self._task: Optional[asyncio.Task] = None
+        self.subscribers: List[StreamSubscriber] = []
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(
+        self,
+        binary: bool = False,
+        delta: bool = False,
+        ready: Optional[asyncio.Event] = None,
+        adaptive: Optional[AdaptiveController] = None,
+        video_codec: Optional[str] = None
+    ) -> StreamSubscriber:
+        """구독자 등록 (필요 시 생산자 시작)"""
+        subscriber = StreamSubscriber(
+            binary=binary,
+            delta=delta,
+            ready=ready,
+            adaptive=adaptive,
+            video_codec=video_codec
+        )
+        self.subscribers.append(subscriber)
+        logger.info(f"Subscriber {subscriber.id} joined ({len(self.subscribers)} viewers)")
+
+        if not self.is_running:
+            self._task = asyncio.create_task(self._produce())
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber):
+        """구독자 해제 (마지막 구독자면 생산자 중지)"""
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+        logger.info(
+            f"Subscriber {subscriber.id} left ({len(self.subscribers)} viewers): "
+            f"{subscriber.get_stats()}"
+        )
+
+        if not self.subscribers:
+            self.stop()
+
+    def stop(self):
+        """생산자 중지"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
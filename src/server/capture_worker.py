@@ -0,0 +1,242 @@
+"""
+Web Player - 화면 캡처 워커
+mss 그래버를 프로세스 수명 동안 유지하는 전용 캡처 스레드
+"""
+import asyncio
+import logging
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import mss
+
+from .frame_scheduler import FrameScheduler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RawFrame:
+    """캡처된 원본 프레임"""
+    frame_id: int
+    width: int
+    height: int
+    shot: Any  # mss ScreenShot (또는 .raw BGRA 바이트/.width/.height를 가진 객체)
+    captured_at: float  # time.monotonic()
+    timestamp: float  # time.time()
+    digest: int = 0  # 픽셀 버퍼 CRC32 (같으면 화면 변화 없음)
+    capture_ms: float = 0.0  # grab + 체크섬에 걸린 시간
+
+
+class CaptureWorker:
+    """
+    전용 캡처 스레드
+
+    하나의 mss 인스턴스를 스레드 안에서 열어 계속 재사용하고,
+    캡처한 프레임을 최신 프레임 슬롯에 게시한다.
+    스트리밍 수요가 없을 때는 대기하며, 단발 요청 시 한 장만 캡처한다.
+    """
+
+    def __init__(self, fps: int, monitor_index: int = 1, region: Optional[dict] = None):
+        """
+        Args:
+            fps: 연속 캡처 시 초당 프레임 수
+            monitor_index: mss 모니터 인덱스 (1이 주 모니터)
+            region: 캡처할 영역 (mss 형식 {"left", "top", "width", "height"}, 전역 좌표).
+                    지정하면 모니터 전체 대신 이 영역만 캡처한다.
+        """
+        self.scheduler = FrameScheduler(fps)
+        self.monitor_index = monitor_index
+        self.region = region
+        self.monitor: Optional[dict] = None
+        self.capture_errors = 0
+        # 캡처 크기가 region과 달라졌을 때 (너비, 높이)로 호출 (Appium 기기 회전 등, 캡처 스레드에서)
+        self.on_resize: Optional[Callable[[int, int], None]] = None
+
+        self._cond = threading.Condition()
+        self._latest: Optional[RawFrame] = None
+        self._next_id = 0
+        self._demand = 0
+        self._oneshot = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def fps(self) -> float:
+        """연속 캡처 FPS (생산자가 시청자 중 가장 높은 FPS로 갱신)"""
+        return self.scheduler.fps
+
+    @fps.setter
+    def fps(self, fps: float):
+        with self._cond:
+            self.scheduler.fps = fps
+
+    def start(self):
+        """캡처 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="capture-worker", daemon=True
+        )
+        self._thread.start()
+        if self.region:
+            logger.info(f"Capture worker started (region {self.region})")
+        else:
+            logger.info(f"Capture worker started (monitor {self.monitor_index})")
+
+    def stop(self, timeout: float = 2.0):
+        """캡처 스레드 종료"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Capture worker stopped")
+
+    def acquire(self):
+        """연속 캡처 수요 등록"""
+        self.start()
+        with self._cond:
+            self._demand += 1
+            self._cond.notify_all()
+
+    def release(self):
+        """연속 캡처 수요 해제"""
+        with self._cond:
+            self._demand = max(0, self._demand - 1)
+
+    @property
+    def latest(self) -> Optional[RawFrame]:
+        """최신 프레임 슬롯"""
+        return self._latest
+
+    def wait_for_frame(self, after_id: int, timeout: float = 1.0) -> Optional[RawFrame]:
+        """
+        after_id 이후에 캡처된 프레임을 기다림 (블로킹)
+
+        연속 캡처 수요가 없으면 단발 캡처를 요청한다.
+
+        Returns:
+            RawFrame 또는 None (타임아웃)
+        """
+        self.start()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._latest is None or self._latest.frame_id <= after_id:
+                if self._demand == 0:
+                    self._oneshot = True
+                    self._cond.notify_all()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._cond.wait(remaining)
+            return self._latest
+
+    async def next_frame(self, after_id: int, timeout: float = 1.0) -> Optional[RawFrame]:
+        """이벤트 루프를 막지 않고 다음 프레임을 기다림"""
+        latest = self._latest
+        if latest is not None and latest.frame_id > after_id:
+            return latest
+        return await asyncio.to_thread(self.wait_for_frame, after_id, timeout)
+
+    def get_stats(self) -> Optional[dict]:
+        """캡처 소스 통계 (하위 클래스용, mss는 없음)"""
+        return None
+
+    def _open(self):
+        """캡처 소스 열기 (캡처 스레드에서 with 문으로 사용, 하위 클래스가 다른 소스로 교체)"""
+        return mss.mss()
+
+    def _shot(self, sct) -> Any:
+        """한 장 캡처 (.raw BGRA 바이트, .width, .height를 가진 객체)"""
+        if self.monitor is None:
+            self.monitor = self.region or sct.monitors[self.monitor_index]
+        return sct.grab(self.monitor)
+
+    def _digest(self, shot: Any) -> int:
+        """변경 감지용 체크섬"""
+        return zlib.crc32(shot.raw)
+
+    def _run(self):
+        """캡처 루프 (전용 스레드)"""
+        try:
+            with self._open() as source:
+                idle = True
+                while True:
+                    with self._cond:
+                        while self._running and self._demand == 0 and not self._oneshot:
+                            idle = True
+                            self._cond.wait()
+                        if not self._running:
+                            break
+
+                        # 연속 캡처: 절대 데드라인까지 대기 (단발 요청이나 종료가 오면 깨어나 다시 확인)
+                        streaming = self._demand > 0 and not self._oneshot
+                        if streaming:
+                            if idle:
+                                self.scheduler.reset()
+                                idle = False
+                            remaining = self.scheduler.time_until_due()
+                            if remaining > 0:
+                                self._cond.wait(remaining)
+                                continue
+                            self.scheduler.tick()
+                        self._oneshot = False
+
+                    self._grab(source)
+        except Exception as e:
+            logger.error(f"Capture worker error: {e}", exc_info=True)
+        finally:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+
+    def _grab(self, source):
+        """한 장 캡처 후 최신 프레임 슬롯에 게시"""
+        start = time.monotonic()
+        try:
+            shot = self._shot(source)
+        except Exception as e:
+            self.capture_errors += 1
+            logger.error(f"Frame grab error: {e}")
+            return
+
+        if self.region and (shot.width, shot.height) != (self.region["width"], self.region["height"]):
+            self._resize(shot.width, shot.height)
+
+        # 변경 감지용 체크섬 (캡처 스레드에서 계산, 4K 기준 수 ms)
+        digest = self._digest(shot)
+
+        captured_at = time.monotonic()
+        with self._cond:
+            self._next_id += 1
+            self._latest = RawFrame(
+                frame_id=self._next_id,
+                width=shot.width,
+                height=shot.height,
+                shot=shot,
+                captured_at=captured_at,
+                timestamp=time.time(),
+                digest=digest,
+                capture_ms=(captured_at - start) * 1000
+            )
+            self._cond.notify_all()
+
+    def _resize(self, width: int, height: int):
+        """
+        캡처 크기 변경 반영 (새 크기의 프레임을 게시하기 전에 호출)
+
+        region을 새 크기로 바꾸고 on_resize로 좌표계를 쓰는 쪽(화면 크기, 액션 범위)을 갱신한다.
+        """
+        logger.info(f"Capture size changed: {self.region['width']}x{self.region['height']} -> {width}x{height}")
+        self.region = {**self.region, "width": width, "height": height}
+        if self.on_resize is not None:
+            try:
+                self.on_resize(width, height)
+            except Exception as e:
+                logger.error(f"Resize handler error: {e}")
@@ -28,6 +28,17 @@ def get_env_int(key: str, default: int) -> int:
         return default
 
 
+def get_env_float(key: str, default: float) -> float:
+    """환경 변수를 실수로 읽기"""
+    value = os.environ.get(key)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
 def get_env_bool(key: str, default: bool) -> bool:
     """환경 변수를 불리언으로 읽기"""
     value = os.environ.get(key)
@@ -49,6 +60,56 @@ class Settings:
     screen_quality: int = 70
     screen_format: str = "JPEG"
 
+    # Parallel Encoding (이 픽셀 수 이상인 프레임은 가로 띠로 나눠 워커 풀에서 인코딩)
+    encode_workers: int = 0  # 0이면 CPU 코어 수
+    encode_parallel_min_pixels: int = 1000000
+
+    # Input Backend (pyautogui, xtest: X11 직접 주입/고정 대기 없음, recording: 기록만, auto: 가능하면 xtest)
+    input_backend: str = "pyautogui"
+
+    # Control Mode (desktop: 이 PC 화면/입력, appium: Appium 세션의 모바일 기기)
+    control_mode: str = "desktop"
+    appium_url: str = "http://127.0.0.1:4723"
+    appium_capabilities: str = '{"platformName": "Android", "appium:automationName": "UiAutomator2"}'  # JSON
+    appium_mjpeg_url: str = ""  # 비우면 세션의 mjpegServerPort로, 둘 다 없으면 /screenshot 폴링
+
+    # Adaptive Streaming (SCREEN_FPS / SCREEN_QUALITY가 클라이언트별 상한)
+    adaptive_streaming: bool = True
+    screen_fps_min: int = 5
+    screen_quality_min: int = 30
+    screen_scale_min: float = 0.5
+
+    # Video Codec Streaming (?codec=h264|vp8, PyAV 필요)
+    video_keyframe_interval: float = 5.0  # 초
+
+    # Idle Detection (화면 변화가 없으면 인코딩/전송 생략, 하트비트만 전송)
+    idle_detection: bool = True
+    heartbeat_interval: float = 1.0  # 초
+
+    # Cursor Channel (커서를 프레임과 별도 메시지로 전송, 클라이언트가 오버레이로 그림)
+    cursor_channel: bool = True
+    cursor_rate: int = 60  # 초당 샘플 수
+
+    # AI Snapshot (AI 분석/목표 자동화가 이 나이 이내의 스트림 프레임을 재사용)
+    snapshot_max_age_ms: int = 250
+
+    # Session Recording (프레임/액션을 세그먼트 파일에 기록, /replay로 재생)
+    recording_enabled: bool = False
+    recording_dir: str = "recordings"
+    recording_fps: int = 5
+    recording_quality: int = 60
+    recording_segment_mb: int = 64
+
+    # Tile Delta Encoding
+    tile_size: int = 64
+    keyframe_interval: int = 10  # 초
+
+    # Screen Region (전역 화면 좌표, 너비/높이가 0이면 전체 화면)
+    region_x: int = 0
+    region_y: int = 0
+    region_width: int = 0
+    region_height: int = 0
+
     # Security
     enable_auth: bool = False
     auth_token: Optional[str] = None
@@ -75,6 +136,36 @@ class Settings:
             screen_fps=get_env_int("SCREEN_FPS", 30),
             screen_quality=get_env_int("SCREEN_QUALITY", 70),
             screen_format=get_env("SCREEN_FORMAT", "JPEG"),
+            encode_workers=get_env_int("ENCODE_WORKERS", 0),
+            encode_parallel_min_pixels=get_env_int("ENCODE_PARALLEL_MIN_PIXELS", 1000000),
+            input_backend=get_env("INPUT_BACKEND", "pyautogui"),
+            control_mode=get_env("CONTROL_MODE", "desktop").lower(),
+            appium_url=get_env("APPIUM_URL", "http://127.0.0.1:4723"),
+            appium_capabilities=get_env(
+                "APPIUM_CAPABILITIES", '{"platformName": "Android", "appium:automationName": "UiAutomator2"}'
+            ),
+            appium_mjpeg_url=get_env("APPIUM_MJPEG_URL", ""),
+            adaptive_streaming=get_env_bool("ADAPTIVE_STREAMING", True),
+            screen_fps_min=get_env_int("SCREEN_FPS_MIN", 5),
+            screen_quality_min=get_env_int("SCREEN_QUALITY_MIN", 30),
+            screen_scale_min=get_env_float("SCREEN_SCALE_MIN", 0.5),
+            video_keyframe_interval=get_env_float("VIDEO_KEYFRAME_INTERVAL", 5.0),
+            idle_detection=get_env_bool("IDLE_DETECTION", True),
+            heartbeat_interval=get_env_float("HEARTBEAT_INTERVAL", 1.0),
+            cursor_channel=get_env_bool("CURSOR_CHANNEL", True),
+            cursor_rate=get_env_int("CURSOR_RATE", 60),
+            snapshot_max_age_ms=get_env_int("SNAPSHOT_MAX_AGE_MS", 250),
+            recording_enabled=get_env_bool("RECORDING_ENABLED", False),
+            recording_dir=get_env("RECORDING_DIR", "recordings"),
+            recording_fps=get_env_int("RECORDING_FPS", 5),
+            recording_quality=get_env_int("RECORDING_QUALITY", 60),
+            recording_segment_mb=get_env_int("RECORDING_SEGMENT_MB", 64),
+            tile_size=get_env_int("TILE_SIZE", 64),
+            keyframe_interval=get_env_int("KEYFRAME_INTERVAL", 10),
+            region_x=get_env_int("REGION_X", 0),
+            region_y=get_env_int("REGION_Y", 0),
+            region_width=get_env_int("REGION_WIDTH", 0),
+            region_height=get_env_int("REGION_HEIGHT", 0),
             enable_auth=get_env_bool("ENABLE_AUTH", False),
             auth_token=get_env("AUTH_TOKEN"),
             ws_ping_interval=get_env_int("WS_PING_INTERVAL", 30),
@@ -86,6 +177,11 @@ class Settings:
             uitars_mock_mode=get_env_bool("UITARS_MOCK_MODE", False),
         )
 
+    @property
+    def has_region(self) -> bool:
+        """캡처 영역이 지정되었는지 여부"""
+        return self.region_width > 0 and self.region_height > 0
+
 
 # 전역 설정 인스턴스
 settings = Settings.from_env()
@@ -0,0 +1,127 @@
+"""
+Web Player - 클라이언트 연결별 송신 경로
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from fastapi import WebSocket
+
+from .broadcaster import StreamSubscriber
+
+logger = logging.getLogger(__name__)
+
+
+class ClientConnection:
+    """
+    WebSocket 연결 하나의 송신 경로
+
+    모든 송신은 하나의 송신 루프를 거친다. 제어 메시지(상태, 응답)는 순서대로
+    빠짐없이 보내고, 커서 위치는 최신 값 하나만 보관해 프레임보다 먼저 보내며,
+    화면 프레임은 구독자의 "최신 프레임 우선" 우편함에서 시청자별 FPS 간격에 맞춰 꺼내 보낸다.
+    송신이 밀리면 프레임만 버려지고 제어 메시지와 수신 루프는 영향을 받지 않는다.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.id = id(websocket)
+        self.subscriber: Optional[StreamSubscriber] = None
+
+        self._control: Deque[str] = deque()
+        self._cursor: Optional[str] = None
+        self._ready = asyncio.Event()
+        self._closed = False
+
+        # 통계
+        self.messages_sent = 0
+        self.last_send_ms = 0.0
+        self.avg_send_ms = 0.0
+
+    @property
+    def ready(self) -> asyncio.Event:
+        """송신할 것이 생기면 set()되는 이벤트 (구독자와 공유)"""
+        return self._ready
+
+    async def send_json(self, data: dict):
+        """제어 메시지 송신 예약 (순서 보장, 버리지 않음)"""
+        if self._closed:
+            raise RuntimeError("Connection closed")
+        self._control.append(json.dumps(data))
+        self._ready.set()
+
+    def offer_cursor(self, message: str):
+        """커서 위치 메시지 보관 (아직 보내지 않은 이전 위치는 덮어씀)"""
+        if self._closed:
+            return
+        self._cursor = message
+        self._ready.set()
+
+    async def run(self):
+        """송신 루프 (연결이 끊기거나 취소될 때까지 실행)"""
+        next_frame_at = 0.0
+        try:
+            while True:
+                # 제어 메시지 우선
+                while self._control:
+                    await self._send(self._control.popleft())
+
+                # 커서 위치는 프레임과 무관하게 즉시 (작은 메시지, 최신 값만)
+                if self._cursor is not None:
+                    message, self._cursor = self._cursor, None
+                    await self._send(message)
+                    continue
+
+                # 시청자별 FPS 간격에 맞춰 최신 프레임 하나 전송
+                subscriber = self.subscriber
+                timeout = None
+                if subscriber is not None and subscriber.has_pending:
+                    timeout = next_frame_at - time.monotonic()
+                    if timeout <= 0:
+                        message, timing = subscriber.take()
+                        sent_at = time.monotonic()
+                        send_ms = await self._send(message)
+                        if timing is not None:
+                            subscriber.latency.on_sent(timing, sent_at, send_ms)
+                        subscriber.frames_sent += 1
+                        subscriber.adaptive.on_frame_sent(send_ms)
+                        # 캡처 간격의 흔들림으로 프레임을 하나씩 건너뛰지 않도록 약간 여유를 둠
+                        # (비디오 패킷은 모두 순서대로 보내야 하므로 간격을 두지 않음)
+                        if not subscriber.video_codec:
+                            next_frame_at = time.monotonic() + 0.9 / subscriber.adaptive.fps
+                        continue
+
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Send loop error ({self.id}): {e}")
+        finally:
+            self._closed = True
+
+    async def _send(self, message) -> float:
+        """실제 전송 및 송신 시간(ms) 측정"""
+        start = time.perf_counter()
+        if isinstance(message, bytes):
+            await self.websocket.send_bytes(message)
+        else:
+            await self.websocket.send_text(message)
+        self.last_send_ms = (time.perf_counter() - start) * 1000
+        self.avg_send_ms = self.avg_send_ms * 0.9 + self.last_send_ms * 0.1
+        self.messages_sent += 1
+        return self.last_send_ms
+
+    def get_stats(self) -> dict:
+        """연결 통계"""
+        stats = self.subscriber.get_stats() if self.subscriber else {}
+        stats.update({
+            "connection_id": self.id,
+            "avg_send_ms": round(self.avg_send_ms, 2),
+        })
+        return stats
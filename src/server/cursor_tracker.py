@@ -0,0 +1,130 @@
+"""
+Web Player - 커서 추적
+화면 프레임과 별개로 마우스 커서 위치와 모양을 샘플링한다.
+"""
+import base64
+import logging
+from io import BytesIO
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .input_backends import load_pyautogui
+
+try:
+    from Xlib import display as xdisplay
+except ImportError:
+    xdisplay = None
+
+logger = logging.getLogger(__name__)
+
+
+class CursorTracker:
+    """
+    커서 위치/모양 샘플러
+
+    위치는 pyautogui.position()으로 읽는다 (플랫폼 공통, 호출 비용이 작음).
+    모양은 X11 XFixes 확장(python-xlib)이 있을 때만 읽고, 커서 일련번호(serial)가
+    바뀐 경우에만 이미지를 변환한다. 그 외 환경에서는 클라이언트 기본 화살표를 쓴다.
+    """
+
+    def __init__(self, offset_x: int = 0, offset_y: int = 0, width: int = 0, height: int = 0):
+        """
+        Args:
+            offset_x, offset_y: 스트림 영역 원점 (전역 좌표)
+            width, height: 스트림 영역 크기 (밖으로 나가면 visible=False)
+        """
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.width = width
+        self.height = height
+
+        self._pyautogui = load_pyautogui()
+        self._position: Optional[Tuple[int, int, bool]] = None
+        self._serial: Optional[int] = None
+        self._display = None
+        self._root = None
+        if xdisplay is not None:
+            try:
+                self._display = xdisplay.Display()
+                if not self._display.has_extension("XFIXES"):
+                    raise RuntimeError("XFIXES extension not available")
+                self._display.xfixes_query_version()
+                self._root = self._display.screen().root
+            except Exception as e:
+                logger.info(f"Cursor shape tracking disabled: {e}")
+                self._display = None
+
+    @property
+    def has_shape(self) -> bool:
+        """커서 모양을 읽을 수 있는지"""
+        return self._display is not None
+
+    def poll_position(self) -> Optional[dict]:
+        """
+        커서 위치 샘플링
+
+        Returns:
+            바뀌었으면 {"type": "cursor", "x", "y", "visible"} (영역 좌표), 그대로면 None
+        """
+        gx, gy = self._pyautogui.position()
+        x, y = gx - self.offset_x, gy - self.offset_y
+        visible = 0 <= x < self.width and 0 <= y < self.height
+        position = (x, y, visible)
+        if position == self._position:
+            return None
+        self._position = position
+        return {"type": "cursor", "x": x, "y": y, "visible": visible}
+
+    def poll_shape(self) -> Optional[dict]:
+        """
+        커서 모양 샘플링 (XFixes)
+
+        Returns:
+            바뀌었으면 {"type": "cursor_shape", "width", "height", "hot_x", "hot_y", "data": base64 PNG},
+            그대로이거나 읽을 수 없으면 None
+        """
+        if self._display is None:
+            return None
+        try:
+            image = self._display.xfixes_get_cursor_image(self._root)
+        except Exception as e:
+            logger.warning(f"Cursor shape read failed, disabling: {e}")
+            self._display = None
+            return None
+
+        if image.cursor_serial == self._serial:
+            return None
+        self._serial = image.cursor_serial
+
+        # XFixes는 픽셀마다 ARGB(premultiplied) 정수 하나
+        argb = np.array(image.cursor_image, dtype=np.uint32).reshape(image.height, image.width)
+        rgba = np.dstack((
+            (argb >> 16) & 0xFF,
+            (argb >> 8) & 0xFF,
+            argb & 0xFF,
+            (argb >> 24) & 0xFF,
+        )).astype(np.uint8)
+        buffered = BytesIO()
+        Image.fromarray(rgba, "RGBA").save(buffered, format="PNG")
+
+        return {
+            "type": "cursor_shape",
+            "width": image.width,
+            "height": image.height,
+            "hot_x": image.xhot,
+            "hot_y": image.yhot,
+            "data": base64.b64encode(buffered.getvalue()).decode("utf-8"),
+        }
+
+    def reset(self):
+        """다음 샘플에서 위치/모양을 다시 보내도록 초기화"""
+        self._position = None
+        self._serial = None
+
+    def close(self):
+        """X 연결 종료"""
+        if self._display is not None:
+            self._display.close()
+            self._display = None
@@ -0,0 +1,148 @@
+"""
+Web Player - 이미지 인코더 백엔드
+프레임/타일 픽셀을 JPEG, WebP, PNG 바이트로 인코딩한다. Settings.screen_format으로 선택.
+"""
+import logging
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, List, Sequence, Tuple, Type
+
+import numpy as np
+from PIL import Image
+
+from .frame_protocol import CODEC_JPEG, CODEC_PNG, CODEC_WEBP
+from .frame_scaler import FrameSurface
+
+try:
+    from turbojpeg import TJPF_BGRX, TJPF_RGBX, TJSAMP_420, TurboJPEG
+except ImportError:
+    TurboJPEG = None
+
+logger = logging.getLogger(__name__)
+
+# 인코더별로 재사용하는 RGB 디코딩 이미지 수 (타일 인코딩은 크기가 다양함)
+MAX_REUSED_IMAGES = 32
+
+
+class ImageEncoder:
+    """
+    이미지 인코더 인터페이스
+
+    encode()는 FrameSurface(4바이트 픽셀 배열)를 받아 codec 형식의 바이트를 돌려준다.
+    인스턴스는 스트림 수명 동안 재사용한다 (스레드 하나에서만 사용).
+    """
+
+    name = ""
+    codec = CODEC_JPEG
+    mime = "image/jpeg"
+
+    def __init__(self):
+        self._images: "OrderedDict[Tuple[int, int], Image.Image]" = OrderedDict()
+        self._output = BytesIO()
+
+    def encode(self, surface: FrameSurface, quality: int) -> bytes:
+        raise NotImplementedError
+
+    def encode_many(self, surfaces: Sequence[FrameSurface], quality: int) -> List[bytes]:
+        """여러 영역(변경 타일) 인코딩 (병렬 인코더는 워커 풀에 나눔)"""
+        return [self.encode(surface, quality) for surface in surfaces]
+
+    def _decode(self, surface: FrameSurface) -> Image.Image:
+        """
+        픽셀 버퍼를 크기별로 재사용하는 RGB 이미지에 디코딩
+
+        Pillow raw 디코더가 (잘라낸 영역 포함) 원본 버퍼를 행 간격대로 직접 읽으므로
+        중간 복사나 프레임마다 새 이미지 할당이 없다.
+        """
+        size = (surface.width, surface.height)
+        image = self._images.pop(size, None)
+        if image is None:
+            image = Image.new('RGB', size)
+            if len(self._images) >= MAX_REUSED_IMAGES:
+                self._images.popitem(last=False)
+        self._images[size] = image
+        data, stride = surface.buffer()
+        image.frombytes(data, 'raw', (surface.rawmode, stride, 1))
+        return image
+
+    def _save(self, image: Image.Image, **params) -> bytes:
+        """재사용하는 출력 버퍼에 저장하고 결과 바이트 반환"""
+        output = self._output
+        output.seek(0)
+        output.truncate()
+        image.save(output, **params)
+        return output.getvalue()
+
+
+class PillowJpegEncoder(ImageEncoder):
+    """Pillow JPEG (optimize 없음: 허프만 테이블 최적화 패스를 생략해 지연을 줄임)"""
+
+    name = "JPEG"
+
+    def encode(self, surface: FrameSurface, quality: int) -> bytes:
+        return self._save(self._decode(surface), format="JPEG", quality=quality)
+
+
+class TurboJpegEncoder(ImageEncoder):
+    """libjpeg-turbo 직접 호출 (PyTurboJPEG, BGRX 버퍼를 변환 없이 입력)"""
+
+    name = "TURBOJPEG"
+
+    def __init__(self):
+        if TurboJPEG is None:
+            raise RuntimeError("PyTurboJPEG is not installed")
+        super().__init__()
+        self._jpeg = TurboJPEG()
+
+    def encode(self, surface: FrameSurface, quality: int) -> bytes:
+        pixels = np.ascontiguousarray(surface.pixels)
+        rgba = pixels.view(np.uint8).reshape(surface.height, surface.width, 4)
+        pixel_format = TJPF_BGRX if surface.rawmode == "BGRX" else TJPF_RGBX
+        return self._jpeg.encode(rgba, quality=quality, pixel_format=pixel_format, jpeg_subsample=TJSAMP_420)
+
+
+class WebPEncoder(ImageEncoder):
+    """Pillow WebP (method=0: 가장 빠른 설정)"""
+
+    name = "WEBP"
+    codec = CODEC_WEBP
+    mime = "image/webp"
+
+    def encode(self, surface: FrameSurface, quality: int) -> bytes:
+        return self._save(self._decode(surface), format="WEBP", quality=quality, method=0)
+
+
+class PngEncoder(ImageEncoder):
+    """Pillow PNG (무손실, 스냅샷용, quality 무시)"""
+
+    name = "PNG"
+    codec = CODEC_PNG
+    mime = "image/png"
+
+    def encode(self, surface: FrameSurface, quality: int) -> bytes:
+        return self._save(self._decode(surface), format="PNG", compress_level=1)
+
+
+ENCODERS: Dict[str, Type[ImageEncoder]] = {
+    cls.name: cls for cls in (PillowJpegEncoder, TurboJpegEncoder, WebPEncoder, PngEncoder)
+}
+
+
+def create_encoder(name: str) -> ImageEncoder:
+    """
+    이름으로 인코더 생성
+
+    알 수 없는 이름이거나 백엔드를 쓸 수 없으면 Pillow JPEG로 대체한다.
+
+    Args:
+        name: "JPEG", "TURBOJPEG", "WEBP", "PNG" (대소문자 무관)
+    """
+    cls = ENCODERS.get(name.upper())
+    if cls is None:
+        logger.warning(f"Unknown screen format {name}, using JPEG")
+        return PillowJpegEncoder()
+    try:
+        return cls()
+    except Exception as e:
+        logger.warning(f"{cls.name} encoder unavailable ({e}), using JPEG")
+        return PillowJpegEncoder()
@@ -0,0 +1,146 @@
+"""
+Web Player - 바이너리 프레임 프로토콜
+
+JSON + Base64 대신 고정 길이 헤더 뒤에 인코딩된 이미지 바이트를 그대로 붙여
+WebSocket 바이너리 메시지로 전송한다.
+
+헤더 (little-endian, 20 bytes):
+    version   uint8   프로토콜 버전
+    kind      uint8   메시지 종류 (KIND_*)
+    codec     uint8   페이로드 코덱 (CODEC_*)
+    flags     uint8   FLAG_* 비트 (FLAG_KEYFRAME: 이 메시지만으로 전체 화면 복원 가능)
+    frame_id  uint32  프레임 번호
+    timestamp float64 캡처 시각 (epoch seconds)
+    width     uint16  원격 화면 너비
+    height    uint16  원격 화면 높이
+"""
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+PROTOCOL_VERSION = 1
+
+# 메시지 종류
+KIND_FRAME = 1  # 전체 프레임 이미지
+KIND_TILES = 2  # 변경된 타일 목록 (델타)
+KIND_HEARTBEAT = 3  # 화면 변화 없음 (페이로드 없음)
+KIND_VIDEO = 4  # 비디오 코덱 패킷 (이전 프레임에 의존, keyframe 플래그로 구분)
+
+# 플래그
+FLAG_KEYFRAME = 0x01
+
+# 페이로드 코덱
+CODEC_NONE = 0
+CODEC_JPEG = 1
+CODEC_PNG = 2
+CODEC_WEBP = 3
+CODEC_H264 = 4  # Annex B 바이트 스트림
+CODEC_VP8 = 5
+
+CODEC_IDS = {
+    "JPEG": CODEC_JPEG,
+    "PNG": CODEC_PNG,
+    "WEBP": CODEC_WEBP,
+}
+# 코덱 ID → 이미지 형식 이름 (JSON 프레임의 format 필드)
+CODEC_NAMES = {codec: name.lower() for name, codec in CODEC_IDS.items()}
+
+HEADER = struct.Struct("<BBBBIdHH")
+
+# 타일 페이로드: count(uint16) 후 타일마다 x, y, w, h(uint16) + length(uint32) + 이미지 바이트
+TILE_COUNT = struct.Struct("<H")
+TILE_HEADER = struct.Struct("<HHHHI")
+
+
+@dataclass
+class EncodedFrame:
+    """인코딩된 프레임 (전송 방식과 무관)"""
+    frame_id: int
+    timestamp: float
+    width: int
+    height: int
+    codec: int
+    data: bytes
+    kind: int = KIND_FRAME
+    keyframe: bool = True
+
+
+def pack_frame(frame: EncodedFrame) -> bytes:
+    """EncodedFrame을 바이너리 메시지로 직렬화"""
+    header = HEADER.pack(
+        PROTOCOL_VERSION,
+        frame.kind,
+        frame.codec,
+        FLAG_KEYFRAME if frame.keyframe else 0,
+        frame.frame_id & 0xFFFFFFFF,
+        frame.timestamp,
+        frame.width,
+        frame.height
+    )
+    return header + frame.data
+
+
+def unpack_header(message: bytes) -> dict:
+    """바이너리 메시지 헤더 파싱"""
+    if len(message) < HEADER.size:
+        raise ValueError(f"Message too short: {len(message)} bytes")
+    version, kind, codec, flags, frame_id, timestamp, width, height = HEADER.unpack_from(message)
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"Unsupported protocol version: {version}")
+    return {
+        "kind": kind,
+        "codec": codec,
+        "flags": flags,
+        "frame_id": frame_id,
+        "timestamp": timestamp,
+        "width": width,
+        "height": height,
+    }
+
+
+def pack_tiles(tiles: List[Tuple[int, int, int, int, bytes]]) -> bytes:
+    """(x, y, w, h, 이미지 바이트) 타일 목록을 KIND_TILES 페이로드로 직렬화"""
+    parts = [TILE_COUNT.pack(len(tiles))]
+    for x, y, w, h, data in tiles:
+        parts.append(TILE_HEADER.pack(x, y, w, h, len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def unpack_tiles(payload: bytes) -> List[Tuple[int, int, int, int, bytes]]:
+    """KIND_TILES 페이로드 파싱"""
+    (count,) = TILE_COUNT.unpack_from(payload)
+    offset = TILE_COUNT.size
+    tiles = []
+    for _ in range(count):
+        x, y, w, h, length = TILE_HEADER.unpack_from(payload, offset)
+        offset += TILE_HEADER.size
+        tiles.append((x, y, w, h, bytes(payload[offset:offset + length])))
+        offset += length
+    return tiles
+
+
+def merge_tile_messages(older: bytes, newer: bytes) -> Optional[bytes]:
+    """
+    아직 보내지 못한 KIND_TILES 메시지 두 개를 하나로 병합
+
+    타일은 순서대로 그려지므로 이전 타일 뒤에 새 타일을 이어 붙이면
+    두 메시지를 차례로 적용한 것과 같은 화면이 된다. 헤더는 새 메시지를 따른다.
+
+    Returns:
+        병합된 메시지, 병합할 수 없으면 None
+    """
+    if older[1] != KIND_TILES or newer[1] != KIND_TILES:
+        return None
+    (older_count,) = TILE_COUNT.unpack_from(older, HEADER.size)
+    (newer_count,) = TILE_COUNT.unpack_from(newer, HEADER.size)
+    if older_count + newer_count > 0xFFFF:
+        return None
+
+    body_start = HEADER.size + TILE_COUNT.size
+    return b"".join((
+        newer[:HEADER.size],
+        TILE_COUNT.pack(older_count + newer_count),
+        older[body_start:],
+        newer[body_start:],
+    ))
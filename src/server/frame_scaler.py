@@ -0,0 +1,205 @@
+"""
+Web Player - 프레임 축소
+캡처한 BGRA 프레임을 인코딩 전에 지정 배율로 줄인다.
+"""
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from PIL import Image
+
+from .capture_worker import RawFrame
+
+# numpy로 축소하는 배율: (입력 묶음 픽셀 수, 출력 픽셀별로 섞을 입력 위치)
+# 위치 하나는 복사, 둘은 평균, 셋은 가운데 가중 평균(1/4, 1/2, 1/4)
+REDUCTIONS: Dict[float, Tuple[int, Tuple[Tuple[int, ...], ...]]] = {
+    0.75: (4, ((0,), (1, 2), (3,))),  # 4픽셀 → 3픽셀 (가운데 두 픽셀을 평균)
+    0.5: (2, ((0, 1),)),  # 2픽셀 → 1픽셀
+    0.33: (3, ((0, 1, 2),)),  # 3픽셀 → 1픽셀
+}
+
+# 바이트별 평균에서 다음 바이트로 넘어가는 최하위 비트를 지우는 마스크
+_HALF_MASK = np.uint32(0xFEFEFEFE)
+
+
+@dataclass
+class FrameSurface:
+    """
+    인코딩 입력 픽셀
+
+    pixels는 (height, width) uint32 배열로, 각 원소가 4바이트 픽셀 하나다.
+    rawmode는 Pillow가 이 바이트를 RGB로 해석하는 방식 ('BGRX' 또는 'RGBX').
+    """
+    pixels: np.ndarray
+    rawmode: str
+    scale: float
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    def buffer(self) -> Tuple[np.ndarray, int]:
+        """
+        픽셀 버퍼를 복사 없이 (1차원 연속 배열, 행 간격 bytes)로 반환
+
+        crop()으로 잘라낸 영역도 원본 버퍼 위의 보기로 돌려주므로
+        Pillow raw 디코더에 행 간격(stride)과 함께 넘기면 복사 없이 읽힌다.
+        """
+        pixels = self.pixels
+        if pixels.strides[1] != pixels.itemsize:
+            pixels = np.ascontiguousarray(pixels)
+        stride = pixels.strides[0]
+        length = (stride // pixels.itemsize) * (self.height - 1) + self.width
+        return as_strided(pixels, shape=(length,), strides=(pixels.itemsize,)), stride
+
+    def to_image(self) -> Image.Image:
+        """RGB 이미지로 변환 (새 이미지 할당, 반복 인코딩은 encoders.ImageEncoder의 재사용 버퍼 사용)"""
+        data, stride = self.buffer()
+        return Image.frombuffer('RGB', (self.width, self.height), data, 'raw', self.rawmode, stride, 1)
+
+    def crop(self, x: int, y: int, w: int, h: int) -> "FrameSurface":
+        """영역 보기 (픽셀을 복사하지 않음)"""
+        return FrameSurface(pixels=self.pixels[y:y + h, x:x + w], rawmode=self.rawmode, scale=self.scale)
+
+
+def _average(a: np.ndarray, b: np.ndarray, out: np.ndarray, tmp: np.ndarray):
+    """
+    픽셀 평균 (uint32 하나에 담긴 4채널을 풀지 않고 채널별 floor((a + b) / 2))
+
+    (a & b) + ((a ^ b) >> 1)을 바이트마다 계산한다. out은 a와 같은 배열이어도 된다.
+    """
+    np.bitwise_xor(a, b, out=tmp)
+    np.bitwise_and(tmp, _HALF_MASK, out=tmp)
+    np.right_shift(tmp, 1, out=tmp)
+    np.bitwise_and(a, b, out=out)
+    np.add(out, tmp, out=out)
+
+
+def _blend(inputs: Sequence[np.ndarray], out: np.ndarray, tmp: np.ndarray):
+    """REDUCTIONS의 위치 목록대로 입력을 섞어 out에 씀"""
+    if len(inputs) == 1:
+        np.copyto(out, inputs[0])
+    elif len(inputs) == 2:
+        _average(inputs[0], inputs[1], out, tmp)
+    else:
+        _average(inputs[0], inputs[2], out, tmp)
+        _average(out, inputs[1], out, tmp)
+
+
+class _Reduction:
+    """
+    배율 하나의 numpy 축소 (행 방향 → 열 방향, 출력/중간 버퍼는 처음에 한 번 할당)
+
+    입력을 step픽셀 묶음으로 나눠 묶음마다 len(taps)픽셀을 만든다. 묶음에 못 미치는
+    오른쪽/아래 가장자리 나머지(step - 1픽셀 이하)는 버린다.
+    """
+
+    def __init__(self, height: int, width: int, step: int, taps: Tuple[Tuple[int, ...], ...]):
+        self.source_shape = (height, width)
+        self.step = step
+        self.taps = taps
+        count = len(taps)
+        groups_y, groups_x = height // step, width // step
+        self.rows = np.empty((groups_y * count, width), dtype=np.uint32)
+        self.pixels = np.empty((groups_y * count, groups_x * count), dtype=np.uint32)
+        self._row_tmp = np.empty((groups_y, width), dtype=np.uint32)
+        self._col_tmp = np.empty((groups_y * count, groups_x), dtype=np.uint32)
+
+    def run(self, source: np.ndarray) -> np.ndarray:
+        """source (height, width) uint32 → self.pixels (덮어씀)"""
+        step, count = self.step, len(self.taps)
+        groups_y, groups_x = self._row_tmp.shape[0], self._col_tmp.shape[1]
+        source = source[:groups_y * step]
+        for phase, taps in enumerate(self.taps):
+            _blend([source[t::step] for t in taps], self.rows[phase::count], self._row_tmp)
+        rows = self.rows[:, :groups_x * step]
+        for phase, taps in enumerate(self.taps):
+            _blend([rows[:, t::step] for t in taps], self.pixels[:, phase::count], self._col_tmp)
+        return self.pixels
+
+
+class _Sampling:
+    """
+    REDUCTIONS에 없는 배율의 최근접 표본 축소 (색인/출력 버퍼는 처음에 한 번 할당)
+
+    출력 픽셀마다 가운데에 해당하는 입력 픽셀 하나를 골라 행 방향 → 열 방향으로 복사한다.
+    """
+
+    def __init__(self, height: int, width: int, scale: float):
+        self.source_shape = (height, width)
+        out_height = max(1, round(height * scale))
+        out_width = max(1, round(width * scale))
+        self._ys = np.minimum(((np.arange(out_height) + 0.5) / scale).astype(np.intp), height - 1)
+        self._xs = np.minimum(((np.arange(out_width) + 0.5) / scale).astype(np.intp), width - 1)
+        self.rows = np.empty((out_height, width), dtype=np.uint32)
+        self.pixels = np.empty((out_height, out_width), dtype=np.uint32)
+
+    def run(self, source: np.ndarray) -> np.ndarray:
+        """source (height, width) uint32 → self.pixels (덮어씀)"""
+        # mode='clip'은 out에 바로 씀 (기본 'raise'는 내부 버퍼를 거침), 색인은 이미 범위 안
+        np.take(source, self._ys, axis=0, out=self.rows, mode='clip')
+        np.take(self.rows, self._xs, axis=1, out=self.pixels, mode='clip')
+        return self.pixels
+
+
+def _reducer_for(height: int, width: int, scale: float) -> Union[_Reduction, _Sampling]:
+    """배율에 맞는 축소기 (REDUCTIONS에 있으면 묶음 평균, 없으면 최근접 표본)"""
+    for s, (step, taps) in REDUCTIONS.items():
+        if abs(s - scale) < 0.01 and height >= step and width >= step:
+            return _Reduction(height, width, step, taps)
+    return _Sampling(height, width, scale)
+
+
+def _source_pixels(raw: RawFrame) -> np.ndarray:
+    return np.frombuffer(raw.shot.raw, dtype=np.uint32).reshape(raw.height, raw.width)
+
+
+def make_surface(raw: RawFrame, scale: float = 1.0) -> FrameSurface:
+    """
+    원본 프레임에서 인코딩 입력 생성
+
+    scale이 1이면 캡처 버퍼를 복사 없이 그대로 사용한다.
+    축소 결과는 새 배열에 담기므로 한 번만 쓰는 경우(스냅샷)에 사용하고,
+    스트리밍처럼 매 프레임 축소할 때는 FrameScaler를 사용한다.
+    """
+    if scale >= 1.0:
+        return FrameSurface(pixels=_source_pixels(raw), rawmode='BGRX', scale=1.0)
+    pixels = _reducer_for(raw.height, raw.width, scale).run(_source_pixels(raw))
+    return FrameSurface(pixels=pixels, rawmode='BGRX', scale=scale)
+
+
+class FrameScaler:
+    """
+    출력 버퍼를 재사용하는 프레임 축소기
+
+    배율별로 한 번 할당한 출력/중간 버퍼에 numpy로 직접 축소한다 (Pillow 이미지 없음).
+    allocations는 이 버퍼를 새로 만든 횟수로, 배율이나 캡처 크기가 바뀔 때만 늘어난다.
+    반환한 FrameSurface는 같은 배율로 다음 프레임을 축소할 때 덮어써지므로,
+    한 스레드에서 프레임 하나를 모두 인코딩한 뒤 다음 프레임으로 넘어가는 곳에서만 사용한다.
+    """
+
+    def __init__(self):
+        self._reducers: Dict[float, Union[_Reduction, _Sampling]] = {}
+        self.allocations = 0
+
+    def surface(self, raw: RawFrame, scale: float = 1.0) -> FrameSurface:
+        """원본 프레임에서 인코딩 입력 생성 (scale 1은 캡처 버퍼 그대로)"""
+        if scale >= 1.0:
+            return make_surface(raw)
+
+        reducer = self._reducers.get(scale)
+        if reducer is None or reducer.source_shape != (raw.height, raw.width):
+            self._reducers[scale] = reducer = _reducer_for(raw.height, raw.width, scale)
+            self.allocations += 1
+        return FrameSurface(pixels=reducer.run(_source_pixels(raw)), rawmode='BGRX', scale=scale)
+
+    def retain(self, scales):
+        """쓰지 않는 배율의 버퍼 해제"""
+        for scale in list(self._reducers):
+            if scale not in scales:
+                del self._reducers[scale]
@@ -0,0 +1,99 @@
+"""
+Web Player - 데드라인 기반 프레임 스케줄러
+단조 시계(time.monotonic)의 절대 데드라인으로 캡처 시점을 정하고 지터를 집계한다.
+"""
+import bisect
+import math
+import time
+from collections import deque
+from typing import Deque, Optional
+
+# 지터(실제 시작 시각 - 데드라인) 히스토그램 경계 (ms)
+JITTER_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100)
+
+# 실제 FPS 계산에 쓰는 최근 프레임 수
+RATE_WINDOW = 60
+
+
+class FrameScheduler:
+    """
+    절대 데드라인 프레임 스케줄러
+
+    데드라인은 start + n * interval로 고정되어, 한 프레임이 늦어도 다음 프레임의 위상이
+    밀리지 않는다. 한 간격 이상 뒤처지면 놓친 데드라인을 건너뛰고(missed에 집계)
+    다음 데드라인부터 다시 맞춘다. 벽시계 변경의 영향을 받지 않는다.
+    """
+
+    def __init__(self, fps: float):
+        self._fps = fps
+        self.interval = 1.0 / fps
+        self._deadline: Optional[float] = None
+        self._ticks: Deque[float] = deque(maxlen=RATE_WINDOW)
+
+        # 통계
+        self.frames = 0
+        self.missed = 0
+        self.jitter_histogram = [0] * (len(JITTER_BUCKETS_MS) + 1)
+        self.max_jitter_ms = 0.0
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @fps.setter
+    def fps(self, fps: float):
+        """목표 FPS 변경 (다음 데드라인은 마지막 데드라인 + 새 간격)"""
+        if fps == self._fps:
+            return
+        if self._deadline is not None:
+            self._deadline += 1.0 / fps - self.interval
+        self._fps = fps
+        self.interval = 1.0 / fps
+
+    def reset(self, now: Optional[float] = None):
+        """유휴 후 재개: 다음 데드라인을 지금으로 (유휴 구간은 지터로 세지 않음)"""
+        self._deadline = time.monotonic() if now is None else now
+        self._ticks.clear()
+
+    def time_until_due(self, now: Optional[float] = None) -> float:
+        """다음 데드라인까지 남은 시간 (초, 0 이하면 지금 시작해야 함)"""
+        if self._deadline is None:
+            return 0.0
+        return self._deadline - (time.monotonic() if now is None else now)
+
+    def tick(self, now: Optional[float] = None):
+        """프레임 시작: 지터 기록 후 다음 데드라인으로 이동 (밀렸으면 건너뜀)"""
+        now = time.monotonic() if now is None else now
+        if self._deadline is None:
+            self._deadline = now
+
+        lateness = now - self._deadline
+        jitter_ms = abs(lateness) * 1000
+        self.jitter_histogram[bisect.bisect_right(JITTER_BUCKETS_MS, jitter_ms)] += 1
+        self.max_jitter_ms = max(self.max_jitter_ms, jitter_ms)
+        self.frames += 1
+        self._ticks.append(now)
+
+        skipped = math.floor(lateness / self.interval) if lateness >= self.interval else 0
+        self.missed += skipped
+        self._deadline += (skipped + 1) * self.interval
+
+    @property
+    def actual_fps(self) -> float:
+        """최근 RATE_WINDOW 프레임 기준 실제 FPS"""
+        if len(self._ticks) < 2:
+            return 0.0
+        span = self._ticks[-1] - self._ticks[0]
+        return (len(self._ticks) - 1) / span if span > 0 else 0.0
+
+    def get_stats(self) -> dict:
+        """스케줄 통계"""
+        labels = [f"<{bound}ms" for bound in JITTER_BUCKETS_MS] + [f">={JITTER_BUCKETS_MS[-1]}ms"]
+        return {
+            "target_fps": self._fps,
+            "actual_fps": round(self.actual_fps, 1),
+            "frames": self.frames,
+            "missed_deadlines": self.missed,
+            "max_jitter_ms": round(self.max_jitter_ms, 2),
+            "jitter_histogram": dict(zip(labels, self.jitter_histogram)),
+        }
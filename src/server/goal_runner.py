@@ -9,6 +9,7 @@ import time
 from pathlib import Path
 from typing import Optional, List, TYPE_CHECKING
 
+from .config import settings
 from .models import (
     GoalStatus, ActionHistoryEntry, GoalAutomationStatus, ActionRequest
 )
@@ -33,6 +34,7 @@ class GoalAutomationRunner:
         self.screen = screen_controller
         self.action = action_handler
         self.ai = ui_tars_client
+        self._defaults = (screen_controller, action_handler)
 
         # 실행 상태
         self.goal: str = ""
@@ -42,6 +44,7 @@ class GoalAutomationRunner:
         self.goal_status: GoalStatus = GoalStatus()
         self.is_running: bool = False
         self.finish_reason: Optional[str] = None
+        self.owner = None  # 자동화를 시작한 연결 (상태를 받고, 중지할 수 있는 연결)
 
         # 제어
         self._stop_requested: bool = False
@@ -60,15 +63,26 @@ class GoalAutomationRunner:
         goal: str,
         max_steps: int,
         websocket,
-        interval_seconds: float = 2.0
+        interval_seconds: float = 2.0,
+        screen_controller: Optional["ScreenController"] = None,
+        action_handler: Optional["ActionHandler"] = None
     ):
-        """목표 자동화 시작"""
+        """
+        목표 자동화 시작
+
+        Args:
+            screen_controller: 캡처할 화면 (기본값: 생성 시 지정한 화면)
+            action_handler: 액션을 실행할 핸들러 (screen_controller와 같은 모니터 좌표계)
+        """
         if self.is_running:
             raise RuntimeError("Automation already running")
 
         self._reset()
+        self.screen = screen_controller or self._defaults[0]
+        self.action = action_handler or self._defaults[1]
         self.goal = goal
         self.max_steps = max_steps
+        self.owner = websocket
         self.is_running = True
 
         logger.info(f"Goal automation started: {goal} (max_steps={max_steps})")
@@ -77,6 +91,10 @@ class GoalAutomationRunner:
             self._run_loop(websocket, interval_seconds)
         )
 
+    def is_owned_by(self, connection) -> bool:
+        """connection이 실행 중인 자동화를 시작한 연결인지"""
+        return self.is_running and self.owner is connection
+
     def stop(self):
         """자동화 중지 요청"""
         logger.info("Goal automation stop requested")
@@ -92,8 +110,10 @@ class GoalAutomationRunner:
                 # 상태 전송
                 await self._send_status(websocket)
 
-                # Phase 1: 화면 캡처
-                frame = self.screen.capture_frame()
+                # Phase 1: 화면 캡처 (직전 액션 이후의 프레임이면 스트림 프레임 재사용)
+                frame = await self.screen.get_frame(
+                    min(settings.snapshot_max_age_ms, interval_seconds * 1000)
+                )
                 if not frame:
                     logger.error("Failed to capture screen")
                     await asyncio.sleep(1)
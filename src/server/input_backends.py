@@ -0,0 +1,369 @@
+"""
+Web Player - 입력 백엔드
+마우스/키보드 입력을 OS에 주입하는 방식 (pyautogui, X11 XTest, 기록 전용)
+"""
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Type
+
+from .latency import percentile
+
+try:
+    from Xlib import X, XK
+    from Xlib import display as xdisplay
+    from Xlib.ext import xtest
+except ImportError:
+    xdisplay = None
+
+logger = logging.getLogger(__name__)
+
+# pyautogui는 import할 때 X 디스플레이가 필요하므로 처음 쓸 때 불러온다 (appium 모드는 불러오지 않음)
+pyautogui = None
+
+# 액션 종류별로 보관하는 최근 실행 시간 샘플 수
+LATENCY_SAMPLES = 200
+
+
+def load_pyautogui():
+    """pyautogui 모듈 (처음 호출 시 import 후 안전 설정)"""
+    global pyautogui
+    if pyautogui is None:
+        import pyautogui as module
+        module.FAILSAFE = True
+        module.PAUSE = 0.1
+        pyautogui = module
+    return pyautogui
+
+
+class ActionLatency:
+    """액션 종류별 실행 시간 (입력 스레드에서 기록, 백엔드별 비교용)"""
+
+    def __init__(self):
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def add(self, action_type: str, ms: float):
+        self._samples.setdefault(action_type, deque(maxlen=LATENCY_SAMPLES)).append(ms)
+        self._counts[action_type] = self._counts.get(action_type, 0) + 1
+
+    def get_stats(self) -> dict:
+        """{액션 종류: {count, p50, p99, max}} (ms)"""
+        stats = {}
+        for action_type, samples in list(self._samples.items()):
+            values = sorted(samples)
+            stats[action_type] = {
+                "count": self._counts[action_type],
+                "p50": round(percentile(values, 50), 2),
+                "p99": round(percentile(values, 99), 2),
+                "max": round(values[-1], 2),
+            }
+        return stats
+
+
+class InputBackend:
+    """
+    입력 백엔드 인터페이스
+
+    좌표는 전역 화면 좌표, 키 이름은 pyautogui 이름('ctrl', 'enter', 'f5', 'a' 등)이다.
+    모든 메서드는 입력 워커 스레드 하나에서만 호출된다.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.latency = ActionLatency()
+
+    def move(self, x: int, y: int):
+        raise NotImplementedError
+
+    def click(self, x: int, y: int, button: str = "left", count: int = 1):
+        raise NotImplementedError
+
+    def drag(self, start_x: int, start_y: int, end_x: int, end_y: int):
+        raise NotImplementedError
+
+    def scroll(self, clicks: int, x: Optional[int] = None, y: Optional[int] = None):
+        """clicks > 0이면 위로"""
+        raise NotImplementedError
+
+    def type_text(self, text: str):
+        raise NotImplementedError
+
+    def press(self, key: str):
+        raise NotImplementedError
+
+    def hotkey(self, *keys: str):
+        raise NotImplementedError
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """매크로 실행 구간 (백엔드의 고정 대기를 끔, 단계 간 대기는 pause()로)"""
+        yield
+
+    def pause(self, seconds: float):
+        """매크로 단계 사이 대기"""
+        time.sleep(seconds)
+
+    def close(self):
+        """OS 자원 해제"""
+
+    def get_stats(self) -> dict:
+        return {"backend": self.name, "latency_ms": self.latency.get_stats()}
+
+    def _paste(self, text: str) -> bool:
+        """클립보드 붙여넣기로 입력 (한글 등 키 매핑이 없는 문자, pyperclip이 없으면 False)"""
+        try:
+            import pyperclip
+        except ImportError:
+            return False
+        pyperclip.copy(text)
+        self.hotkey('ctrl', 'v')
+        return True
+
+
+class PyAutoGuiBackend(InputBackend):
+    """pyautogui (플랫폼 공통, 호출마다 PAUSE 0.1초, 드래그 0.5초)"""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        super().__init__()
+        load_pyautogui()
+
+    def move(self, x: int, y: int):
+        pyautogui.moveTo(x, y)
+
+    def click(self, x: int, y: int, button: str = "left", count: int = 1):
+        if count == 2:
+            pyautogui.doubleClick(x, y, button=button)
+        else:
+            pyautogui.click(x, y, button=button)
+
+    def drag(self, start_x: int, start_y: int, end_x: int, end_y: int):
+        pyautogui.moveTo(start_x, start_y)
+        pyautogui.dragTo(end_x, end_y, duration=0.5)
+
+    def scroll(self, clicks: int, x: Optional[int] = None, y: Optional[int] = None):
+        if x is not None and y is not None:
+            pyautogui.scroll(clicks, x=x, y=y)
+        else:
+            pyautogui.scroll(clicks)
+
+    def type_text(self, text: str):
+        if not self._paste(text):
+            pyautogui.write(text, interval=0.05)
+
+    def press(self, key: str):
+        pyautogui.press(key)
+
+    def hotkey(self, *keys: str):
+        pyautogui.hotkey(*keys)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        pause = pyautogui.PAUSE
+        pyautogui.PAUSE = 0
+        try:
+            yield
+        finally:
+            pyautogui.PAUSE = pause
+
+
+class XTestBackend(InputBackend):
+    """
+    X11 XTest 직접 주입 (python-xlib, 고정 대기 없음)
+
+    이벤트마다 sync()로 X 서버가 처리한 것을 확인하고 돌아온다.
+    드래그는 중간 이동 이벤트를 DRAG_STEPS번 보내 앱이 드래그로 인식하게 한다.
+    """
+
+    name = "xtest"
+
+    DRAG_STEPS = 10
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+    SCROLL_UP, SCROLL_DOWN = 4, 5
+
+    # pyautogui 키 이름 → X keysym 이름
+    KEYSYMS = {
+        "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+        "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+        "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R",
+        "command": "Super_L", "win": "Super_L", "winleft": "Super_L",
+        "enter": "Return", "return": "Return", "tab": "Tab", "escape": "Escape", "esc": "Escape",
+        "space": "space", " ": "space", "backspace": "BackSpace", "delete": "Delete", "del": "Delete",
+        "insert": "Insert", "home": "Home", "end": "End", "pageup": "Prior", "pagedown": "Next",
+        "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+        "capslock": "Caps_Lock", "printscreen": "Print", "\n": "Return", "\t": "Tab",
+    }
+
+    def __init__(self):
+        if xdisplay is None:
+            raise RuntimeError("python-xlib is not installed")
+        super().__init__()
+        self._display = xdisplay.Display()
+        if not self._display.has_extension("XTEST"):
+            self._display.close()
+            raise RuntimeError("X server has no XTEST extension")
+        self._keycodes: Dict[str, Tuple[int, bool]] = {}
+
+    def move(self, x: int, y: int):
+        self._motion(x, y)
+        self._display.sync()
+
+    def click(self, x: int, y: int, button: str = "left", count: int = 1):
+        self._motion(x, y)
+        for _ in range(count):
+            self._button(self.BUTTONS[button])
+        self._display.sync()
+
+    def drag(self, start_x: int, start_y: int, end_x: int, end_y: int):
+        button = self.BUTTONS["left"]
+        self._motion(start_x, start_y)
+        xtest.fake_input(self._display, X.ButtonPress, button)
+        for step in range(1, self.DRAG_STEPS + 1):
+            self._motion(
+                start_x + (end_x - start_x) * step // self.DRAG_STEPS,
+                start_y + (end_y - start_y) * step // self.DRAG_STEPS
+            )
+            self._display.sync()
+        xtest.fake_input(self._display, X.ButtonRelease, button)
+        self._display.sync()
+
+    def scroll(self, clicks: int, x: Optional[int] = None, y: Optional[int] = None):
+        if x is not None and y is not None:
+            self._motion(x, y)
+        button = self.SCROLL_UP if clicks > 0 else self.SCROLL_DOWN
+        for _ in range(abs(clicks)):
+            self._button(button)
+        self._display.sync()
+
+    def type_text(self, text: str):
+        if self._paste(text):
+            return
+        for char in text:
+            keycode, shift = self._keycode(char)
+            self._key(keycode, shift)
+        self._display.sync()
+
+    def press(self, key: str):
+        keycode, shift = self._keycode(key)
+        self._key(keycode, shift)
+        self._display.sync()
+
+    def hotkey(self, *keys: str):
+        keycodes = [self._keycode(key)[0] for key in keys]
+        for keycode in keycodes:
+            xtest.fake_input(self._display, X.KeyPress, keycode)
+        for keycode in reversed(keycodes):
+            xtest.fake_input(self._display, X.KeyRelease, keycode)
+        self._display.sync()
+
+    def close(self):
+        self._display.close()
+
+    def _motion(self, x: int, y: int):
+        xtest.fake_input(self._display, X.MotionNotify, x=x, y=y)
+
+    def _button(self, button: int):
+        xtest.fake_input(self._display, X.ButtonPress, button)
+        xtest.fake_input(self._display, X.ButtonRelease, button)
+
+    def _key(self, keycode: int, shift: bool):
+        shift_code = self._keycode("shift")[0] if shift else 0
+        if shift:
+            xtest.fake_input(self._display, X.KeyPress, shift_code)
+        xtest.fake_input(self._display, X.KeyPress, keycode)
+        xtest.fake_input(self._display, X.KeyRelease, keycode)
+        if shift:
+            xtest.fake_input(self._display, X.KeyRelease, shift_code)
+
+    def _keycode(self, key: str) -> Tuple[int, bool]:
+        """키 이름/문자 → (keycode, Shift 필요 여부)"""
+        if key in self._keycodes:
+            return self._keycodes[key]
+        name = self.KEYSYMS.get(key.lower() if len(key) > 1 else key, key)
+        keysym = XK.string_to_keysym(name) or XK.string_to_keysym(name.capitalize())
+        if not keysym and len(key) == 1 and ord(key) < 0x100:
+            keysym = ord(key)  # Latin-1 문자는 keysym이 코드 포인트와 같음
+        entries = list(self._display.keysym_to_keycodes(keysym)) if keysym else []
+        if not entries:
+            raise ValueError(f"Unknown key: {key!r}")
+        keycode, index = min(entries, key=lambda entry: entry[1])
+        self._keycodes[key] = (keycode, index % 2 == 1)
+        return self._keycodes[key]
+
+
+class RecordingBackend(InputBackend):
+    """
+    기록 전용 백엔드 (OS 입력 없음, 테스트/벤치마크용)
+
+    호출을 (메서드, 인자) 목록으로 남긴다. delay_ms로 호출당 지연을 흉내 낼 수 있다.
+    """
+
+    name = "recording"
+
+    def __init__(self, delay_ms: float = 0.0):
+        super().__init__()
+        self.delay_ms = delay_ms
+        self.events: List[Tuple[str, tuple]] = []
+
+    def _record(self, method: str, *args):
+        self.events.append((method, args))
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+
+    def move(self, x: int, y: int):
+        self._record("move", x, y)
+
+    def click(self, x: int, y: int, button: str = "left", count: int = 1):
+        self._record("click", x, y, button, count)
+
+    def drag(self, start_x: int, start_y: int, end_x: int, end_y: int):
+        self._record("drag", start_x, start_y, end_x, end_y)
+
+    def scroll(self, clicks: int, x: Optional[int] = None, y: Optional[int] = None):
+        self._record("scroll", clicks, x, y)
+
+    def type_text(self, text: str):
+        self._record("type_text", text)
+
+    def press(self, key: str):
+        self._record("press", key)
+
+    def hotkey(self, *keys: str):
+        self._record("hotkey", *keys)
+
+
+BACKENDS: Dict[str, Type[InputBackend]] = {
+    cls.name: cls for cls in (PyAutoGuiBackend, XTestBackend, RecordingBackend)
+}
+
+
+def create_backend(name: str) -> InputBackend:
+    """
+    이름으로 입력 백엔드 생성
+
+    "auto"는 X11 XTest를 쓸 수 있으면 xtest, 아니면 pyautogui.
+    알 수 없는 이름이거나 백엔드를 쓸 수 없으면 pyautogui로 대체한다.
+
+    Args:
+        name: "pyautogui", "xtest", "recording", "auto" (대소문자 무관)
+    """
+    name = name.lower()
+    if name == "auto":
+        try:
+            return XTestBackend()
+        except Exception as e:
+            logger.info(f"XTest input unavailable ({e}), using pyautogui")
+            return PyAutoGuiBackend()
+    cls = BACKENDS.get(name)
+    if cls is None:
+        logger.warning(f"Unknown input backend {name}, using pyautogui")
+        return PyAutoGuiBackend()
+    try:
+        return cls()
+    except Exception as e:
+        logger.warning(f"{cls.name} input backend unavailable ({e}), using pyautogui")
+        return PyAutoGuiBackend()
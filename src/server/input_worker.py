@@ -0,0 +1,177 @@
+"""
+Web Player - 입력 워커
+입력 백엔드 호출을 이벤트 루프 밖의 전용 스레드에서 순서대로 실행한다.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 뒤따른 같은 종류의 요청에 합쳐져 따로 실행되지 않은 요청의 결과
+COALESCED = object()
+
+
+@dataclass
+class InputTask:
+    """입력 대기열 항목 (합쳐진 요청의 Future까지 모두 가짐, 마지막이 실제 실행 결과를 받음)"""
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    futures: List[asyncio.Future]
+    loop: asyncio.AbstractEventLoop
+    key: Optional[str] = None
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class InputWorker:
+    """
+    전용 입력 스레드
+
+    submit()한 순서대로 하나씩 실행하고, 결과는 제출한 이벤트 루프의 Future로 돌려준다.
+    pyautogui.PAUSE나 드래그 duration 같은 대기가 이 스레드에서만 일어나므로
+    스트리밍과 다른 메시지 처리는 막히지 않는다. 모니터별 ActionHandler가 하나를 공유해
+    입력 순서가 전역으로 유지된다. 실행 전에 취소된 항목은 건너뛴다.
+
+    key를 주고 제출한 요청은 대기열 맨 끝(아직 시작 전)의 항목이 같은 key, 같은 fn이면 merge로 그 항목에
+    합친다 (호버는 마지막 위치로, 스크롤은 양을 더함). fn까지 같아야 하므로 다른 모니터의 핸들러
+    (다른 좌표 원점) 요청과는 합치지 않는다. 맨 끝만 보므로 사이에 다른 요청이 있으면
+    합치지 않아 클릭/키 입력과의 순서는 그대로다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._queue: Deque[InputTask] = deque()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # 통계
+        self.executed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.coalesced: Dict[str, int] = {}
+        self.max_depth = 0
+        self._wait_ms_total = 0.0
+        self._run_ms_total = 0.0
+
+    def start(self):
+        """입력 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="input-worker", daemon=True)
+        self._thread.start()
+        logger.info("Input worker started")
+
+    def stop(self, timeout: float = 2.0):
+        """입력 스레드 종료 (대기 중인 항목은 마저 실행)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Input worker stopped")
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        key: Optional[str] = None,
+        merge: Optional[Callable[[Tuple[Any, ...], Tuple[Any, ...]], Optional[Tuple[Any, ...]]]] = None
+    ) -> asyncio.Future:
+        """
+        대기열 끝에 추가 (key와 fn이 같은 대기 항목이 맨 끝에 있으면 합침)
+
+        Args:
+            key: 합칠 수 있는 요청 종류 (None이면 항상 따로 실행)
+            merge: (대기 중인 args, 새 args) → 합친 args, 합칠 수 없으면 None (기본값: 새 args로 교체)
+
+        Returns:
+            fn(*args)의 결과(또는 예외)로 완료되는 Future (await 가능).
+            뒤이은 요청에 합쳐지면 COALESCED로 완료된다.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._cond:
+            tail = self._queue[-1] if self._queue else None
+            if key is not None and tail is not None and tail.key == key and tail.fn == fn and tail.loop is loop:
+                merged = merge(tail.args, args) if merge else args
+                if merged is not None:
+                    tail.args = merged
+                    tail.futures.append(future)
+                    self.coalesced[key] = self.coalesced.get(key, 0) + 1
+                    return future
+            self._queue.append(InputTask(fn=fn, args=args, futures=[future], loop=loop, key=key))
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify()
+        return future
+
+    @property
+    def depth(self) -> int:
+        """대기 중인 항목 수"""
+        return len(self._queue)
+
+    def get_stats(self) -> dict:
+        """입력 워커 통계"""
+        done = self.executed + self.failed
+        return {
+            "queued": self.depth,
+            "max_depth": self.max_depth,
+            "executed": self.executed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "coalesced": dict(self.coalesced),
+            "avg_wait_ms": round(self._wait_ms_total / done, 2) if done else 0.0,
+            "avg_run_ms": round(self._run_ms_total / done, 2) if done else 0.0,
+        }
+
+    def _run(self):
+        """입력 스레드 본체"""
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                task = self._queue.popleft()
+
+            if all(future.cancelled() for future in task.futures):
+                self.cancelled += 1
+                continue
+
+            start = time.monotonic()
+            result, error = None, None
+            try:
+                result = task.fn(*task.args)
+                self.executed += 1
+            except Exception as e:
+                error = e
+                self.failed += 1
+            end = time.monotonic()
+            self._wait_ms_total += (start - task.queued_at) * 1000
+            self._run_ms_total += (end - start) * 1000
+
+            try:
+                task.loop.call_soon_threadsafe(self._resolve, task.futures, result, error)
+            except RuntimeError:
+                # 제출한 이벤트 루프가 이미 닫힘
+                pass
+
+    @staticmethod
+    def _resolve(futures: List[asyncio.Future], result: Any, error: Optional[BaseException]):
+        """이벤트 루프에서 Future 완료 (마지막 요청이 실행 결과, 앞선 요청은 COALESCED)"""
+        for index, future in enumerate(futures):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            elif index == len(futures) - 1:
+                future.set_result(result)
+            else:
+                future.set_result(COALESCED)
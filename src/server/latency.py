@@ -0,0 +1,117 @@
+"""
+Web Player - 종단 간 프레임 지연 측정
+캡처 → 인코딩 → 전송 → 클라이언트 디코딩/그리기 구간별 시간을 시청자마다 집계한다.
+"""
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+
+# 확인 응답을 기다리는 전송 프레임 수 (넘으면 가장 오래된 것부터 버림)
+MAX_IN_FLIGHT = 256
+
+# 백분위수 계산에 쓰는 최근 샘플 수
+SAMPLE_WINDOW = 300
+
+
+@dataclass(frozen=True)
+class FrameTiming:
+    """서버 쪽 프레임 타이밍 (인코딩 결과 하나당 하나, 구독자 간 공유)"""
+    frame_id: int
+    captured_at: float  # time.monotonic(), 캡처 완료 시각
+    capture_ms: float  # 화면 캡처(grab)에 걸린 시간
+    encode_ms: float  # 축소 + 인코딩에 걸린 시간
+    encoded_at: float  # time.monotonic(), 인코딩 완료 시각
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """정렬된 값의 p 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LatencyTracker:
+    """
+    시청자 1명의 캡처 → 화면 표시 지연 집계
+
+    송신 루프가 보낸 프레임을 frame_id로 기록하고, 클라이언트가 그 프레임을 그린 뒤
+    보내는 frame_ack를 받으면 구간별 시간을 샘플로 남긴다.
+    capture_to_paint는 서버 시계만으로 잰다(캡처 시간 + 캡처 완료부터 ack 수신까지)이므로
+    ack가 돌아오는 상향 구간만큼 실제보다 조금 크게 잡힌다.
+    병합되었거나 버려진 프레임은 ack가 오지 않으며, 더 새로운 프레임의 ack가 오면 정리한다.
+    """
+
+    def __init__(self, window: int = SAMPLE_WINDOW):
+        self._in_flight: "OrderedDict[int, tuple]" = OrderedDict()
+        self._samples: Dict[str, Deque[float]] = {
+            stage: deque(maxlen=window)
+            for stage in ("capture_to_paint", "capture", "encode", "queue", "send", "network", "decode")
+        }
+        self.frames_acked = 0
+
+    def on_sent(self, timing: FrameTiming, sent_at: float, send_ms: float):
+        """
+        송신 루프가 프레임을 보냄
+
+        Args:
+            timing: 프레임의 서버 쪽 타이밍
+            sent_at: 전송 시작 시각 (time.monotonic())
+            send_ms: websocket send에 걸린 시간
+        """
+        self._in_flight[timing.frame_id] = (timing, sent_at, send_ms)
+        while len(self._in_flight) > MAX_IN_FLIGHT:
+            self._in_flight.popitem(last=False)
+
+    def on_ack(self, frame_id: int, decode_ms: Optional[float] = None) -> bool:
+        """
+        클라이언트가 프레임을 그렸음
+
+        Args:
+            frame_id: 그린 프레임 번호
+            decode_ms: 클라이언트 디코딩 + 그리기 시간
+
+        Returns:
+            기록된 프레임이면 True
+        """
+        entry = self._in_flight.pop(frame_id, None)
+        # 이 프레임보다 오래된 프레임은 더 이상 ack가 오지 않음
+        while self._in_flight and next(iter(self._in_flight)) < frame_id:
+            self._in_flight.popitem(last=False)
+        if entry is None:
+            return False
+
+        timing, sent_at, send_ms = entry
+        now = time.monotonic()
+        total_ms = timing.capture_ms + (now - timing.captured_at) * 1000
+        in_flight_ms = (now - sent_at) * 1000 - send_ms
+
+        samples = self._samples
+        samples["capture_to_paint"].append(total_ms)
+        samples["capture"].append(timing.capture_ms)
+        samples["encode"].append(timing.encode_ms)
+        samples["queue"].append(max(0.0, (sent_at - timing.encoded_at) * 1000))
+        samples["send"].append(send_ms)
+        if decode_ms is not None:
+            samples["decode"].append(decode_ms)
+            in_flight_ms -= decode_ms
+        samples["network"].append(max(0.0, in_flight_ms))
+        self.frames_acked += 1
+        return True
+
+    def get_stats(self) -> dict:
+        """capture_to_paint 백분위수와 구간별 평균 (ms)"""
+        total = sorted(self._samples["capture_to_paint"])
+        return {
+            "samples": len(total),
+            "p50": round(percentile(total, 50), 1),
+            "p90": round(percentile(total, 90), 1),
+            "p99": round(percentile(total, 99), 1),
+            "stages": {
+                stage: round(sum(values) / len(values), 2) if values else 0.0
+                for stage, values in self._samples.items()
+                if stage != "capture_to_paint"
+            },
+        }
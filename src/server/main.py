@@ -3,16 +3,26 @@ Web Player - FastAPI Application
 """
 import asyncio
 import logging
+import math
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import ValidationError
 
 from .config import settings
-from .models import ActionRequest, AICommandRequest, AICommandResponse, GoalAutomationRequest
+from .connection import ClientConnection
+from .models import (
+    ActionBatchRequest, ActionBatchResponse, ActionRequest, AICommandRequest, AICommandResponse, GoalAutomationRequest
+)
 from .screen_controller import ScreenController
 from .action_handler import ActionHandler
+from .appium_controller import create_appium_pipeline
+from .input_backends import create_backend
+from .monitors import MonitorRegistry, list_monitors
+from .recorder import Recording, list_recordings, stream_recording
 from .ui_tars_client import UITarsClient
 from .goal_runner import GoalAutomationRunner
 
@@ -23,11 +33,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 캡처/입력 스레드 정리
+    screen_controller.shutdown()
+    monitors.shutdown()
+    action_handler.worker.stop()
+    action_handler.backend.close()
+
+
 # FastAPI app
 app = FastAPI(
     title="Web Player",
     description="UI-TARS Remote Desktop Control System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Static files
@@ -35,12 +56,20 @@ static_path = Path(__file__).parent.parent.parent / "static"
 if static_path.exists():
     app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
-# Controllers
-screen_controller = ScreenController()
-action_handler = ActionHandler(
-    screen_width=screen_controller.screen_width,
-    screen_height=screen_controller.screen_height
-)
+# Controllers (CONTROL_MODE=appium이면 Appium 세션 하나를 화면/입력이 공유, 목표 자동화 간에도 재사용)
+if settings.control_mode == "appium":
+    screen_controller, action_handler = create_appium_pipeline()
+else:
+    screen_controller = ScreenController()
+    action_handler = ActionHandler(
+        screen_width=screen_controller.screen_width,
+        screen_height=screen_controller.screen_height,
+        offset_x=screen_controller.offset_x,
+        offset_y=screen_controller.offset_y,
+        backend=create_backend(settings.input_backend)
+    )
+action_handler.on_action = screen_controller.record_action
+monitors = MonitorRegistry(screen_controller, action_handler)
 ui_tars_client = UITarsClient()
 goal_runner = GoalAutomationRunner(
     screen_controller=screen_controller,
@@ -65,25 +94,155 @@ async def health_check():
         "version": "1.0.0",
         "screen": {
             "width": screen_controller.screen_width,
-            "height": screen_controller.screen_height
-        }
+            "height": screen_controller.screen_height,
+            "region": screen_controller.region
+        },
+        "input": {**action_handler.worker.get_stats(), **action_handler.backend.get_stats()}
     }
 
 
+@app.get("/monitors")
+async def get_monitors():
+    """모니터 목록 (index 0은 가상 데스크톱, /ws?monitor=N 으로 구독, appium 모드는 빈 목록)"""
+    if settings.control_mode == "appium":
+        return {"monitors": []}
+    return {"monitors": list_monitors()}
+
+
+@app.get("/recordings")
+async def get_recordings():
+    """녹화 세션 목록 (RECORDING_ENABLED, /replay?session=... 으로 재생)"""
+    return {"recordings": list_recordings(settings.recording_dir)}
+
+
+@app.websocket("/replay")
+async def replay_endpoint(websocket: WebSocket):
+    """
+    녹화 재생 (뷰어 바이너리 프로토콜)
+
+    ?session=<이름>&t=<세션 시작 후 초>&speed=<배속>, 재생 중 {"type": "seek", "t": 초}로 이동.
+    세션/시각이 잘못되었으면 재생을 시작하기 전에 error를 보낸다.
+    """
+    await websocket.accept()
+    params = websocket.query_params
+    recording = None
+    try:
+        recording = Recording(settings.recording_dir, params.get("session", ""))
+        timestamp = recording.time_at(float(params.get("t", 0)))
+        speed = float(params.get("speed", 1))
+        if not math.isfinite(speed):
+            raise ValueError(f"Invalid replay speed: {speed}")
+        speed = max(0.1, speed)
+    except ValueError as e:
+        if recording is not None:
+            recording.close()
+        await websocket.send_json({
+            "type": "error",
+            "message": str(e),
+            "code": "INVALID_RECORDING"
+        })
+        await websocket.close()
+        return
+
+    logger.info(f"Replay started: {recording.session} at +{timestamp - recording.start}s x{speed}")
+    await websocket.send_json({
+        "type": "status",
+        "status": "connected",
+        "message": f"Replaying {recording.session}",
+        "start": recording.start,
+        "duration": round(recording.end - recording.start, 1)
+    })
+
+    replay_task = asyncio.create_task(_replay(websocket, recording, timestamp, speed))
+    try:
+        while True:
+            data = await websocket.receive_json()
+            if isinstance(data, dict) and data.get("type") == "seek":
+                try:
+                    timestamp = recording.time_at(float(data.get("t", 0)))
+                except (TypeError, ValueError) as e:
+                    await websocket.send_json({"type": "error", "message": str(e), "code": "INVALID_SEEK"})
+                    continue
+                replay_task.cancel()
+                await asyncio.gather(replay_task, return_exceptions=True)
+                replay_task = asyncio.create_task(_replay(websocket, recording, timestamp, speed))
+    except WebSocketDisconnect:
+        logger.info("Replay client disconnected")
+    except Exception as e:
+        logger.error(f"Replay error: {e}", exc_info=True)
+    finally:
+        replay_task.cancel()
+        await asyncio.gather(replay_task, return_exceptions=True)
+        recording.close()
+
+
+async def _replay(websocket: WebSocket, recording: Recording, timestamp: float, speed: float):
+    """재생 태스크 (읽기 오류는 조용히 멈추지 않고 클라이언트에 알림)"""
+    try:
+        await stream_recording(websocket, recording, timestamp, speed)
+    except Exception as e:
+        logger.error(f"Replay error: {e}", exc_info=True)
+        await websocket.send_json({"type": "error", "message": str(e), "code": "REPLAY_ERROR"})
+
+
+def _optional_number(value, cast):
+    """
+    클라이언트 JSON의 숫자 필드 변환 (None은 그대로)
+
+    Raises:
+        TypeError, ValueError: 숫자가 아니거나 유한하지 않은 경우
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise TypeError(f"not a number: {value!r}")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"not a finite number: {value!r}")
+    number = cast(value)
+    if not math.isfinite(number):
+        raise ValueError(f"not a finite number: {value!r}")
+    return number
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     client_id = id(websocket)
-    logger.info(f"Client connected: {client_id}")
+    # ?transport=binary 로 접속한 클라이언트만 바이너리 프레임 수신
+    binary = websocket.query_params.get("transport") == "binary"
+    # ?delta=tiles 로 접속하면 변경된 타일만 전송 (바이너리 전송 필요)
+    delta = binary and websocket.query_params.get("delta") == "tiles"
+    # ?codec=h264|vp8 로 접속하면 비디오 코덱 스트림 (바이너리 전송 필요, PyAV 없으면 타일 델타)
+    codec = websocket.query_params.get("codec") if binary else None
+
+    # ?monitor=N 으로 모니터 선택 (미지정 시 기본 화면), 액션 좌표는 그 모니터 기준
+    try:
+        monitor = websocket.query_params.get("monitor")
+        screen, actions = monitors.get(int(monitor) if monitor else None)
+    except ValueError as e:
+        await websocket.send_json({
+            "type": "error",
+            "message": str(e),
+            "code": "INVALID_MONITOR"
+        })
+        await websocket.close()
+        return
+
+    logger.info(
+        f"Client connected: {client_id} (transport: {'binary' if binary else 'json'}, "
+        f"monitor: {monitor or 'default'})"
+    )
 
-    await websocket.send_json({
+    # 모든 송신은 연결별 송신 루프를 거침 (프레임은 최신 프레임 우선)
+    connection = ClientConnection(websocket)
+    await connection.send_json({
         "type": "status",
         "status": "connected",
         "message": "Connection established"
     })
 
     streaming_task = asyncio.create_task(
-        screen_controller.start_streaming(websocket)
+        screen.start_streaming(connection, binary=binary, delta=delta, codec=codec)
     )
 
     try:
@@ -94,16 +253,31 @@ async def websocket_endpoint(websocket: WebSocket):
             if data.get("type") == "action":
                 try:
                     action = ActionRequest(**data)
-                    result = await action_handler.process_action(action)
-                    await websocket.send_json(result.model_dump())
+                    result = await actions.process_action(action)
+                    await connection.send_json(result.model_dump())
                 except Exception as e:
                     logger.error(f"Action error: {e}")
-                    await websocket.send_json({
+                    await connection.send_json({
                         "type": "error",
                         "message": str(e),
                         "code": "ACTION_ERROR"
                     })
 
+            elif data.get("type") == "action_batch":
+                try:
+                    batch = ActionBatchRequest(**data)
+                except ValidationError as e:
+                    error = e.errors()[0]
+                    await connection.send_json(ActionBatchResponse(
+                        id=data.get("id") if isinstance(data.get("id"), str) else None,
+                        status="error",
+                        code="INVALID_INPUT",
+                        message=f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    ).model_dump())
+                    continue
+                result = await actions.process_batch(batch)
+                await connection.send_json(result.model_dump())
+
             elif data.get("type") == "ai_command":
                 # AI 명령 처리
                 try:
@@ -111,7 +285,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     logger.info(f"AI command received: {instruction}")
 
                     if not ui_tars_client.is_available():
-                        await websocket.send_json(
+                        await connection.send_json(
                             AICommandResponse(
                                 success=False,
                                 error="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
@@ -119,10 +293,10 @@ async def websocket_endpoint(websocket: WebSocket):
                         )
                         continue
 
-                    # 현재 화면 캡처
-                    frame = screen_controller.capture_frame()
+                    # 현재 화면 (스트림이 방금 캡처한 프레임이 있으면 재사용)
+                    frame = await screen.get_frame(settings.snapshot_max_age_ms)
                     if not frame:
-                        await websocket.send_json(
+                        await connection.send_json(
                             AICommandResponse(
                                 success=False,
                                 error="Failed to capture screen"
@@ -134,8 +308,8 @@ async def websocket_endpoint(websocket: WebSocket):
                     result = await ui_tars_client.analyze_and_act(
                         screenshot_base64=frame.data,
                         instruction=instruction,
-                        screen_width=screen_controller.screen_width,
-                        screen_height=screen_controller.screen_height
+                        screen_width=screen.screen_width,
+                        screen_height=screen.screen_height
                     )
 
                     if result.get("success") and result.get("action_type"):
@@ -145,11 +319,11 @@ async def websocket_endpoint(websocket: WebSocket):
                         if action_request and result.get("action_type") != "finished":
                             # 실제 액션 실행
                             action = ActionRequest(**action_request)
-                            action_result = await action_handler.process_action(action)
+                            action_result = await actions.process_action(action)
                             logger.info(f"Action executed: {action_result}")
 
                     # 응답 전송
-                    await websocket.send_json(
+                    await connection.send_json(
                         AICommandResponse(
                             success=result.get("success", False),
                             thought=result.get("thought"),
@@ -161,26 +335,88 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 except Exception as e:
                     logger.error(f"AI command error: {e}", exc_info=True)
-                    await websocket.send_json(
+                    await connection.send_json(
                         AICommandResponse(
                             success=False,
                             error=str(e)
                         ).model_dump()
                     )
 
+            elif data.get("type") == "keyframe_request":
+                screen.request_keyframe()
+
             elif data.get("type") == "config":
+                # 이 클라이언트의 스트림에만 적용 (다른 시청자에게 영향 없음)
                 setting = data.get("setting")
                 value = data.get("value")
-                if setting == "quality":
-                    screen_controller.quality = max(10, min(100, value))
-                elif setting == "fps":
-                    screen_controller.fps = max(1, min(60, value))
-                await websocket.send_json({
+                if setting in ("quality", "fps"):
+                    # 잘못된 값은 적용하지 않음 (연결은 유지)
+                    try:
+                        value = _optional_number(value, int)
+                        if value is None:
+                            raise ValueError("value is required")
+                    except (TypeError, ValueError):
+                        logger.debug(f"Ignoring malformed config: {data!r}")
+                        await connection.send_json({
+                            "type": "error",
+                            "message": f"Invalid {setting} value: {data.get('value')!r}",
+                            "code": "INVALID_INPUT"
+                        })
+                        continue
+                adaptive = connection.subscriber.adaptive if connection.subscriber else None
+                if adaptive is not None:
+                    if setting == "quality":
+                        adaptive.set_quality(value)
+                    elif setting == "fps":
+                        adaptive.set_fps(value)
+                    elif setting == "adaptive":
+                        adaptive.enabled = bool(value)
+                await connection.send_json({
                     "type": "status",
                     "status": "config_updated",
                     "message": f"{setting} set to {value}"
                 })
 
+            elif data.get("type") == "client_stats":
+                # 클라이언트 측 디코딩 시간 보고 (적응 제어 입력, 잘못된 값이면 무시)
+                try:
+                    decode_ms = _optional_number(data.get("decode_ms"), float)
+                except (TypeError, ValueError):
+                    logger.debug(f"Ignoring malformed client_stats: {data!r}")
+                    continue
+                if connection.subscriber and decode_ms is not None:
+                    connection.subscriber.adaptive.on_client_report(decode_ms)
+                # 답으로 이 클라이언트의 종단 간 지연 통계 전송 (UI 표시용)
+                if connection.subscriber:
+                    await connection.send_json({
+                        "type": "latency_stats",
+                        **connection.subscriber.latency.get_stats()
+                    })
+
+            elif data.get("type") == "frame_ack":
+                # 클라이언트가 프레임을 그렸음 → 캡처~표시 지연 샘플 (잘못된 값이면 무시)
+                try:
+                    frame_id = _optional_number(data.get("frame_id"), int)
+                    decode_ms = _optional_number(data.get("decode_ms"), float)
+                except (TypeError, ValueError):
+                    logger.debug(f"Ignoring malformed frame_ack: {data!r}")
+                    continue
+                if connection.subscriber and frame_id is not None:
+                    connection.subscriber.latency.on_ack(frame_id, decode_ms)
+
+            elif data.get("type") == "viewport":
+                # 클라이언트 표시 영역 크기 (기기 픽셀) → 해상도 단계 선택
+                try:
+                    width = _optional_number(data.get("width"), int)
+                    height = _optional_number(data.get("height"), int)
+                except (TypeError, ValueError):
+                    logger.debug(f"Ignoring malformed viewport: {data!r}")
+                    continue
+                if connection.subscriber and width and height:
+                    connection.subscriber.adaptive.set_viewport(
+                        width, height, screen.screen_width, screen.screen_height
+                    )
+
             elif data.get("type") == "goal_automation":
                 # 목표 기반 자동화
                 try:
@@ -192,7 +428,7 @@ async def websocket_endpoint(websocket: WebSocket):
                         max_steps = data.get("max_steps", 50)
 
                         if not goal:
-                            await websocket.send_json({
+                            await connection.send_json({
                                 "type": "error",
                                 "message": "Goal is required",
                                 "code": "MISSING_GOAL"
@@ -200,7 +436,7 @@ async def websocket_endpoint(websocket: WebSocket):
                             continue
 
                         if not ui_tars_client.is_available():
-                            await websocket.send_json({
+                            await connection.send_json({
                                 "type": "error",
                                 "message": "OpenAI API key not configured",
                                 "code": "API_NOT_CONFIGURED"
@@ -210,12 +446,22 @@ async def websocket_endpoint(websocket: WebSocket):
                         await goal_runner.start(
                             goal=goal,
                             max_steps=max_steps,
-                            websocket=websocket
+                            websocket=connection,
+                            screen_controller=screen,
+                            action_handler=actions
                         )
 
                     elif action == "stop":
+                        # 시청자가 여럿이므로 시작한 연결만 중지할 수 있음
+                        if goal_runner.is_running and not goal_runner.is_owned_by(connection):
+                            await connection.send_json({
+                                "type": "error",
+                                "message": "Goal automation was started by another client",
+                                "code": "AUTOMATION_NOT_OWNER"
+                            })
+                            continue
                         goal_runner.stop()
-                        await websocket.send_json({
+                        await connection.send_json({
                             "type": "status",
                             "status": "stopping",
                             "message": "Goal automation stop requested"
@@ -223,17 +469,17 @@ async def websocket_endpoint(websocket: WebSocket):
 
                     elif action == "status":
                         status = goal_runner.get_status()
-                        await websocket.send_json(status.model_dump())
+                        await connection.send_json(status.model_dump())
 
                 except RuntimeError as e:
-                    await websocket.send_json({
+                    await connection.send_json({
                         "type": "error",
                         "message": str(e),
                         "code": "AUTOMATION_ERROR"
                     })
                 except Exception as e:
                     logger.error(f"Goal automation error: {e}", exc_info=True)
-                    await websocket.send_json({
+                    await connection.send_json({
                         "type": "error",
                         "message": str(e),
                         "code": "AUTOMATION_ERROR"
@@ -244,10 +490,10 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
     finally:
-        # Stop goal automation if running
-        if goal_runner.is_running:
+        # 이 연결이 시작한 목표 자동화만 중지 (다른 시청자가 시작한 자동화는 계속)
+        if goal_runner.is_owned_by(connection):
             goal_runner.stop()
-        screen_controller.stop_streaming()
+        # 이 클라이언트의 구독만 해제 (다른 시청자의 스트림은 유지)
         streaming_task.cancel()
         try:
             await streaming_task
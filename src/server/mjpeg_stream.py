@@ -0,0 +1,236 @@
+"""
+Web Player - MJPEG 스트림 수신
+multipart/x-mixed-replace JPEG 스트림(Appium MJPEG 서버)을 디코딩하지 않고 최신 프레임 슬롯에 게시한다.
+"""
+import http.client
+import logging
+import socket
+import struct
+import threading
+import time
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 5.0
+RECONNECT_DELAY = 1.0
+# 프레임을 요청하는 쪽이 없으면 연결을 끊기까지의 시간 (기기 쪽 인코딩도 멈춤)
+IDLE_DISCONNECT = 30.0
+# 헤더 없이 경계까지 읽을 때의 프레임 최대 크기
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+def jpeg_size(data: bytes) -> Tuple[int, int]:
+    """
+    JPEG 헤더(SOF)에서 (너비, 높이) 읽기 (디코딩하지 않음)
+
+    Raises:
+        ValueError: JPEG이 아니거나 SOF가 없는 경우
+    """
+    if data[:2] != b"\xff\xd8":
+        raise ValueError("not a JPEG")
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("corrupt JPEG marker")
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # 채움 바이트
+            pos += 1
+            continue
+        length = struct.unpack_from(">H", data, pos + 2)[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack_from(">HH", data, pos + 5)
+            return width, height
+        pos += 2 + length
+    raise ValueError("JPEG without SOF")
+
+
+class MjpegReader:
+    """
+    MJPEG 수신 스레드
+
+    스트림을 계속 읽어 가장 최근 JPEG만 슬롯에 두므로 소비가 느려도 지연이 쌓이지 않는다.
+    연결이 끊기면 RECONNECT_DELAY 간격으로 다시 연결하고, IDLE_DISCONNECT 동안 프레임을
+    기다리는 쪽이 없으면 연결을 끊었다가 다음 요청 때 다시 연결한다.
+    """
+
+    def __init__(self, url: str, read_timeout: float = CONNECT_TIMEOUT):
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.read_timeout = read_timeout
+
+        self._cond = threading.Condition()
+        self._latest: Optional[bytes] = None
+        self._seq = 0
+        self._last_request = 0.0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._after_boundary = False  # 길이 없는 파트를 읽다가 다음 경계 줄까지 읽음
+        self.connected = False
+
+        # 통계
+        self.frames_received = 0
+        self.connects = 0
+        self.errors = 0
+
+    def start(self):
+        """수신 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._last_request = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="mjpeg-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """수신 스레드 종료 (읽기 중인 소켓을 닫아 깨움)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._disconnect()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def latest(self) -> Optional[Tuple[int, bytes]]:
+        """(순번, JPEG) 최신 프레임"""
+        with self._cond:
+            return (self._seq, self._latest) if self._latest is not None else None
+
+    def wait_for_frame(self, after_seq: int, timeout: float) -> Optional[Tuple[int, bytes]]:
+        """
+        after_seq 이후에 받은 프레임을 기다림 (블로킹)
+
+        Returns:
+            (순번, JPEG) 또는 None (타임아웃)
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._last_request = time.monotonic()
+            self._cond.notify_all()
+            while self._latest is None or self._seq <= after_seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._cond.wait(remaining)
+            return self._seq, self._latest
+
+    def get_stats(self) -> dict:
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "frames": self.frames_received,
+            "connects": self.connects,
+            "errors": self.errors,
+        }
+
+    def _run(self):
+        """수신 루프 (전용 스레드)"""
+        while True:
+            with self._cond:
+                # 요청이 없으면 다음 요청까지 연결하지 않음
+                while self._running and time.monotonic() - self._last_request > IDLE_DISCONNECT:
+                    self._cond.wait()
+                if not self._running:
+                    return
+            try:
+                self._stream()
+            except socket.timeout:
+                # 화면이 그대로면 프레임을 보내지 않는 서버도 있음: 조용히 다시 연결
+                logger.debug(f"MJPEG stream idle ({self.url}), reconnecting")
+            except Exception as e:
+                if self._running:
+                    self.errors += 1
+                    logger.warning(f"MJPEG stream error ({self.url}): {e}")
+            finally:
+                self._disconnect()
+            with self._cond:
+                if self._running:
+                    self._cond.wait(RECONNECT_DELAY)
+
+    def _stream(self):
+        """연결 후 끊기거나 유휴 상태가 될 때까지 프레임 수신"""
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.read_timeout)
+        self._connection = connection
+        connection.request("GET", self.path)
+        response = connection.getresponse()
+        content_type = response.getheader("Content-Type", "")
+        if response.status != 200 or not content_type.startswith("multipart/"):
+            raise ConnectionError(f"not an MJPEG stream (HTTP {response.status}, {content_type or 'no content type'})")
+        self.connected = True
+        self._after_boundary = False
+        self.connects += 1
+        logger.info(f"MJPEG stream connected: {self.url}")
+
+        while self._running and time.monotonic() - self._last_request <= IDLE_DISCONNECT:
+            jpeg = self._read_part(response)
+            if jpeg is None:
+                raise ConnectionError("MJPEG stream closed")
+            if jpeg[:2] != b"\xff\xd8":
+                continue
+            with self._cond:
+                self._seq += 1
+                self._latest = jpeg
+                self.frames_received += 1
+                self._cond.notify_all()
+
+    def _read_part(self, response: http.client.HTTPResponse) -> Optional[bytes]:
+        """
+        다음 파트 본문 (경계 줄 → 헤더 → 본문)
+
+        Content-Length가 있으면 그만큼 읽고, 없으면 다음 경계 줄 앞까지 읽는다.
+        """
+        if not self._after_boundary:
+            line = response.readline()
+            while line and not line.startswith(b"--"):
+                line = response.readline()
+            if not line:
+                return None
+        self._after_boundary = False
+
+        length = None
+        while True:
+            line = response.readline()
+            if not line:
+                return None
+            if not line.strip():
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+
+        if length is not None:
+            data = response.read(length)
+            return data if len(data) == length else None
+
+        # 길이 없이 보내는 서버: 다음 경계 줄을 만나면 그 앞까지가 본문
+        body = bytearray()
+        while len(body) < MAX_FRAME_BYTES:
+            line = response.readline()
+            if not line:
+                return None
+            if line.startswith(b"--") and body.endswith(b"\r\n"):
+                # 다음 파트의 경계 줄까지 읽었으므로 다음 호출은 헤더부터
+                self._after_boundary = True
+                return bytes(body[:-2])
+            body += line
+        raise ValueError("MJPEG frame too large")
+
+    def _disconnect(self):
+        connection, self._connection = self._connection, None
+        self.connected = False
+        if connection is not None:
+            try:
+                if connection.sock is not None:
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
@@ -2,7 +2,13 @@
 Web Player - Pydantic 데이터 모델
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import List, Optional, Literal
+
+# action_batch 한 번에 보낼 수 있는 최대 액션 수
+MAX_BATCH_ACTIONS = 100
+
+# 스크롤 한 번의 최대 단계 수
+MAX_SCROLL_AMOUNT = 100
 
 
 class ActionRequest(BaseModel):
@@ -18,6 +24,7 @@ class ActionRequest(BaseModel):
     text: Optional[str] = None
     key: Optional[str] = None
     direction: Optional[str] = None
+    amount: Optional[int] = Field(None, ge=0, le=MAX_SCROLL_AMOUNT, description="스크롤 단계 수 (기본값: 1)")
 
 
 class ActionResponse(BaseModel):
@@ -27,6 +34,42 @@ class ActionResponse(BaseModel):
     code: Optional[str] = None
 
 
+class ActionBatchStep(ActionRequest):
+    """매크로의 한 단계 (type 생략 가능)"""
+    delay_ms: int = Field(0, ge=0, le=10000, description="다음 단계 전 대기 (ms)")
+
+
+class ActionBatchRequest(BaseModel):
+    """여러 액션을 순서대로 실행하는 매크로 요청"""
+    type: Literal["action_batch"] = "action_batch"
+    id: Optional[str] = Field(None, description="응답에 그대로 돌려주는 요청 ID")
+    actions: List[ActionBatchStep] = Field(..., min_length=1, max_length=MAX_BATCH_ACTIONS)
+    stop_on_error: bool = Field(True, description="실패한 단계 이후 나머지를 건너뜀")
+
+
+class ActionStepResult(BaseModel):
+    """매크로 단계별 결과"""
+    index: int
+    action_type: str
+    status: Literal["success", "error", "skipped"]
+    code: Optional[str] = None
+    message: Optional[str] = None
+
+
+class ActionBatchResponse(BaseModel):
+    """매크로 실행 결과 (모든 단계를 한 번에 응답)"""
+    type: Literal["action_batch_result"] = "action_batch_result"
+    id: Optional[str] = None
+    status: Literal["success", "partial", "error"]
+    executed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration_ms: float = 0.0
+    code: Optional[str] = None
+    message: Optional[str] = None
+    results: List[ActionStepResult] = []
+
+
 class ScreenFrame(BaseModel):
     """화면 프레임 데이터"""
     type: Literal["screen"] = "screen"
@@ -34,6 +77,15 @@ class ScreenFrame(BaseModel):
     width: int
     height: int
     timestamp: float
+    format: str = Field("jpeg", description="이미지 형식 (jpeg, png, webp)")
+    frame_id: int = Field(0, description="캡처 프레임 번호 (frame_ack에 사용)")
+
+
+class Heartbeat(BaseModel):
+    """화면 변화가 없을 때 보내는 생존 신호 (JSON 전송)"""
+    type: Literal["heartbeat"] = "heartbeat"
+    frame_id: int
+    timestamp: float
 
 
 class StatusMessage(BaseModel):
@@ -0,0 +1,96 @@
+"""
+Web Player - 모니터 목록 및 모니터별 화면 파이프라인
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import mss
+
+from .action_handler import ActionHandler
+from .config import settings
+from .screen_controller import ScreenController
+
+logger = logging.getLogger(__name__)
+
+
+def list_monitors() -> List[dict]:
+    """
+    연결된 모니터 목록
+
+    index 0은 모든 모니터를 합친 가상 데스크톱, 1부터 개별 모니터(1이 주 모니터).
+    좌표는 전역 화면 좌표 (주 모니터 좌상단이 0,0, 다른 모니터는 음수일 수 있음).
+    """
+    with mss.mss() as sct:
+        return [
+            {
+                "index": index,
+                "left": monitor["left"],
+                "top": monitor["top"],
+                "width": monitor["width"],
+                "height": monitor["height"],
+                "primary": index == 1,
+                "virtual": index == 0,
+            }
+            for index, monitor in enumerate(sct.monitors)
+        ]
+
+
+class MonitorRegistry:
+    """
+    모니터별 화면 파이프라인 관리
+
+    모니터마다 독립된 ScreenController(캡처 스레드, 브로드캐스터, 인코더)와
+    그 모니터의 원점으로 좌표를 변환하는 ActionHandler를 가진다.
+    파이프라인은 처음 요청될 때 만들고, 캡처 스레드는 시청자가 있을 때만 캡처한다.
+    """
+
+    def __init__(self, default_screen: ScreenController, default_actions: ActionHandler):
+        """
+        Args:
+            default_screen: 모니터 미지정 시 사용하는 기본 파이프라인 (REGION_* 적용)
+            default_actions: 기본 파이프라인의 액션 핸들러
+        """
+        self.default = (default_screen, default_actions)
+        self._pipelines: Dict[int, Tuple[ScreenController, ActionHandler]] = {}
+
+    def get(self, index: Optional[int] = None) -> Tuple[ScreenController, ActionHandler]:
+        """
+        모니터의 (ScreenController, ActionHandler)
+
+        Args:
+            index: mss 모니터 인덱스 (None이면 기본 파이프라인, 0이면 가상 데스크톱)
+
+        Raises:
+            ValueError: 존재하지 않는 모니터
+        """
+        if index is None:
+            return self.default
+        if settings.control_mode == "appium":
+            raise ValueError("Monitor selection is not available in appium mode")
+        if index in self._pipelines:
+            return self._pipelines[index]
+
+        monitors = list_monitors()
+        if not 0 <= index < len(monitors):
+            raise ValueError(f"Monitor {index} not found (0-{len(monitors) - 1})")
+
+        monitor = monitors[index]
+        screen = ScreenController(monitor=monitor)
+        actions = ActionHandler(
+            screen_width=screen.screen_width,
+            screen_height=screen.screen_height,
+            offset_x=screen.offset_x,
+            offset_y=screen.offset_y,
+            worker=self.default[1].worker,
+            backend=self.default[1].backend
+        )
+        actions.on_action = screen.record_action
+        self._pipelines[index] = (screen, actions)
+        logger.info(f"Monitor pipeline created: {index} {monitor}")
+        return screen, actions
+
+    def shutdown(self):
+        """모든 모니터 파이프라인 종료"""
+        for screen, _ in self._pipelines.values():
+            screen.shutdown()
+        self._pipelines.clear()
@@ -0,0 +1,198 @@
+"""
+Web Player - 병렬 이미지 인코더
+큰 프레임을 가로 띠로 나눠 워커 스레드 풀에서 동시에 인코딩한다.
+"""
+import logging
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from .encoders import ImageEncoder, create_encoder
+from .frame_protocol import CODEC_JPEG
+from .frame_scaler import FrameSurface
+
+logger = logging.getLogger(__name__)
+
+# 띠 높이를 맞추는 단위 (4:2:0 JPEG의 MCU 높이, 4:4:4의 8도 나눔)
+BAND_ALIGN = 16
+
+# 변경 타일을 풀에 나눠 인코딩할 최소 총 픽셀 수 (작은 타일 몇 개는 호출 스레드에서)
+MIN_PARALLEL_TILE_PIXELS = 128 * 1024
+
+# JPEG 마커
+SOF_MARKERS = (0xC0, 0xC1)  # baseline / extended sequential (허프만)
+MARKER_SOS = 0xDA
+MARKER_DRI = 0xDD
+MARKER_RST0 = 0xD0
+MAX_RESTART_INTERVAL = 0xFFFF
+
+
+def _split_jpeg(data: bytes) -> Tuple[bytes, int, bytes, memoryview]:
+    """
+    JPEG을 (SOS 이전 헤더, 헤더 안 SOF 위치, SOS 세그먼트, 엔트로피 데이터)로 분리
+
+    Raises:
+        ValueError: 이어 붙일 수 없는 JPEG (프로그레시브, 재시작 마커 사용 등)
+    """
+    if data[:2] != b"\xff\xd8" or data[-2:] != b"\xff\xd9":
+        raise ValueError("not a complete JPEG")
+    pos = 2
+    sof = -1
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("corrupt JPEG marker")
+        marker = data[pos + 1]
+        length = struct.unpack_from(">H", data, pos + 2)[0]
+        if marker in SOF_MARKERS:
+            sof = pos
+        elif 0xC2 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            raise ValueError(f"unsupported JPEG frame type 0x{marker:02X}")
+        elif marker == MARKER_DRI:
+            raise ValueError("JPEG already uses restart markers")
+        elif marker == MARKER_SOS:
+            if sof < 0:
+                raise ValueError("JPEG without SOF")
+            end = pos + 2 + length
+            return data[:pos], sof, data[pos:end], memoryview(data)[end:-2]
+        pos += 2 + length
+    raise ValueError("JPEG without SOS")
+
+
+def _mcu_size(header: bytes, sof: int) -> Tuple[int, int]:
+    """SOF 샘플링 계수로 MCU (너비, 높이) 계산"""
+    components = header[sof + 9]
+    factors = header[sof + 11:sof + 11 + components * 3:3]
+    return max(f >> 4 for f in factors) * 8, max(f & 0x0F for f in factors) * 8
+
+
+def stitch_jpeg_bands(bands: Sequence[bytes], width: int, height: int, band_height: int) -> bytes:
+    """
+    같은 설정으로 인코딩한 가로 띠 JPEG들을 재시작 마커로 이어 JPEG 하나로 만듦
+
+    띠마다 DC 예측이 0에서 시작하고 바이트 경계로 끝나므로, 띠 경계에 RSTn을 넣고
+    재시작 간격(DRI)을 띠 하나의 MCU 수로 두면 그대로 유효한 엔트로피 데이터가 된다.
+    헤더(양자화/허프만 테이블)는 SOF의 높이를 빼고 모든 띠가 같아야 한다.
+
+    Args:
+        bands: 위에서부터 순서대로 인코딩한 띠 (마지막 띠만 band_height보다 낮을 수 있음)
+        width, height: 전체 이미지 크기
+        band_height: 띠 높이 (MCU 높이의 배수)
+
+    Raises:
+        ValueError: 테이블이 다르거나 띠 높이가 MCU 경계와 맞지 않는 경우
+    """
+    header, sof, sos, first = _split_jpeg(bands[0])
+    mcu_width, mcu_height = _mcu_size(header, sof)
+    if band_height % mcu_height:
+        raise ValueError(f"band height {band_height} is not a multiple of MCU height {mcu_height}")
+    interval = (band_height // mcu_height) * -(-width // mcu_width)
+    if interval > MAX_RESTART_INTERVAL:
+        raise ValueError(f"restart interval {interval} too large")
+
+    # 높이 필드(SOF + 5)를 지우고 비교
+    def masked(head: bytes, offset: int) -> bytes:
+        return head[:offset + 5] + head[offset + 7:]
+
+    reference = masked(header, sof)
+    parts = [bytearray(header), struct.pack(">BBHH", 0xFF, MARKER_DRI, 4, interval), sos]
+    struct.pack_into(">H", parts[0], sof + 5, height)
+    parts.append(first)
+    for index, band in enumerate(bands[1:]):
+        band_header, band_sof, band_sos, entropy = _split_jpeg(band)
+        if masked(band_header, band_sof) != reference or band_sos != sos:
+            raise ValueError("JPEG bands use different tables")
+        parts.append(bytes((0xFF, MARKER_RST0 + index % 8)))
+        parts.append(entropy)
+    parts.append(b"\xff\xd9")
+    return b"".join(parts)
+
+
+class ParallelEncoder(ImageEncoder):
+    """
+    워커 풀 이미지 인코더 (스레드 안전)
+
+    기본 인코더(SCREEN_FORMAT)의 인스턴스를 스레드마다 따로 둔다 (재사용 버퍼가 스레드 전용).
+    min_pixels 이상인 JPEG 프레임은 BAND_ALIGN 경계의 가로 띠로 나눠 병렬 인코딩하고
+    stitch_jpeg_bands()로 이어 붙인다. 결과는 표준 JPEG 하나이고 픽셀은 한 번에 인코딩한 것과 같다.
+    JPEG가 아닌 형식은 띠로 나눌 수 없어 한 번에 인코딩한다.
+    encode_many()는 변경 타일 여러 개를 풀에 나눠 인코딩한다.
+    """
+
+    def __init__(self, name: str, workers: int = 1, min_pixels: int = 1000000):
+        super().__init__()
+        probe = create_encoder(name)
+        self._cls = type(probe)
+        self._local = threading.local()
+        self._local.encoder = probe
+        self.name = probe.name
+        self.codec = probe.codec
+        self.mime = probe.mime
+
+        self.workers = max(1, workers)
+        self.min_pixels = min_pixels
+        self._banding = self.codec == CODEC_JPEG
+        self._pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="encode")
+            if self.workers > 1 else None
+        )
+
+        # 통계
+        self.parallel_frames = 0
+        self.bands_encoded = 0
+        self.parallel_tile_batches = 0
+
+    def encode(self, surface: FrameSurface, quality: int) -> bytes:
+        if self._pool is None or not self._banding or surface.width * surface.height < self.min_pixels:
+            return self._encoder().encode(surface, quality)
+
+        band_height = -(-surface.height // self.workers)
+        band_height = -(-band_height // BAND_ALIGN) * BAND_ALIGN
+        if band_height >= surface.height:
+            return self._encoder().encode(surface, quality)
+
+        bands = [
+            surface.crop(0, y, surface.width, min(band_height, surface.height - y))
+            for y in range(0, surface.height, band_height)
+        ]
+        parts = list(self._pool.map(lambda band: self._encoder().encode(band, quality), bands))
+        try:
+            data = stitch_jpeg_bands(parts, surface.width, surface.height, band_height)
+        except ValueError as e:
+            # 이 인코더 출력은 이어 붙일 수 없음: 이후로는 한 번에 인코딩
+            logger.warning(f"Band encoding disabled for {self.name}: {e}")
+            self._banding = False
+            return self._encoder().encode(surface, quality)
+
+        self.parallel_frames += 1
+        self.bands_encoded += len(bands)
+        return data
+
+    def encode_many(self, surfaces: Sequence[FrameSurface], quality: int) -> List[bytes]:
+        pixels = sum(s.width * s.height for s in surfaces)
+        if self._pool is None or len(surfaces) < 2 or pixels < MIN_PARALLEL_TILE_PIXELS:
+            return super().encode_many(surfaces, quality)
+        self.parallel_tile_batches += 1
+        return list(self._pool.map(lambda s: self._encoder().encode(s, quality), surfaces))
+
+    def close(self):
+        """워커 풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def get_stats(self) -> dict:
+        """병렬 인코딩 통계"""
+        return {
+            "encoder": self.name,
+            "workers": self.workers,
+            "parallel_frames": self.parallel_frames,
+            "bands": self.bands_encoded,
+            "parallel_tile_batches": self.parallel_tile_batches,
+        }
+
+    def _encoder(self) -> ImageEncoder:
+        """현재 스레드 전용 기본 인코더"""
+        encoder = getattr(self._local, "encoder", None)
+        if encoder is None:
+            encoder = self._local.encoder = self._cls()
+        return encoder
@@ -0,0 +1,439 @@
+"""
+Web Player - 세션 녹화 및 재생
+프레임(뷰어 바이너리 프로토콜 그대로)과 액션을 세그먼트 파일에 이어 쓰고,
+키프레임 시간 색인으로 임의 시점을 찾아 재생한다.
+
+디렉터리 구조 (RECORDING_DIR/<session>/):
+    seg-000001.dat  레코드 연속: kind(uint8) + timestamp(float64) + length(uint32) + payload
+    seg-000001.idx  키프레임 색인 연속: timestamp(float64) + .dat 오프셋(uint64)
+
+각 세그먼트는 키프레임으로 시작하므로 세그먼트 시작 시각 → 세그먼트 내 키프레임 순으로
+이분 탐색하면 O(log n)에 재생 시작 위치를 찾는다. 읽기는 mmap으로 한다.
+"""
+import asyncio
+import bisect
+import itertools
+import json
+import logging
+import math
+import mmap
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from fastapi import WebSocket
+
+from .capture_worker import RawFrame
+from .encoders import create_encoder
+from .frame_protocol import EncodedFrame, pack_frame
+from .frame_scaler import FrameSurface, make_surface
+from .tile_encoder import TileDeltaEncoder
+
+logger = logging.getLogger(__name__)
+
+RECORD = struct.Struct("<BdI")
+INDEX_ENTRY = struct.Struct("<dQ")
+
+# 레코드 종류
+RECORD_FRAME = 1  # 바이너리 프레임 메시지 (frame_protocol)
+RECORD_ACTION = 2  # ActionRequest JSON
+
+# 기록 대기 프레임 수 한도 (넘치면 프레임을 버림, 캡처/송신 경로는 절대 막지 않음)
+MAX_QUEUE = 64
+
+
+class SessionRecorder:
+    """
+    세션 녹화기 (전용 기록 스레드)
+
+    생산자는 캡처된 RawFrame 참조와 액션을 대기열에 넣기만 한다(복사/인코딩 없음).
+    인코딩(자체 타일 델타 인코더, 키프레임 + 변경 타일)과 파일 쓰기는 기록 스레드에서 하므로
+    녹화를 켜도 캡처 → 시청자 경로의 지연은 늘지 않는다. 대기열이 가득 차면 프레임을 버린다
+    (타일 인코더는 마지막으로 기록한 화면과 비교하므로 다음 기록 프레임이 차이를 메운다).
+    인스턴스 하나가 세션 하나를 기록한다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        fps: int,
+        quality: int,
+        segment_bytes: int,
+        tile_size: int = 64,
+        keyframe_interval: float = 10.0,
+        encoder_name: str = "JPEG"
+    ):
+        """
+        Args:
+            directory: 녹화 루트 디렉터리 (세션마다 하위 디렉터리 생성)
+            name: 세션 이름 접미사 (디렉터리는 <시각(ms)>-<name>, 이미 있으면 -2, -3...을 붙임)
+            fps: 기록 FPS (스트림 FPS와 별개, 그 이상 들어오는 프레임은 건너뜀)
+            quality: 기록 인코딩 품질
+            segment_bytes: 세그먼트 파일 최대 크기 (넘으면 새 세그먼트, 키프레임부터 시작)
+            tile_size, keyframe_interval: 타일 델타 설정 (키프레임 간격 = 탐색 단위)
+            encoder_name: 이미지 인코더 (SCREEN_FORMAT)
+        """
+        self.directory = Path(directory)
+        self.interval = 1.0 / max(1, fps)
+        self.quality = quality
+        self.segment_bytes = segment_bytes
+        self._tiles = TileDeltaEncoder(
+            tile_size=tile_size,
+            keyframe_interval=keyframe_interval,
+            encoder=create_encoder(encoder_name)
+        )
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._last_submit = 0.0
+        now = time.time()
+        self.session = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}-{name}"
+
+        # 기록 스레드 전용 상태
+        self._segment = 0
+        self._dat = None
+        self._idx = None
+
+        # 통계
+        self.frames_recorded = 0
+        self.actions_recorded = 0
+        self.frames_dropped = 0
+        self.bytes_written = 0
+
+    @property
+    def is_recording(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """
+        기록 스레드 시작
+
+        같은 시각에 시작한 세션(시청자 재접속 직후 이전 기록 스레드가 아직 쓰는 중 등)과
+        파일을 섞어 쓰지 않도록 세션 디렉터리는 새로 만들 수 있을 때까지 이름을 바꾼다.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.session
+        for attempt in itertools.count(2):
+            try:
+                (self.directory / self.session).mkdir()
+                break
+            except FileExistsError:
+                self.session = f"{base}-{attempt}"
+        self._thread = threading.Thread(target=self._run, name="session-recorder", daemon=True)
+        self._thread.start()
+        logger.info(f"Session recording started: {self.directory / self.session}")
+
+    def stop(self, wait: bool = True):
+        """
+        녹화 종료 (기록 스레드가 대기 중인 레코드를 모두 쓴 뒤 파일을 닫음)
+
+        Args:
+            wait: 기록 스레드가 끝날 때까지 기다릴지 (이벤트 루프에서는 False)
+        """
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        if wait:
+            thread.join()
+
+    def submit_frame(self, raw: RawFrame):
+        """캡처 프레임 기록 요청 (생산자 쪽, 블로킹 없음, RECORDING_FPS 간격으로만 받음)"""
+        if self._thread is None or raw.captured_at - self._last_submit < self.interval * 0.9:
+            return
+        self._last_submit = raw.captured_at
+        if self._queue.qsize() >= MAX_QUEUE:
+            self.frames_dropped += 1
+            return
+        self._queue.put_nowait((RECORD_FRAME, raw))
+
+    def record_action(self, action: dict):
+        """실행한 액션 기록 요청 (블로킹 없음)"""
+        if self._thread is None:
+            return
+        # 액션은 작고 드물어 프레임 대기열 한도와 무관하게 항상 기록
+        self._queue.put_nowait((RECORD_ACTION, (time.time(), action)))
+
+    def _run(self):
+        """기록 스레드: 대기열 → 인코딩 → 세그먼트 파일"""
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                kind, payload = item
+                if kind == RECORD_FRAME:
+                    self._write_frame(payload)
+                else:
+                    timestamp, action = payload
+                    self._write(RECORD_ACTION, timestamp, json.dumps(action).encode("utf-8"))
+                    self.actions_recorded += 1
+                # 재생 중인 세션도 볼 수 있도록 대기열이 비면 디스크로 내보냄
+                if self._queue.empty() and self._dat:
+                    self._dat.flush()
+                    self._idx.flush()
+        except Exception as e:
+            logger.error(f"Session recorder error: {e}", exc_info=True)
+        finally:
+            self._close_segment()
+            logger.info(f"Session recording stopped: {self.session} {self.get_stats()}")
+
+    def _write_frame(self, raw: RawFrame):
+        """타일 델타로 인코딩해 기록 (변경 없으면 건너뜀)"""
+        if self._dat is None or self._dat.tell() >= self.segment_bytes:
+            self._open_segment()
+
+        surface = make_surface(raw)
+        tiles = self._tiles
+        frame = None
+        if not tiles.needs_keyframe(surface):
+            frame = tiles.encode_delta(raw, surface, self.quality)
+            if frame is None and not tiles.needs_keyframe(surface):
+                return
+        if frame is None:
+            frame = self._encode_keyframe(raw, surface)
+            if frame is None:
+                return
+            tiles.mark_keyframe(surface)
+            self._idx.write(INDEX_ENTRY.pack(raw.timestamp, self._dat.tell()))
+
+        self._write(RECORD_FRAME, raw.timestamp, pack_frame(frame))
+        self.frames_recorded += 1
+
+    def _encode_keyframe(self, raw: RawFrame, surface: FrameSurface) -> Optional[EncodedFrame]:
+        """전체 프레임 인코딩 (실패 시 None)"""
+        try:
+            return EncodedFrame(
+                frame_id=raw.frame_id,
+                timestamp=raw.timestamp,
+                width=raw.width,
+                height=raw.height,
+                codec=self._tiles.encoder.codec,
+                data=self._tiles.encoder.encode(surface, self.quality)
+            )
+        except Exception as e:
+            logger.error(f"Recorder keyframe encode error: {e}")
+            return None
+
+    def _write(self, kind: int, timestamp: float, payload: bytes):
+        if self._dat is None:
+            self._open_segment()
+        self._dat.write(RECORD.pack(kind, timestamp, len(payload)))
+        self._dat.write(payload)
+        self.bytes_written += RECORD.size + len(payload)
+
+    def _open_segment(self):
+        """다음 세그먼트 파일을 열고, 첫 프레임이 키프레임이 되도록 요청"""
+        self._close_segment()
+        self._segment += 1
+        base = self.directory / self.session / f"seg-{self._segment:06d}"
+        # 세션 디렉터리는 이 기록기 전용이므로 이미 있는 파일이면 이어 쓰지 않고 실패
+        self._dat = open(f"{base}.dat", "xb")
+        self._idx = open(f"{base}.idx", "xb")
+        self._tiles.request_keyframe()
+
+    def _close_segment(self):
+        for f in (self._dat, self._idx):
+            if f:
+                f.close()
+        self._dat = self._idx = None
+
+    def get_stats(self) -> dict:
+        """녹화 통계"""
+        return {
+            "session": self.session,
+            "recording": self.is_recording,
+            "frames_recorded": self.frames_recorded,
+            "actions_recorded": self.actions_recorded,
+            "frames_dropped": self.frames_dropped,
+            "bytes_written": self.bytes_written,
+            "queue": self._queue.qsize(),
+        }
+
+
+class _Segment:
+    """mmap으로 연 세그먼트 하나 (.dat 레코드 + .idx 키프레임 색인)"""
+
+    def __init__(self, base: Path):
+        self.name = base.name
+        self._files = []
+        self.data: Optional[mmap.mmap] = None
+        try:
+            self.data = self._map(f"{base}.dat")
+            index = self._map(f"{base}.idx")
+        except OSError:
+            self.close()
+            raise
+        count = len(index) // INDEX_ENTRY.size if index else 0
+        entries = [INDEX_ENTRY.unpack_from(index, i * INDEX_ENTRY.size) for i in range(count)]
+        self.key_times = [timestamp for timestamp, _ in entries]
+        self.key_offsets = [offset for _, offset in entries]
+        if index:
+            index.close()
+
+    def _map(self, path: str) -> Optional[mmap.mmap]:
+        f = open(path, "rb")
+        self._files.append(f)
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None  # 빈 파일
+
+    @property
+    def start(self) -> float:
+        return self.key_times[0] if self.key_times else 0.0
+
+    def records(self, offset: int) -> Iterator[Tuple[int, float, bytes]]:
+        """offset부터 (kind, timestamp, payload) 순회 (기록 중 잘린 마지막 레코드는 무시)"""
+        data = self.data
+        size = len(data) if data else 0
+        while offset + RECORD.size <= size:
+            kind, timestamp, length = RECORD.unpack_from(data, offset)
+            start = offset + RECORD.size
+            if start + length > size:
+                break
+            yield kind, timestamp, data[start:start + length]
+            offset = start + length
+
+    def close(self):
+        if self.data:
+            self.data.close()
+        for f in self._files:
+            f.close()
+
+
+class Recording:
+    """
+    녹화된 세션 하나 (재생용, 읽기 전용)
+
+    열 때의 파일 크기까지만 매핑하므로 기록 중인 세션은 그 시점까지 재생된다.
+    """
+
+    def __init__(self, directory: str, session: str):
+        path = Path(directory) / session
+        if not session or "/" in session or ".." in session or not path.is_dir():
+            raise ValueError(f"Recording {session} not found")
+        self.session = session
+        self._segments: List[_Segment] = []
+        for base in sorted(path.glob("seg-*.dat")):
+            try:
+                segment = _Segment(base.with_suffix(""))
+            except OSError as e:
+                # 색인이 없는 세그먼트 (기록 중 중단 등)
+                logger.warning(f"Skipping unreadable recording segment {base}: {e}")
+                continue
+            if segment.key_times:
+                self._segments.append(segment)
+            else:
+                segment.close()
+        self._starts = [segment.start for segment in self._segments]
+
+    @property
+    def start(self) -> float:
+        return self._starts[0] if self._starts else 0.0
+
+    @property
+    def end(self) -> float:
+        """마지막 키프레임 시각 (이후 델타까지 포함하려면 레코드를 끝까지 읽어야 하므로 근사)"""
+        return self._segments[-1].key_times[-1] if self._segments else 0.0
+
+    def time_at(self, offset: float) -> float:
+        """
+        세션 시작 후 offset초의 기록 시각 (재생 시작 위치)
+
+        Raises:
+            ValueError: 키프레임이 없는 세션이거나 offset이 0 이상의 유한한 수가 아닌 경우
+        """
+        if not self._segments:
+            raise ValueError(f"Recording {self.session} is empty")
+        if not math.isfinite(offset) or offset < 0:
+            raise ValueError(f"Invalid replay time: {offset}")
+        return self.start + offset
+
+    def seek(self, timestamp: float) -> Tuple[int, int]:
+        """
+        timestamp 이전의 가장 가까운 키프레임 위치 (이분 탐색 두 번, O(log n))
+
+        Returns:
+            (세그먼트 번호, .dat 오프셋)
+        """
+        if not self._segments:
+            raise ValueError(f"Recording {self.session} is empty")
+        seg = max(0, bisect.bisect_right(self._starts, timestamp) - 1)
+        segment = self._segments[seg]
+        key = max(0, bisect.bisect_right(segment.key_times, timestamp) - 1)
+        return seg, segment.key_offsets[key]
+
+    def records(self, timestamp: float) -> Iterator[Tuple[int, float, bytes]]:
+        """timestamp 직전 키프레임부터 끝까지 (kind, timestamp, payload) 순회"""
+        seg, offset = self.seek(timestamp)
+        for i in range(seg, len(self._segments)):
+            yield from self._segments[i].records(offset if i == seg else 0)
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def __enter__(self) -> "Recording":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def list_recordings(directory: str) -> List[dict]:
+    """녹화 세션 목록 (최신순)"""
+    root = Path(directory)
+    if not root.is_dir():
+        return []
+    sessions = []
+    for path in sorted(root.iterdir(), reverse=True):
+        if not path.is_dir():
+            continue
+        with Recording(directory, path.name) as recording:
+            sessions.append({
+                "session": path.name,
+                "start": recording.start,
+                "duration": round(max(0.0, recording.end - recording.start), 1),
+                "bytes": sum(f.stat().st_size for f in path.glob("seg-*")),
+            })
+    return sessions
+
+
+async def stream_recording(websocket: WebSocket, recording: Recording, timestamp: float, speed: float = 1.0):
+    """
+    녹화를 뷰어 프로토콜 그대로 재생 (바이너리 프레임 + recorded_action JSON)
+
+    timestamp 직전 키프레임부터 timestamp까지는 기다리지 않고 보내 화면을 복원하고,
+    그 뒤로는 기록된 간격 / speed에 맞춰 보낸다. 복원 구간의 액션은 보내지 않는다.
+    """
+    clock: Optional[Tuple[float, float]] = None  # (재생 시작 monotonic, 기록 시각)
+    for kind, recorded_at, payload in recording.records(timestamp):
+        if recorded_at >= timestamp:
+            if clock is None:
+                clock = (time.monotonic(), recorded_at)
+            delay = clock[0] + (recorded_at - clock[1]) / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif kind == RECORD_ACTION:
+            continue
+
+        if kind == RECORD_FRAME:
+            await websocket.send_bytes(payload)
+        else:
+            await websocket.send_json({
+                "type": "recorded_action",
+                "timestamp": recorded_at,
+                "action": json.loads(payload),
+            })
+
+    await websocket.send_json({
+        "type": "status",
+        "status": "replay_finished",
+        "message": f"Replay of {recording.session} finished"
+    })
@@ -3,18 +3,28 @@ Web Player - 화면 캡처 및 스트리밍 컨트롤러
 """
 import asyncio
 import base64
+import json
 import logging
+import os
 import time
-from io import BytesIO
-from typing import Optional
-
-import mss
-import pyautogui
-from PIL import Image
-from fastapi import WebSocket
+from typing import Callable, Dict, List, Optional, Tuple
 
+from .adaptive import AdaptiveController, StreamBounds
+from .broadcaster import FrameBroadcaster, StreamMessage, StreamSubscriber
+from .capture_worker import CaptureWorker, RawFrame
 from .config import settings
-from .models import ScreenFrame
+from .connection import ClientConnection
+from .cursor_tracker import CursorTracker
+from .encoders import ImageEncoder
+from .frame_protocol import CODEC_JPEG, CODEC_NAMES, CODEC_NONE, KIND_HEARTBEAT, EncodedFrame, pack_frame
+from .frame_scaler import FrameScaler, FrameSurface, make_surface
+from .input_backends import load_pyautogui
+from .latency import FrameTiming
+from .models import Heartbeat, ScreenFrame
+from .parallel_encoder import ParallelEncoder
+from .recorder import SessionRecorder
+from .tile_encoder import TileDeltaEncoder
+from .video_encoder import VideoEncoderSession, video_available
 
 logger = logging.getLogger(__name__)
 
@@ -25,137 +35,723 @@ class ScreenController:
     def __init__(
         self,
         fps: int = None,
-        quality: int = None
+        quality: int = None,
+        monitor: Optional[dict] = None,
+        capture: Optional[CaptureWorker] = None
     ):
         """
         Args:
-            fps: 초당 프레임 수 (기본값: settings.screen_fps)
-            quality: JPEG 품질 1-100 (기본값: settings.screen_quality)
+            fps: 초당 프레임 수 (기본값: settings.screen_fps, 클라이언트별 FPS 상한)
+            quality: JPEG 품질 1-100 (기본값: settings.screen_quality, 클라이언트별 품질 상한)
+            monitor: 캡처할 모니터 (monitors.list_monitors() 항목).
+                     None이면 주 모니터 (REGION_* 설정 적용)
+            capture: 데스크톱 대신 사용할 캡처 워커 (Appium 기기 화면 등, 영역은 capture.region).
+                     커서 채널은 쓰지 않는다.
         """
         self.fps = fps or settings.screen_fps
         self.quality = quality or settings.screen_quality
-        self.screen_width, self.screen_height = pyautogui.size()
-        self.is_streaming = False
+        self.monitor_index = monitor["index"] if monitor else None
+
+        # 캡처 영역: 스트림/AI/액션 좌표는 모두 이 영역 기준 (offset은 전역 좌표의 영역 원점)
+        if capture is not None:
+            self.region = dict(capture.region)
+        elif monitor:
+            self.region = {key: monitor[key] for key in ("left", "top", "width", "height")}
+        else:
+            self.region = self._resolve_region(*load_pyautogui().size())
+        self.offset_x, self.offset_y = self.region["left"], self.region["top"]
+        self.screen_width, self.screen_height = self.region["width"], self.region["height"]
+        self._capture = capture or CaptureWorker(
+            fps=self.fps,
+            region=self.region if monitor or settings.has_region else None
+        )
+        self.cursor_channel = settings.cursor_channel and capture is None
         self.frame_count = 0
-        self._lock = asyncio.Lock()
+        self.passthrough_frames = 0  # 다시 인코딩하지 않고 보낸 소스 JPEG 프레임 수
+        self._broadcaster = FrameBroadcaster(self._produce)
+        self._connections: List[ClientConnection] = []
+        self._tile_encoders: Dict[Tuple[int, float], TileDeltaEncoder] = {}
+        self._video_encoders: Dict[Tuple[str, int, float], VideoEncoderSession] = {}
+        self._scaler = FrameScaler()  # 축소 배율별 출력 버퍼 재사용
+
+        # 이미지 인코더 (SCREEN_FORMAT), AI 스냅샷은 모델 입력 형식인 JPEG로 인코딩
+        # 인코딩은 워커 스레드에서 하므로 스레드 안전한 ParallelEncoder로 감쌈
+        workers = settings.encode_workers or os.cpu_count() or 1
+        self._encoder = ParallelEncoder(settings.screen_format, workers, settings.encode_parallel_min_pixels)
+        self._snapshot_encoder = (
+            self._encoder if self._encoder.codec == CODEC_JPEG else ParallelEncoder("JPEG")
+        )
+
+        # 유휴 화면 감지 (키프레임 요청 시 한 번은 반드시 팬아웃)
+        self._force_frame = False
+        self.idle_frames = 0
+
+        # 커서 채널 (새 시청자에게 보낼 현재 위치/모양)
+        self._cursor_position: Optional[str] = None
+        self._cursor_shape: Optional[dict] = None
+        self.cursor_messages = 0
+
+        # AI 스냅샷 캐시 ((체크섬, 너비, 높이), 인코딩된 프레임)
+        self._snapshot: Optional[Tuple[Tuple[int, int, int], ScreenFrame]] = None
+        self.snapshot_captures = 0
+        self.snapshot_hits = 0
+
+        # 세션 녹화 (RECORDING_ENABLED, 시청자가 있는 동안 생산자 실행마다 세션 하나)
+        self.recorder: Optional[SessionRecorder] = None
 
         logger.info(
             f"ScreenController initialized: "
-            f"{self.screen_width}x{self.screen_height} @ {self.fps} FPS, "
-            f"quality: {self.quality}%"
+            f"{self.screen_width}x{self.screen_height}+{self.offset_x}+{self.offset_y} @ {self.fps} FPS, "
+            f"quality: {self.quality}%, encoder: {self._encoder.name}"
         )
 
-    async def start_streaming(self, websocket: WebSocket):
+    @staticmethod
+    def _resolve_region(full_width: int, full_height: int) -> dict:
         """
-        화면 스트리밍 시작
+        REGION_* 설정을 화면 안으로 잘라 캡처 영역 결정
+
+        Returns:
+            mss 형식 영역 {"left", "top", "width", "height"} (미지정/잘못된 값이면 전체 화면)
+        """
+        full = {"left": 0, "top": 0, "width": full_width, "height": full_height}
+        if not settings.has_region:
+            return full
+
+        left = max(0, min(settings.region_x, full_width))
+        top = max(0, min(settings.region_y, full_height))
+        width = min(settings.region_width, full_width - left)
+        height = min(settings.region_height, full_height - top)
+        if width <= 0 or height <= 0:
+            logger.warning(
+                f"Capture region {settings.region_width}x{settings.region_height}"
+                f"+{settings.region_x}+{settings.region_y} is outside the screen, capturing full screen"
+            )
+            return full
+        return {"left": left, "top": top, "width": width, "height": height}
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._broadcaster.is_running
+
+    async def start_streaming(
+        self,
+        connection: ClientConnection,
+        binary: bool = False,
+        delta: bool = False,
+        codec: Optional[str] = None
+    ):
+        """
+        화면 스트리밍 시작 (연결이 끊기거나 취소될 때까지 실행)
+
+        여러 클라이언트가 동시에 시청할 수 있으며, 캡처/인코딩은 한 번만 수행된다.
+        프레임은 연결별 송신 루프가 "최신 프레임 우선"으로 보낸다.
 
         Args:
-            websocket: 연결된 WebSocket 클라이언트
+            connection: 클라이언트 연결 (송신 루프를 이 메서드가 실행)
+            binary: True면 바이너리 프레임 프로토콜, False면 JSON(ScreenFrame)
+            delta: True면 변경된 타일만 전송 (바이너리 전송에서만 사용 가능)
+            codec: 비디오 코덱 모드 ("h264", "vp8", 바이너리 전송 필요).
+                   인코더를 쓸 수 없으면 타일 델타(JPEG)로 대체한다.
         """
-        async with self._lock:
-            if self.is_streaming:
-                logger.warning("Streaming already in progress")
-                return
+        if codec and not (binary and video_available(codec)):
+            logger.warning(f"Video codec {codec} unavailable, falling back to JPEG tiles")
+            codec = None
+            delta = True
 
-            self.is_streaming = True
+        subscriber = self._broadcaster.subscribe(
+            binary=binary,
+            delta=delta and binary,
+            video_codec=codec,
+            ready=connection.ready,
+            adaptive=AdaptiveController(
+                bounds=StreamBounds(
+                    quality_min=min(settings.screen_quality_min, self.quality),
+                    quality_max=self.quality,
+                    fps_min=min(settings.screen_fps_min, self.fps),
+                    fps_max=self.fps,
+                    scale_min=settings.screen_scale_min,
+                ),
+                enabled=settings.adaptive_streaming
+            )
+        )
+        connection.subscriber = subscriber
+        self._connections.append(connection)
+        if subscriber.delta:
+            self.request_keyframe()
+        if self._cursor_shape:
+            await connection.send_json(self._cursor_shape)
+        if self._cursor_position:
+            connection.offer_cursor(self._cursor_position)
 
-        logger.info("Screen streaming started")
-        self.frame_count = 0
+        logger.info(
+            f"Screen streaming started ({'binary' if binary else 'json'}"
+            f"{f', {codec} video' if codec else ', tile delta' if subscriber.delta else ''})"
+        )
         start_time = time.time()
 
         try:
-            while self.is_streaming:
-                loop_start = time.time()
-                interval = 1.0 / self.fps
-
-                # 화면 캡처
-                frame = self.capture_frame()
-
-                if frame:
-                    try:
-                        # 프레임 전송
-                        await websocket.send_json(frame.model_dump())
-                        self.frame_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to send frame: {e}")
-                        break
-
-                # FPS 유지를 위한 대기
-                elapsed = time.time() - loop_start
-                sleep_time = max(0, interval - elapsed)
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-
-        except asyncio.CancelledError:
-            logger.info("Streaming cancelled")
-        except Exception as e:
-            logger.error(f"Streaming error: {e}", exc_info=True)
+            await connection.run()
         finally:
-            async with self._lock:
-                self.is_streaming = False
+            self._broadcaster.unsubscribe(subscriber)
+            self._connections.remove(connection)
 
             elapsed_total = time.time() - start_time
-            actual_fps = self.frame_count / elapsed_total if elapsed_total > 0 else 0
+            actual_fps = subscriber.frames_sent / elapsed_total if elapsed_total > 0 else 0
             logger.info(
                 f"Screen streaming stopped. "
-                f"Total frames: {self.frame_count}, "
+                f"Total frames: {subscriber.frames_sent}, "
+                f"Dropped: {subscriber.frames_dropped}, "
                 f"Duration: {elapsed_total:.1f}s, "
                 f"Actual FPS: {actual_fps:.1f}"
             )
 
-    def capture_frame(self) -> Optional[ScreenFrame]:
+    async def _produce(self):
+        """단일 생산자: 캡처 → 인코딩 → 모든 구독자에게 팬아웃"""
+        logger.info("Frame producer started")
+        self._capture.acquire()
+        last_id = 0
+        cursor_task = asyncio.create_task(self._track_cursor()) if self.cursor_channel else None
+        if settings.recording_enabled:
+            self.recorder = SessionRecorder(
+                directory=settings.recording_dir,
+                name="main" if self.monitor_index is None else f"monitor{self.monitor_index}",
+                fps=settings.recording_fps,
+                quality=settings.recording_quality,
+                segment_bytes=settings.recording_segment_mb * 1024 * 1024,
+                tile_size=settings.tile_size,
+                keyframe_interval=settings.keyframe_interval,
+                encoder_name=settings.screen_format
+            )
+            self.recorder.start()
+
+        try:
+            while self._broadcaster.subscribers:
+                # 클라이언트별 적응 제어 갱신, 캡처는 가장 높은 FPS에 맞춤
+                for subscriber in self._broadcaster.subscribers:
+                    subscriber.adaptive.update()
+                self._capture.fps = max(s.adaptive.fps for s in self._broadcaster.subscribers)
+
+                # 캡처 스레드가 게시한 다음 프레임 대기
+                raw = await self._capture.next_frame(last_id)
+                if raw is None:
+                    continue
+                last_id = raw.frame_id
+                if self.recorder:
+                    # 참조만 넘기고 인코딩/쓰기는 기록 스레드에서
+                    self.recorder.submit_frame(raw)
+
+                if self._is_idle(raw):
+                    self.idle_frames += 1
+                    self._send_heartbeats(raw)
+                    continue
+
+                self._force_frame = False
+                await self._broadcast(raw)
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Frame producer error: {e}", exc_info=True)
+        finally:
+            if cursor_task:
+                cursor_task.cancel()
+            if self.recorder:
+                # 남은 레코드는 기록 스레드가 마저 씀 (이벤트 루프를 막지 않음)
+                self.recorder.stop(wait=False)
+            self._capture.release()
+            self._capture.fps = self.fps
+            for profile, encoder in self._tile_encoders.items():
+                logger.info(f"Tile delta stats {profile}: {encoder.get_stats()}")
+            self._tile_encoders.clear()
+            for key, session in self._video_encoders.items():
+                logger.info(f"Video stats {key}: {session.get_stats()}")
+                session.close()
+            self._video_encoders.clear()
+            logger.info("Frame producer stopped")
+
+    async def _track_cursor(self):
         """
-        단일 프레임 캡처
+        커서 채널: CURSOR_RATE Hz로 커서 위치를 샘플링해 바뀌었을 때만 모든 시청자에게 전달
 
-        Returns:
-            ScreenFrame 또는 None (실패 시)
+        위치는 연결별 최신 값 슬롯으로 보내므로(프레임 우편함과 별개) 커서만 움직일 때는
+        화면 프레임 없이 작은 메시지만 나간다. 모양은 4회에 한 번 확인해 바뀌었을 때만 보낸다.
         """
+        tracker = CursorTracker(self.offset_x, self.offset_y, self.screen_width, self.screen_height)
+        interval = 1.0 / max(1, settings.cursor_rate)
+        tick = 0
+        logger.info(f"Cursor channel started @ {settings.cursor_rate} Hz (shape: {tracker.has_shape})")
+
         try:
-            with mss.mss() as sct:
-                # 주 모니터 캡처 (monitors[1]이 주 모니터)
-                monitor = sct.monitors[1]
-                screenshot = sct.grab(monitor)
-
-                # PIL Image로 변환
-                img = Image.frombytes(
-                    'RGB',
-                    screenshot.size,
-                    screenshot.rgb
-                )
+            while True:
+                if tick % 4 == 0:
+                    shape = tracker.poll_shape()
+                    if shape:
+                        self._cursor_shape = shape
+                        for connection in list(self._connections):
+                            try:
+                                await connection.send_json(shape)
+                            except RuntimeError:
+                                pass
+                tick += 1
+
+                position = tracker.poll_position()
+                if position:
+                    self._cursor_position = json.dumps(position)
+                    for connection in self._connections:
+                        connection.offer_cursor(self._cursor_position)
+                    self.cursor_messages += 1
+
+                await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Cursor channel error: {e}", exc_info=True)
+        finally:
+            tracker.close()
+            self._cursor_position = None
+            self._cursor_shape = None
+
+    def _is_idle(self, raw: RawFrame) -> bool:
+        """
+        모든 구독자가 이미 이 화면(같은 체크섬)을 현재 프로필로 받았는지
+
+        새 구독자, 프로필이 바뀐 구독자, 키프레임 요청이 있으면 유휴로 보지 않는다.
+        """
+        if not settings.idle_detection or self._force_frame:
+            return False
+        return all(
+            s.digest == raw.digest and s.is_up_to_date
+            for s in self._broadcaster.subscribers
+        )
 
-                # JPEG 압축 및 Base64 인코딩
-                buffered = BytesIO()
-                img.save(
-                    buffered,
-                    format=settings.screen_format,
-                    quality=self.quality,
-                    optimize=True
+    def _send_heartbeats(self, raw: RawFrame):
+        """유휴 상태에서 전송 방식별로 한 번만 만든 하트비트를 구독자에게 전달"""
+        messages: Dict[bool, StreamMessage] = {}
+        for subscriber in self._broadcaster.subscribers:
+            binary = subscriber.binary
+            if binary not in messages:
+                messages[binary] = (
+                    pack_frame(EncodedFrame(
+                        frame_id=raw.frame_id,
+                        timestamp=raw.timestamp,
+                        width=raw.width,
+                        height=raw.height,
+                        codec=CODEC_NONE,
+                        data=b"",
+                        kind=KIND_HEARTBEAT,
+                        keyframe=False
+                    )) if binary
+                    else Heartbeat(frame_id=raw.frame_id, timestamp=raw.timestamp).model_dump_json()
                 )
-                img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
+            subscriber.offer_heartbeat(messages[binary], settings.heartbeat_interval)
+
+    async def _broadcast(self, raw: RawFrame):
+        """
+        프레임을 인코딩 프로필(품질, 배율)과 전송 방식별로 한 번씩만
+        인코딩/직렬화해 구독자에게 전달
+
+        구독자별 계획과 전달은 이벤트 루프에서, 인코딩은 워커 스레드에서 한다
+        (인코딩 중에도 입력/커서/송신이 막히지 않음).
+        """
+        now = time.monotonic()
+        plans: List[Tuple[StreamSubscriber, tuple]] = []
+        keys: Dict[tuple, bool] = {}  # 인코딩할 키 → 키프레임 강제 여부
+        used_encoders = set()
+
+        for subscriber in list(self._broadcaster.subscribers):
+            profile = subscriber.adaptive.profile
+
+            if subscriber.delta:
+                codec = subscriber.video_codec
+                key = ("video", codec, profile) if codec else ("delta", profile)
+                used_encoders.add(key)
+                restart = subscriber.profile != profile
+                if restart:
+                    # 프로필이 바뀌면 새 기준 프레임부터 받아야 함
+                    subscriber.profile = profile
+                    subscriber.awaiting_keyframe = True
+                keys[key] = keys.get(key, False) or restart
+                plans.append((subscriber, key))
+                continue
+
+            # 전체 프레임 구독자는 자신의 FPS 간격이 되었을 때만 인코딩/전달
+            if not subscriber.wants_frame(now):
+                continue
+            subscriber.profile = profile
+            keys.setdefault(("full", profile), False)
+            plans.append((subscriber, ("full", profile)))
+
+        # 더 이상 쓰지 않는 프로필의 델타/비디오 인코더 정리
+        for profile in list(self._tile_encoders):
+            if ("delta", profile) not in used_encoders:
+                del self._tile_encoders[profile]
+        for codec, quality, scale in list(self._video_encoders):
+            if ("video", codec, (quality, scale)) not in used_encoders:
+                self._video_encoders.pop((codec, quality, scale)).close()
+        self._scaler.retain({s.adaptive.profile[1] for s in self._broadcaster.subscribers})
 
-                return ScreenFrame(
-                    data=img_base64,
-                    width=screenshot.width,
-                    height=screenshot.height,
-                    timestamp=time.time()
+        if not plans:
+            return
+        frames, timings = await asyncio.to_thread(self._encode_all, raw, keys)
+
+        messages: Dict[tuple, StreamMessage] = {}
+        produced = False
+        for subscriber, key in plans:
+            frame = frames.get(key)
+
+            if key[0] != "full":
+                if frame is None:
+                    # 변경 없음(또는 인코딩 실패): 구독자의 화면이 이미 이 프레임과 같음
+                    if not subscriber.awaiting_keyframe:
+                        subscriber.digest = raw.digest
+                    continue
+                message = messages.get(key) or messages.setdefault(key, pack_frame(frame))
+                if subscriber.offer(message, keyframe=frame.keyframe, timing=timings[key]):
+                    subscriber.digest = raw.digest
+                else:
+                    # 프레임이 빠진 델타 구독자는 키프레임부터 다시 받아야 함
+                    encoder = (
+                        self._video_encoders.get((key[1], *key[2])) if key[0] == "video"
+                        else self._tile_encoders.get(key[1])
+                    )
+                    if encoder:
+                        encoder.request_keyframe()
+                produced = True
+                continue
+
+            if frame is None:
+                continue
+            profile = key[1]
+            message_key = ("binary" if subscriber.binary else "json", profile)
+            if message_key not in messages:
+                messages[message_key] = (
+                    pack_frame(frame) if subscriber.binary
+                    else self._to_screen_frame(frame).model_dump_json()
                 )
+            subscriber.offer(messages[message_key], timing=timings[key])
+            subscriber.digest = raw.digest
+            produced = True
+
+        if produced:
+            self.frame_count += 1
+
+    def _encode_all(
+        self,
+        raw: RawFrame,
+        keys: Dict[tuple, bool]
+    ) -> Tuple[Dict[tuple, Optional[EncodedFrame]], Dict[tuple, FrameTiming]]:
+        """
+        키별 인코딩 (워커 스레드에서 실행, 큰 프레임은 ParallelEncoder가 띠로 나눠 병렬 처리)
+
+        Args:
+            keys: ("full" | "delta", profile) 또는 ("video", codec, profile) → 키프레임 강제 여부
+
+        Returns:
+            (키별 EncodedFrame 또는 None, 키별 타이밍)
+        """
+        surfaces: Dict[float, FrameSurface] = {}
+        frames: Dict[tuple, Optional[EncodedFrame]] = {}
+        timings: Dict[tuple, FrameTiming] = {}
+
+        def surface_for(scale: float) -> FrameSurface:
+            if scale not in surfaces:
+                surfaces[scale] = self._scaler.surface(raw, scale)
+            return surfaces[scale]
+
+        def full_for(profile: Tuple[int, float]) -> Optional[EncodedFrame]:
+            key = ("full", profile)
+            if key not in frames:
+                quality, scale = profile
+                passthrough = self._passthrough(raw) if scale >= 1.0 else None
+                if passthrough is not None:
+                    encode(key, lambda: passthrough)
+                else:
+                    encode(key, lambda: self._encode_frame(raw, quality, surface_for(scale)))
+            return frames[key]
+
+        def encode(key: tuple, fn: Callable[[], Optional[EncodedFrame]]):
+            # 인코딩 결과와 타이밍을 키별로 한 번만 만듦 (축소 시간 포함)
+            start = time.monotonic()
+            frames[key] = fn()
+            end = time.monotonic()
+            timings[key] = FrameTiming(
+                frame_id=raw.frame_id,
+                captured_at=raw.captured_at,
+                capture_ms=raw.capture_ms,
+                encode_ms=(end - start) * 1000,
+                encoded_at=end
+            )
+
+        for key, restart in keys.items():
+            if key in frames:
+                continue
+            if key[0] == "full":
+                full_for(key[1])
+            elif key[0] == "video":
+                _, codec, profile = key
+                session = self._video_encoder_for(codec, profile, surface_for(profile[1]))
+                if restart:
+                    session.request_keyframe()
+                encode(key, lambda: self._encode_video(session, raw, surface_for(profile[1])))
+            else:
+                profile = key[1]
+                tiles = self._tile_encoder_for(profile)
+                if restart:
+                    tiles.request_keyframe()
+                encode(key, lambda: self._encode_tiles(raw, profile, surface_for(profile[1]), full_for))
 
+        return frames, timings
+
+    def _tile_encoder_for(self, profile: Tuple[int, float]) -> TileDeltaEncoder:
+        """프로필별 타일 델타 인코더"""
+        encoder = self._tile_encoders.get(profile)
+        if encoder is None:
+            encoder = TileDeltaEncoder(
+                tile_size=settings.tile_size,
+                keyframe_interval=settings.keyframe_interval,
+                encoder=self._encoder
+            )
+            self._tile_encoders[profile] = encoder
+        return encoder
+
+    def _video_encoder_for(
+        self,
+        codec: str,
+        profile: Tuple[int, float],
+        surface: FrameSurface
+    ) -> VideoEncoderSession:
+        """코덱/프로필별 비디오 인코더 세션 (크기가 바뀌면 다시 염)"""
+        key = (codec, *profile)
+        session = self._video_encoders.get(key)
+        if session is None or not session.matches(surface):
+            if session is not None:
+                session.close()
+            session = VideoEncoderSession(
+                codec=codec,
+                width=surface.width,
+                height=surface.height,
+                fps=self.fps,
+                quality=profile[0],
+                keyframe_interval=settings.video_keyframe_interval
+            )
+            self._video_encoders[key] = session
+        return session
+
+    def _encode_video(
+        self,
+        session: VideoEncoderSession,
+        raw: RawFrame,
+        surface: FrameSurface
+    ) -> Optional[EncodedFrame]:
+        """비디오 인코딩 (실패 시 None, 다음 프레임을 키프레임으로)"""
+        try:
+            return session.encode(raw, surface)
         except Exception as e:
-            logger.error(f"Frame capture error: {e}")
+            logger.error(f"Video encode error: {e}")
+            session.request_keyframe()
             return None
 
+    async def capture_frame(self) -> Optional[ScreenFrame]:
+        """
+        단일 프레임 캡처 (항상 새로 캡처)
+
+        Returns:
+            ScreenFrame 또는 None (실패 시)
+        """
+        return await self.get_frame(max_age_ms=0)
+
+    async def get_frame(self, max_age_ms: float) -> Optional[ScreenFrame]:
+        """
+        max_age_ms 이내에 캡처된 프레임 (AI 분석용 JPEG ScreenFrame)
+
+        캡처 스레드의 최신 프레임 슬롯이 원본 프레임 캐시다. 스트리밍 중에는 계속 갱신되므로
+        대개 새로 캡처하지 않고, 너무 오래되었을 때만 한 장 캡처한다.
+        인코딩 결과(JPEG + Base64)는 화면 체크섬으로 캐시해 화면이 그대로면 다시 인코딩하지 않는다.
+
+        Args:
+            max_age_ms: 허용하는 최대 프레임 나이 (0이면 항상 새로 캡처)
+
+        Returns:
+            ScreenFrame 또는 None (실패 시)
+        """
+        raw = self._capture.latest
+        if raw is None or (time.monotonic() - raw.captured_at) * 1000 > max_age_ms:
+            raw = await self._capture.next_frame(raw.frame_id if raw else 0)
+            if raw is None:
+                logger.error("Frame capture error: timed out waiting for capture worker")
+                return None
+            self.snapshot_captures += 1
+
+        key = (raw.digest, raw.width, raw.height)
+        if self._snapshot is not None and self._snapshot[0] == key:
+            self.snapshot_hits += 1
+            frame = self._snapshot[1]
+        else:
+            encoded = self._passthrough(raw) or await asyncio.to_thread(
+                lambda: self._encode_frame(raw, self.quality, make_surface(raw), self._snapshot_encoder)
+            )
+            if encoded is None:
+                return None
+            frame = self._to_screen_frame(encoded)
+            self._snapshot = (key, frame)
+
+        # 캐시된 이미지라도 시각/번호는 이 프레임 기준
+        return frame.model_copy(update={"timestamp": raw.timestamp, "frame_id": raw.frame_id})
+
+    def _passthrough(self, raw: RawFrame) -> Optional[EncodedFrame]:
+        """
+        캡처 소스가 이미 JPEG으로 준 프레임(Appium MJPEG)은 다시 인코딩하지 않고 그대로 사용
+
+        원본 크기 프레임에만 쓰며 품질은 소스가 정한다 (적응형 품질은 축소 배율로만 적용됨).
+        """
+        jpeg = getattr(raw.shot, "jpeg", None)
+        if jpeg is None:
+            return None
+        self.passthrough_frames += 1
+        return EncodedFrame(
+            frame_id=raw.frame_id,
+            timestamp=raw.timestamp,
+            width=raw.width,
+            height=raw.height,
+            codec=CODEC_JPEG,
+            data=jpeg
+        )
+
+    def _encode_frame(
+        self,
+        raw: RawFrame,
+        quality: int,
+        surface: FrameSurface,
+        encoder: Optional[ImageEncoder] = None
+    ) -> Optional[EncodedFrame]:
+        """
+        캡처된 프레임 인코딩
+
+        Args:
+            raw: 원본 프레임 (헤더 정보)
+            quality: 인코딩 품질
+            surface: 인코딩할 픽셀 (축소되었을 수 있음)
+            encoder: 사용할 인코더 (기본값: SCREEN_FORMAT 인코더)
+
+        Returns:
+            EncodedFrame 또는 None (실패 시)
+        """
+        encoder = encoder or self._encoder
+        try:
+            # width/height는 원격 화면 크기 (클라이언트 좌표 변환 기준)
+            return EncodedFrame(
+                frame_id=raw.frame_id,
+                timestamp=raw.timestamp,
+                width=raw.width,
+                height=raw.height,
+                codec=encoder.codec,
+                data=encoder.encode(surface, quality)
+            )
+
+        except Exception as e:
+            logger.error(f"Frame encode error: {e}")
+            return None
+
+    def _encode_tiles(
+        self,
+        raw: RawFrame,
+        profile: Tuple[int, float],
+        surface: FrameSurface,
+        full_for: Callable[[Tuple[int, float]], Optional[EncodedFrame]]
+    ) -> Optional[EncodedFrame]:
+        """
+        타일 델타 모드 인코딩
+
+        Args:
+            full_for: 프로필의 전체 프레임을 (필요 시 한 번만) 인코딩해 돌려주는 함수
+
+        Returns:
+            키프레임(전체 프레임), 변경 타일 프레임, 또는 None (변경 없음)
+        """
+        tiles = self._tile_encoders[profile]
+        if not tiles.needs_keyframe(surface):
+            frame = tiles.encode_delta(raw, surface, profile[0])
+            if frame or not tiles.needs_keyframe(surface):
+                return frame
+
+        frame = full_for(profile)
+        if frame:
+            tiles.mark_keyframe(surface)
+        return frame
+
+    def record_action(self, action: dict):
+        """실행한 액션을 녹화 중인 세션에 기록 (ActionHandler.on_action)"""
+        if self.recorder:
+            self.recorder.record_action(action)
+
+    def resize(self, width: int, height: int):
+        """캡처 크기 변경 반영 (Appium 기기 회전, 인코더는 새 크기의 첫 프레임에서 키프레임부터 다시 시작)"""
+        self.region = {**self.region, "width": width, "height": height}
+        self.screen_width, self.screen_height = width, height
+
+    def request_keyframe(self):
+        """타일 델타/비디오 모드에서 다음 프레임을 키프레임으로 전송"""
+        self._force_frame = True
+        # 인코딩 스레드가 인코더를 만드는 중일 수 있으므로 복사본으로 순회
+        for encoder in list(self._tile_encoders.values()):
+            encoder.request_keyframe()
+        for session in list(self._video_encoders.values()):
+            session.request_keyframe()
+
+    @staticmethod
+    def _to_screen_frame(frame: EncodedFrame) -> ScreenFrame:
+        """JSON 전송용 ScreenFrame 변환 (Base64 인코딩)"""
+        return ScreenFrame(
+            data=base64.b64encode(frame.data).decode('utf-8'),
+            width=frame.width,
+            height=frame.height,
+            timestamp=frame.timestamp,
+            format=CODEC_NAMES.get(frame.codec, "jpeg"),
+            frame_id=frame.frame_id
+        )
+
     def stop_streaming(self):
-        """스트리밍 중지"""
-        self.is_streaming = False
+        """모든 시청자의 스트리밍 중지"""
+        self._broadcaster.stop()
         logger.info("Streaming stop requested")
 
+    def shutdown(self):
+        """캡처 스레드 종료 (애플리케이션 종료 시)"""
+        self.stop_streaming()
+        self._capture.stop()
+        if self.recorder:
+            self.recorder.stop()
+        self._encoder.close()
+        self._snapshot_encoder.close()
+
     def get_screen_info(self) -> dict:
         """화면 정보 반환"""
         return {
             "width": self.screen_width,
             "height": self.screen_height,
+            "monitor": self.monitor_index,
+            "region": self.region,
             "fps": self.fps,
             "quality": self.quality,
             "is_streaming": self.is_streaming,
-            "frame_count": self.frame_count
+            "frame_count": self.frame_count,
+            "idle_frames": self.idle_frames,
+            "cursor_messages": self.cursor_messages,
+            "recording": self.recorder.get_stats() if self.recorder else None,
+            "snapshots": {"captures": self.snapshot_captures, "cache_hits": self.snapshot_hits},
+            "frames_dropped": sum(c.subscriber.frames_dropped for c in self._connections),
+            "viewers": [c.get_stats() for c in self._connections],
+            "capture_errors": self._capture.capture_errors,
+            "capture_source": self._capture.get_stats(),
+            "passthrough_frames": self.passthrough_frames,
+            "capture_schedule": self._capture.scheduler.get_stats(),
+            "encoding": self._encoder.get_stats(),
+            "tile_delta": {
+                f"q{quality}@{scale}": encoder.get_stats()
+                for (quality, scale), encoder in list(self._tile_encoders.items())
+            },
+            "video": {
+                f"{codec} q{quality}@{scale}": session.get_stats()
+                for (codec, quality, scale), session in list(self._video_encoders.items())
+            }
         }
@@ -0,0 +1,179 @@
+"""
+Web Player - 타일 기반 델타 인코더
+이전 프레임과 비교해 변경된 타일만 인코딩한다.
+"""
+import logging
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .capture_worker import RawFrame
+from .encoders import ImageEncoder, PillowJpegEncoder
+from .frame_protocol import KIND_TILES, EncodedFrame, pack_tiles
+from .frame_scaler import FrameSurface
+
+logger = logging.getLogger(__name__)
+
+
+class TileDeltaEncoder:
+    """
+    타일 단위 변경 감지 및 델타 인코딩
+
+    프레임(축소된 경우 축소 후 좌표)을 tile_size 정사각 타일로 나누고, 이전 프레임과 NumPy로 일괄 비교해
+    변경된 타일만 이미지 인코더(기본 JPEG)로 인코딩한다. 같은 타일 행에서 연속으로 변경된 타일은
+    하나의 사각형으로 묶어 인코딩 횟수를 줄인다.
+
+    키프레임(전체 프레임)은 다음 경우에 보낸다:
+        - 첫 프레임 또는 해상도 변경
+        - keyframe_interval 초 경과
+        - request_keyframe() 호출
+        - 변경된 타일 비율이 full_frame_ratio 이상
+    """
+
+    def __init__(
+        self,
+        tile_size: int = 64,
+        keyframe_interval: float = 10.0,
+        full_frame_ratio: float = 0.5,
+        encoder: Optional[ImageEncoder] = None
+    ):
+        self.tile_size = tile_size
+        self.encoder = encoder or PillowJpegEncoder()
+        self.keyframe_interval = keyframe_interval
+        self.full_frame_ratio = full_frame_ratio
+
+        self._prev: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None  # 픽셀 비교 결과 (프레임마다 재사용)
+        self._last_keyframe = 0.0
+        self._keyframe_requested = True
+
+        # 통계
+        self.keyframes = 0
+        self.delta_frames = 0
+        self.skipped_frames = 0
+        self.tiles_sent = 0
+
+    def request_keyframe(self):
+        """다음 프레임을 키프레임으로 전송하도록 요청"""
+        self._keyframe_requested = True
+
+    def needs_keyframe(self, surface: FrameSurface) -> bool:
+        """이번 프레임이 키프레임이어야 하는지 확인"""
+        if self._keyframe_requested or self._prev is None:
+            return True
+        if self._prev.shape != surface.pixels.shape:
+            return True
+        return time.monotonic() - self._last_keyframe >= self.keyframe_interval
+
+    def mark_keyframe(self, surface: FrameSurface):
+        """키프레임 전송 후 기준 프레임 갱신"""
+        current = surface.pixels
+        if self._prev is None or self._prev.shape != current.shape:
+            self._prev = current.copy()
+        else:
+            np.copyto(self._prev, current)
+        self._last_keyframe = time.monotonic()
+        self._keyframe_requested = False
+        self.keyframes += 1
+
+    def encode_delta(self, raw: RawFrame, surface: FrameSurface, quality: int) -> Optional[EncodedFrame]:
+        """
+        변경된 타일만 인코딩
+
+        Returns:
+            KIND_TILES EncodedFrame, 또는 None.
+            None은 변경이 없거나, 변경 비율이 커서 키프레임이 필요한 경우
+            (후자는 needs_keyframe()이 True가 된다)
+        """
+        current = surface.pixels
+        rects, changed_ratio = self._changed_rects(current)
+
+        if not rects:
+            self.skipped_frames += 1
+            return None
+
+        if changed_ratio >= self.full_frame_ratio:
+            # 대부분 바뀌었으면 키프레임이 더 효율적
+            self._keyframe_requested = True
+            return None
+
+        encoded = self.encoder.encode_many([surface.crop(x, y, w, h) for x, y, w, h in rects], quality)
+        tiles = [rect + (data,) for rect, data in zip(rects, encoded)]
+
+        # 전송한 영역만 기준 프레임에 반영
+        for x, y, w, h in rects:
+            self._prev[y:y + h, x:x + w] = current[y:y + h, x:x + w]
+
+        self.delta_frames += 1
+        self.tiles_sent += len(tiles)
+
+        return EncodedFrame(
+            frame_id=raw.frame_id,
+            timestamp=raw.timestamp,
+            width=raw.width,
+            height=raw.height,
+            codec=self.encoder.codec,
+            data=pack_tiles(tiles),
+            kind=KIND_TILES,
+            keyframe=False
+        )
+
+    def get_stats(self) -> dict:
+        """인코더 통계"""
+        return {
+            "tile_size": self.tile_size,
+            "keyframes": self.keyframes,
+            "delta_frames": self.delta_frames,
+            "skipped_frames": self.skipped_frames,
+            "tiles_sent": self.tiles_sent,
+        }
+
+    def _changed_rects(self, current: np.ndarray) -> Tuple[List[Tuple[int, int, int, int]], float]:
+        """
+        변경된 타일을 사각형 목록으로 반환
+
+        Returns:
+            ([(x, y, w, h), ...], 변경된 타일 비율)
+        """
+        height, width = current.shape
+        size = self.tile_size
+
+        # 픽셀 단위 비교 후 타일 단위로 축약 (마지막 행/열 타일은 크기가 작을 수 있음)
+        if self._diff is None or self._diff.shape != current.shape:
+            self._diff = np.empty(current.shape, dtype=bool)
+        diff = np.not_equal(current, self._prev, out=self._diff)
+        row_starts = np.arange(0, height, size)
+        col_starts = np.arange(0, width, size)
+        dirty = np.logical_or.reduceat(
+            np.logical_or.reduceat(diff, row_starts, axis=0),
+            col_starts,
+            axis=1
+        )
+
+        changed = int(dirty.sum())
+        if changed == 0:
+            return [], 0.0
+
+        rects = []
+        for row in np.flatnonzero(dirty.any(axis=1)):
+            y = int(row) * size
+            h = min(size, height - y)
+            cols = np.flatnonzero(dirty[row])
+
+            # 연속된 타일을 하나의 사각형으로 병합
+            run_start = prev = int(cols[0])
+            for col in cols[1:]:
+                col = int(col)
+                if col != prev + 1:
+                    rects.append(self._rect(run_start, prev, y, h, width))
+                    run_start = col
+                prev = col
+            rects.append(self._rect(run_start, prev, y, h, width))
+
+        return rects, changed / dirty.size
+
+    def _rect(self, first_col: int, last_col: int, y: int, h: int, width: int) -> Tuple[int, int, int, int]:
+        x = first_col * self.tile_size
+        w = min((last_col + 1) * self.tile_size, width) - x
+        return x, y, w, h
@@ -0,0 +1,175 @@
+"""
+Web Player - 비디오 코덱 인코더 세션
+연속 프레임을 H.264/VP8로 인코딩해 프레임 간 중복을 제거한다 (PyAV 필요, 선택 사항).
+"""
+import logging
+from fractions import Fraction
+from typing import Optional
+
+import numpy as np
+
+from .capture_worker import RawFrame
+from .frame_protocol import CODEC_H264, CODEC_VP8, KIND_VIDEO, EncodedFrame
+from .frame_scaler import FrameSurface
+
+try:
+    import av
+except ImportError:
+    av = None
+
+logger = logging.getLogger(__name__)
+
+# 클라이언트 요청 이름 → (PyAV 코덱, 프로토콜 코덱 ID)
+VIDEO_CODECS = {
+    "h264": ("libx264", CODEC_H264),
+    "vp8": ("libvpx", CODEC_VP8),
+}
+
+
+def video_available(codec: str) -> bool:
+    """PyAV와 해당 소프트웨어 인코더를 사용할 수 있는지"""
+    if av is None or codec not in VIDEO_CODECS:
+        return False
+    return VIDEO_CODECS[codec][0] in av.codecs_available
+
+
+def quality_to_crf(quality: int, codec: str) -> int:
+    """JPEG 품질(1-100)을 코덱의 CRF 값으로 변환 (품질이 높을수록 CRF가 낮음)"""
+    max_crf = 51 if codec == "h264" else 63
+    return max(4, min(max_crf, round(max_crf - quality * max_crf * 0.0055)))
+
+
+class VideoEncoderSession:
+    """
+    지속되는 소프트웨어 비디오 인코더 세션
+
+    저지연 설정(B-frame 없음, 룩어헤드 없음, 한 프레임 입력 → 한 패킷 출력)으로 열고,
+    keyframe_interval 초마다 또는 request_keyframe() 호출 시 키프레임을 만든다.
+    H.264는 Annex B 바이트 스트림으로 출력해 키프레임에 SPS/PPS가 포함된다.
+    """
+
+    def __init__(
+        self,
+        codec: str,
+        width: int,
+        height: int,
+        fps: int,
+        quality: int,
+        keyframe_interval: float = 5.0
+    ):
+        """
+        Args:
+            codec: "h264" 또는 "vp8"
+            width, height: 인코딩 크기 (짝수로 내림)
+            fps: 예상 입력 FPS (GOP 및 레이트 제어 기준)
+            quality: JPEG 품질 기준 (CRF로 변환)
+            keyframe_interval: 키프레임 주기 (초)
+        """
+        if not video_available(codec):
+            raise RuntimeError(f"Video codec {codec} is not available (PyAV with {codec} encoder required)")
+
+        self.codec = codec
+        self.codec_id = VIDEO_CODECS[codec][1]
+        # yuv420p는 짝수 크기가 필요
+        self.width = width - width % 2
+        self.height = height - height % 2
+        self._force_keyframe = True
+        self._pts = 0
+
+        context = av.CodecContext.create(VIDEO_CODECS[codec][0], "w")
+        context.width = self.width
+        context.height = self.height
+        context.pix_fmt = "yuv420p"
+        context.time_base = Fraction(1, fps)
+        context.framerate = Fraction(fps, 1)
+        context.gop_size = max(1, round(fps * keyframe_interval))
+        context.max_b_frames = 0
+        crf = str(quality_to_crf(quality, codec))
+        if codec == "h264":
+            context.options = {
+                "preset": "ultrafast",
+                "tune": "zerolatency",
+                "crf": crf,
+                "repeat-headers": "1",
+            }
+        else:
+            context.options = {
+                "deadline": "realtime",
+                "cpu-used": "8",
+                "lag-in-frames": "0",
+                "crf": crf,
+                "b": "0",
+            }
+        context.open()
+        self._context = context
+
+        # 통계
+        self.keyframes = 0
+        self.frames = 0
+        self.bytes = 0
+
+        logger.info(f"Video encoder opened: {codec} {self.width}x{self.height} @ {fps} FPS, crf {crf}")
+
+    def matches(self, surface: FrameSurface) -> bool:
+        """이 세션으로 인코딩할 수 있는 크기인지"""
+        return (
+            surface.width - surface.width % 2 == self.width
+            and surface.height - surface.height % 2 == self.height
+        )
+
+    def request_keyframe(self):
+        """다음 프레임을 키프레임으로 인코딩 (새 시청자, 재동기화)"""
+        self._force_keyframe = True
+
+    def encode(self, raw: RawFrame, surface: FrameSurface) -> Optional[EncodedFrame]:
+        """
+        프레임 하나 인코딩
+
+        Returns:
+            KIND_VIDEO EncodedFrame, 또는 None (인코더가 패킷을 내지 않음)
+        """
+        pixels = surface.pixels[:self.height, :self.width]
+        rgba = np.ascontiguousarray(pixels).view(np.uint8).reshape(self.height, self.width, 4)
+        frame = av.VideoFrame.from_ndarray(rgba, format="bgra" if surface.rawmode == "BGRX" else "rgba")
+        frame = frame.reformat(format="yuv420p")
+        frame.pts = self._pts
+        self._pts += 1
+        if self._force_keyframe:
+            frame.pict_type = av.video.frame.PictureType.I
+            self._force_keyframe = False
+
+        packets = self._context.encode(frame)
+        if not packets:
+            return None
+
+        data = b"".join(bytes(packet) for packet in packets)
+        keyframe = any(packet.is_keyframe for packet in packets)
+        self.frames += 1
+        self.bytes += len(data)
+        if keyframe:
+            self.keyframes += 1
+
+        return EncodedFrame(
+            frame_id=raw.frame_id,
+            timestamp=raw.timestamp,
+            width=raw.width,
+            height=raw.height,
+            codec=self.codec_id,
+            data=data,
+            kind=KIND_VIDEO,
+            keyframe=keyframe
+        )
+
+    def close(self):
+        """인코더 세션 종료"""
+        self._context = None
+
+    def get_stats(self) -> dict:
+        """인코더 통계"""
+        return {
+            "codec": self.codec,
+            "size": f"{self.width}x{self.height}",
+            "frames": self.frames,
+            "keyframes": self.keyframes,
+            "avg_bytes": round(self.bytes / self.frames) if self.frames else 0,
+        }
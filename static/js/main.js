@@ -9,11 +9,19 @@ let inputHandler;
 let aiCommandHandler;
 let goalAutomationHandler;
 let fpsUpdateInterval;
+let clientStatsInterval;
+let viewportTimer;
+// WebCodecs가 있으면 H.264 비디오 스트림 요청 (디코딩 실패 시 JPEG로 전환)
+let useVideo = ScreenRenderer.supportsVideo();
+
+// 서버 하트비트 주기(기본 1초)보다 충분히 긴 무응답 허용 시간
+const STALL_TIMEOUT_MS = 5000;
 
 // DOM 요소
 const elements = {
     connectionStatus: null,
     fpsCounter: null,
+    latency: null,
     resolution: null,
     loading: null,
     canvas: null,
@@ -21,7 +29,8 @@ const elements = {
     btnDisconnect: null,
     btnFullscreen: null,
     qualitySlider: null,
-    qualityValue: null
+    qualityValue: null,
+    monitorSelect: null
 };
 
 // 초기화
@@ -34,6 +43,7 @@ document.addEventListener('DOMContentLoaded', () => {
 function initializeElements() {
     elements.connectionStatus = document.getElementById('connection-status');
     elements.fpsCounter = document.getElementById('fps-counter');
+    elements.latency = document.getElementById('latency');
     elements.resolution = document.getElementById('resolution');
     elements.loading = document.getElementById('loading');
     elements.canvas = document.getElementById('screen-canvas');
@@ -42,18 +52,44 @@ function initializeElements() {
     elements.btnFullscreen = document.getElementById('btn-fullscreen');
     elements.qualitySlider = document.getElementById('quality-slider');
     elements.qualityValue = document.getElementById('quality-value');
+    elements.monitorSelect = document.getElementById('monitor-select');
 }
 
-function initializeApp() {
-    // WebSocket URL 생성
+/**
+ * WebSocket URL 생성
+ * @param {string} monitor - 모니터 인덱스 (빈 문자열이면 서버 기본 화면)
+ */
+function buildWebSocketUrl(monitor) {
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = `${protocol}//${window.location.host}/ws`;
+    // 바이너리 프레임 프로토콜 사용 (미지정 시 서버는 JSON 프레임 전송)
+    // delta=tiles: 변경된 타일만 수신
+    let url = `${protocol}//${window.location.host}/ws?transport=binary&delta=tiles`;
+    if (useVideo) {
+        url += '&codec=h264';
+    }
+    if (monitor) {
+        url += `&monitor=${encodeURIComponent(monitor)}`;
+    }
+    return url;
+}
 
+function initializeApp() {
     // WebSocket 클라이언트 생성
-    wsClient = new WebSocketClient(wsUrl);
+    wsClient = new WebSocketClient(buildWebSocketUrl(''));
 
     // 화면 렌더러 생성
     screenRenderer = new ScreenRenderer('screen-canvas');
+    screenRenderer.onKeyframeNeeded = () => wsClient.send({ type: 'keyframe_request' });
+    screenRenderer.onFramePainted = (frameId, ms) => wsClient.send({
+        type: 'frame_ack',
+        frame_id: frameId,
+        decode_ms: Math.round(ms * 10) / 10
+    });
+    screenRenderer.onVideoUnsupported = () => {
+        console.warn('Video decoding unavailable, falling back to JPEG stream');
+        useVideo = false;
+        wsClient.reconnect(buildWebSocketUrl(elements.monitorSelect.value));
+    };
 
     // 입력 핸들러 생성
     inputHandler = new InputHandler(elements.canvas, wsClient, screenRenderer);
@@ -67,15 +103,20 @@ function initializeApp() {
     // WebSocket 이벤트 핸들러 등록
     wsClient.on('open', handleWebSocketOpen);
     wsClient.on('message', handleWebSocketMessage);
+    wsClient.on('binary', handleBinaryMessage);
     wsClient.on('error', handleWebSocketError);
     wsClient.on('close', handleWebSocketClose);
 
     // UI 컨트롤 설정
     setupUIControls();
+    loadMonitors();
 
     // FPS 업데이트 인터벌
     fpsUpdateInterval = setInterval(updateStats, 500);
 
+    // 디코딩 시간 보고 (서버가 클라이언트별 품질/FPS 조정에 사용)
+    clientStatsInterval = setInterval(reportClientStats, 1000);
+
     // 자동 연결
     wsClient.connect();
 
@@ -90,6 +131,7 @@ function handleWebSocketOpen(event) {
     inputHandler.enable();
     aiCommandHandler.enable();
     enableGoalAutomation();
+    reportViewport();
 }
 
 function handleWebSocketMessage(data) {
@@ -98,6 +140,22 @@ function handleWebSocketMessage(data) {
             screenRenderer.renderFrame(data);
             break;
 
+        case 'heartbeat':
+            screenRenderer.handleHeartbeat();
+            break;
+
+        case 'cursor':
+            screenRenderer.updateCursor(data);
+            break;
+
+        case 'cursor_shape':
+            screenRenderer.setCursorShape(data);
+            break;
+
+        case 'latency_stats':
+            updateLatency(data);
+            break;
+
         case 'status':
             console.log('Status:', data.message);
             if (data.status === 'connected') {
@@ -105,6 +163,15 @@ function handleWebSocketMessage(data) {
             }
             break;
 
+        case 'action_batch_result':
+            console.log(`Action batch ${data.status}: ${data.executed} executed, ` +
+                `${data.failed} failed, ${data.skipped} skipped (${data.duration_ms} ms)`);
+            if (data.status !== 'success') {
+                showNotification('Macro ' + data.status + ': ' + (data.message ||
+                    (data.results.find(r => r.status === 'error') || {}).message || ''), 'error');
+            }
+            break;
+
         case 'ai_response':
             // AI 명령 응답 처리
             aiCommandHandler.handleResponse(data);
@@ -125,6 +192,10 @@ function handleWebSocketMessage(data) {
     }
 }
 
+function handleBinaryMessage(buffer) {
+    screenRenderer.renderBinaryFrame(buffer);
+}
+
 function handleWebSocketError(event) {
     console.error('WebSocket error:', event);
     updateConnectionStatus('error', 'Connection Error');
@@ -173,14 +244,45 @@ function setupUIControls() {
         console.log(`Quality changed to ${quality}%`);
     });
 
+    // 모니터 선택 (해당 모니터 스트림으로 다시 연결)
+    elements.monitorSelect.addEventListener('change', (e) => {
+        screenRenderer.clear();
+        wsClient.reconnect(buildWebSocketUrl(e.target.value));
+        updateConnectionStatus('connecting', 'Connecting...');
+    });
+
+    // 표시 영역이 바뀌면 서버에 알림 (해상도 단계 재선택)
+    window.addEventListener('resize', scheduleViewportReport);
+    // 캔버스 표시 크기가 바뀌면 커서 오버레이 위치도 다시 계산
+    window.addEventListener('resize', () => screenRenderer.positionCursor());
+
     // ESC 키로 전체화면 종료
     document.addEventListener('fullscreenchange', () => {
         if (!document.fullscreenElement) {
             console.log('Exited fullscreen');
         }
+        scheduleViewportReport();
     });
 }
 
+async function loadMonitors() {
+    try {
+        const response = await fetch('/monitors');
+        const { monitors } = await response.json();
+        // 모니터 선택을 쓸 수 없는 모드(appium)는 빈 목록
+        elements.monitorSelect.disabled = monitors.length === 0;
+        for (const monitor of monitors) {
+            const option = document.createElement('option');
+            option.value = monitor.index;
+            const name = monitor.virtual ? 'All monitors' : `Monitor ${monitor.index}`;
+            option.textContent = `${name} (${monitor.width}x${monitor.height})`;
+            elements.monitorSelect.appendChild(option);
+        }
+    } catch (e) {
+        console.error('Failed to load monitors:', e);
+    }
+}
+
 function toggleFullscreen() {
     if (!document.fullscreenElement) {
         elements.canvas.requestFullscreen().catch(err => {
@@ -199,8 +301,47 @@ function updateConnectionStatus(status, message) {
 }
 
 function updateStats() {
-    elements.fpsCounter.textContent = `${screenRenderer.getFPS()} FPS`;
+    elements.fpsCounter.textContent = screenRenderer.isIdle() ? 'Idle' : `${screenRenderer.getFPS()} FPS`;
     elements.resolution.textContent = screenRenderer.getResolution();
+
+    // 프레임도 하트비트도 오지 않으면 연결이 멈춘 것으로 표시
+    if (wsClient.isConnected()) {
+        if (screenRenderer.getSilenceMs() > STALL_TIMEOUT_MS) {
+            updateConnectionStatus('error', 'No data');
+        } else {
+            updateConnectionStatus('connected', 'Connected');
+        }
+    }
+}
+
+function updateLatency(stats) {
+    // 캡처부터 화면 표시까지 (서버 집계, 최근 샘플 기준)
+    elements.latency.textContent = stats.samples
+        ? `${Math.round(stats.p50)}/${Math.round(stats.p90)}/${Math.round(stats.p99)} ms`
+        : '-';
+    elements.latency.title = 'Capture-to-paint p50/p90/p99\n' + Object.entries(stats.stages)
+        .map(([stage, ms]) => `${stage}: ${ms} ms`)
+        .join('\n');
+}
+
+function reportClientStats() {
+    const decodeMs = screenRenderer.getDecodeTime();
+    if (decodeMs === null || !wsClient.isConnected()) return;
+    wsClient.send({
+        type: 'client_stats',
+        decode_ms: Math.round(decodeMs * 10) / 10
+    });
+}
+
+function reportViewport() {
+    const { width, height } = screenRenderer.getViewportSize();
+    if (!width || !height || !wsClient.isConnected()) return;
+    wsClient.send({ type: 'viewport', width, height });
+}
+
+function scheduleViewportReport() {
+    clearTimeout(viewportTimer);
+    viewportTimer = setTimeout(reportViewport, 250);
 }
 
 function showLoading() {
@@ -259,6 +400,9 @@ window.addEventListener('beforeunload', () => {
     if (fpsUpdateInterval) {
         clearInterval(fpsUpdateInterval);
     }
+    if (clientStatsInterval) {
+        clearInterval(clientStatsInterval);
+    }
     if (wsClient) {
         wsClient.disconnect();
     }
@@ -1,6 +1,37 @@
 /**
  * Web Player - 화면 렌더러
  */
+
+// 바이너리 프레임 헤더 (src/server/frame_protocol.py 와 동일)
+const FRAME_HEADER_SIZE = 20;
+const FRAME_PROTOCOL_VERSION = 1;
+const FRAME_KIND_FULL = 1;
+const FRAME_KIND_TILES = 2;
+const FRAME_KIND_HEARTBEAT = 3;
+const FRAME_KIND_VIDEO = 4;
+const FRAME_FLAG_KEYFRAME = 0x01;
+const TILE_HEADER_SIZE = 12;
+const FRAME_CODEC_MIME = {
+    1: 'image/jpeg',
+    2: 'image/png',
+    3: 'image/webp'
+};
+const FRAME_CODEC_H264 = 4;
+const FRAME_CODEC_VP8 = 5;
+
+/**
+ * H.264 Annex B 키프레임의 SPS에서 WebCodecs 코덱 문자열 생성 (예: avc1.42E01F)
+ */
+function avcCodecString(data) {
+    for (let i = 0; i + 4 < data.length; i++) {
+        if (data[i] === 0 && data[i + 1] === 0 && data[i + 2] === 1 && (data[i + 3] & 0x1f) === 7) {
+            const hex = (b) => b.toString(16).padStart(2, '0').toUpperCase();
+            return `avc1.${hex(data[i + 4])}${hex(data[i + 5])}${hex(data[i + 6])}`;
+        }
+    }
+    return 'avc1.42E01F';
+}
+
 class ScreenRenderer {
     constructor(canvasId) {
         this.canvas = document.getElementById(canvasId);
@@ -12,38 +43,396 @@ class ScreenRenderer {
         this.frameCount = 0;
         this.fpsHistory = [];
         this.maxFpsHistory = 10;
+        this.lastFrameId = 0;
+        // 델타 타일은 순서대로 적용해야 하므로 바이너리 프레임 렌더링을 직렬화
+        this.renderChain = Promise.resolve();
+        // 평균 디코딩+그리기 시간 (서버 적응 제어에 보고)
+        this.decodeMs = null;
+        this.hasKeyframe = false;
+        this.keyframeRequested = false;
+        this.onKeyframeNeeded = null;
+        // 마지막 프레임/하트비트 수신 시각 (화면 변화가 없으면 서버는 하트비트만 보냄)
+        this.lastFrameAt = 0;
+        this.lastHeartbeatAt = 0;
+        // 비디오 코덱 모드 (WebCodecs)
+        this.videoDecoder = null;
+        this.videoFramesDecoded = 0;
+        this.videoDecodeStarts = new Map();
+        this.onVideoUnsupported = null;
+        // 프레임을 그릴 때마다 호출 (frameId, 디코딩+그리기 ms) → 서버에 frame_ack
+        this.onFramePainted = null;
+        // 원격 커서 (프레임과 별도 채널, 캔버스 위 오버레이로 그림)
+        this.cursor = { x: 0, y: 0, visible: false, hotX: 0, hotY: 0 };
+        this.cursorOverlay = this.createCursorOverlay();
+    }
+
+    /**
+     * 캔버스 위에 겹치는 커서 오버레이 (포인터 이벤트는 캔버스로 통과)
+     */
+    createCursorOverlay() {
+        const overlay = document.createElement('canvas');
+        overlay.className = 'cursor-overlay';
+        (this.canvas.parentElement || document.body).appendChild(overlay);
+        this.drawDefaultCursor(overlay);
+        return overlay;
+    }
+
+    /**
+     * 서버가 커서 모양을 보내지 않는 환경용 기본 화살표
+     */
+    drawDefaultCursor(overlay) {
+        overlay.width = 12;
+        overlay.height = 19;
+        const ctx = overlay.getContext('2d');
+        ctx.beginPath();
+        ctx.moveTo(0.5, 0.5);
+        ctx.lineTo(0.5, 16.5);
+        ctx.lineTo(4.5, 12.5);
+        ctx.lineTo(7.5, 18.5);
+        ctx.lineTo(9.5, 17.5);
+        ctx.lineTo(6.5, 11.5);
+        ctx.lineTo(11.5, 11.5);
+        ctx.closePath();
+        ctx.fillStyle = '#fff';
+        ctx.fill();
+        ctx.strokeStyle = '#000';
+        ctx.stroke();
+        this.cursor.hotX = 0;
+        this.cursor.hotY = 0;
+    }
+
+    /**
+     * 커서 위치 갱신 ({type: 'cursor', x, y, visible}, 원격 화면 좌표)
+     */
+    updateCursor(data) {
+        this.cursor.x = data.x;
+        this.cursor.y = data.y;
+        this.cursor.visible = data.visible;
+        this.positionCursor();
+    }
+
+    /**
+     * 커서 모양 교체 ({type: 'cursor_shape', width, height, hot_x, hot_y, data: base64 PNG})
+     */
+    setCursorShape(data) {
+        const img = new Image();
+        img.onload = () => {
+            const overlay = this.cursorOverlay;
+            overlay.width = data.width;
+            overlay.height = data.height;
+            overlay.getContext('2d').drawImage(img, 0, 0);
+            this.cursor.hotX = data.hot_x;
+            this.cursor.hotY = data.hot_y;
+            this.positionCursor();
+        };
+        img.src = `data:image/png;base64,${data.data}`;
+    }
+
+    /**
+     * 원격 좌표를 화면에 표시된 캔버스 위치로 변환해 오버레이 이동
+     */
+    positionCursor() {
+        const overlay = this.cursorOverlay;
+        if (!this.cursor.visible || !this.remoteWidth || !this.remoteHeight) {
+            overlay.style.display = 'none';
+            return;
+        }
+        const rect = this.canvas.getBoundingClientRect();
+        const parentRect = overlay.parentElement.getBoundingClientRect();
+        const x = rect.left - parentRect.left + this.cursor.x * rect.width / this.remoteWidth - this.cursor.hotX;
+        const y = rect.top - parentRect.top + this.cursor.y * rect.height / this.remoteHeight - this.cursor.hotY;
+        overlay.style.transform = `translate(${Math.round(x)}px, ${Math.round(y)}px)`;
+        overlay.style.display = 'block';
+    }
+
+    /**
+     * WebCodecs 비디오 디코딩 지원 여부 (미지원이면 JPEG 스트림 사용)
+     */
+    static supportsVideo() {
+        return typeof VideoDecoder !== 'undefined' && typeof EncodedVideoChunk !== 'undefined';
     }
 
     renderFrame(frameData) {
         this.remoteWidth = frameData.width;
         this.remoteHeight = frameData.height;
 
+        const start = performance.now();
         const img = new Image();
         img.onload = () => {
-            // 캔버스 크기 조정 (최초 또는 해상도 변경 시)
-            if (this.canvas.width !== img.width || this.canvas.height !== img.height) {
-                this.canvas.width = img.width;
-                this.canvas.height = img.height;
-                console.log(`Canvas resized to ${img.width}x${img.height}`);
-            }
-
-            // 화면 그리기
-            this.ctx.drawImage(img, 0, 0);
-
-            // FPS 계산
-            this.calculateFPS();
-            this.frameCount++;
+            this.drawImage(img);
+            const ms = performance.now() - start;
+            this.recordDecodeTime(ms);
+            this.notifyPainted(frameData.frame_id, ms);
         };
 
         img.onerror = () => {
             console.error('Failed to load frame image');
         };
 
-        img.src = 'data:image/jpeg;base64,' + frameData.data;
+        img.src = `data:image/${frameData.format || 'jpeg'};base64,` + frameData.data;
+    }
+
+    parseFrameHeader(buffer) {
+        const view = new DataView(buffer);
+        return {
+            version: view.getUint8(0),
+            kind: view.getUint8(1),
+            codec: view.getUint8(2),
+            flags: view.getUint8(3),
+            frameId: view.getUint32(4, true),
+            timestamp: view.getFloat64(8, true),
+            width: view.getUint16(16, true),
+            height: view.getUint16(18, true)
+        };
+    }
+
+    renderBinaryFrame(data) {
+        this.renderChain = this.renderChain
+            .then(async () => {
+                const start = performance.now();
+                const paintedId = await this.decodeBinaryFrame(data);
+                const ms = performance.now() - start;
+                this.recordDecodeTime(ms);
+                this.notifyPainted(paintedId, ms);
+            })
+            .catch((e) => console.error('Failed to render binary frame:', e));
+        return this.renderChain;
+    }
+
+    recordDecodeTime(ms) {
+        this.decodeMs = this.decodeMs === null ? ms : this.decodeMs * 0.9 + ms * 0.1;
+    }
+
+    getDecodeTime() {
+        return this.decodeMs;
+    }
+
+    notifyPainted(frameId, ms) {
+        if (frameId && this.onFramePainted) {
+            this.onFramePainted(frameId, ms);
+        }
+    }
+
+    /**
+     * 바이너리 메시지 하나 처리
+     * @returns {Promise<number|null>} 화면에 그린 프레임 번호 (그리지 않았으면 null)
+     */
+    async decodeBinaryFrame(data) {
+        const buffer = data instanceof Blob ? await data.arrayBuffer() : data;
+        if (buffer.byteLength < FRAME_HEADER_SIZE) {
+            console.error('Binary frame too short');
+            return null;
+        }
+
+        const header = this.parseFrameHeader(buffer);
+        if (header.version !== FRAME_PROTOCOL_VERSION) {
+            console.error('Unsupported frame protocol version:', header.version);
+            return null;
+        }
+
+        if (header.kind === FRAME_KIND_HEARTBEAT) {
+            this.handleHeartbeat();
+            return null;
+        }
+
+        if (header.kind === FRAME_KIND_VIDEO) {
+            this.remoteWidth = header.width;
+            this.remoteHeight = header.height;
+            // 비디오 프레임은 디코더 출력 콜백에서 그린 뒤 알림
+            this.decodeVideo(header, new Uint8Array(buffer, FRAME_HEADER_SIZE));
+            return null;
+        }
+
+        const mime = FRAME_CODEC_MIME[header.codec] || 'image/jpeg';
+
+        if (header.kind === FRAME_KIND_TILES) {
+            // 기준 키프레임 없이 받은 델타는 적용할 수 없음
+            if (!this.hasKeyframe) {
+                this.requestKeyframe();
+                return null;
+            }
+            await this.drawTiles(buffer, mime);
+            this.lastFrameId = header.frameId;
+            this.calculateFPS();
+            this.frameCount++;
+            return header.frameId;
+        }
+
+        this.remoteWidth = header.width;
+        this.remoteHeight = header.height;
+
+        const blob = new Blob([new Uint8Array(buffer, FRAME_HEADER_SIZE)], { type: mime });
+        const bitmap = await createImageBitmap(blob);
+        let paintedId = null;
+        if (header.frameId > this.lastFrameId || (header.flags & FRAME_FLAG_KEYFRAME)) {
+            this.lastFrameId = header.frameId;
+            this.hasKeyframe = true;
+            this.keyframeRequested = false;
+            this.drawImage(bitmap);
+            paintedId = header.frameId;
+        }
+        bitmap.close();
+        return paintedId;
+    }
+
+    requestKeyframe() {
+        if (!this.keyframeRequested && this.onKeyframeNeeded) {
+            this.keyframeRequested = true;
+            this.onKeyframeNeeded();
+        }
+    }
+
+    decodeVideo(header, data) {
+        const isKey = (header.flags & FRAME_FLAG_KEYFRAME) !== 0;
+
+        // 디코더는 키프레임에서 (다시) 시작해야 함
+        if (!this.videoDecoder) {
+            if (!isKey) {
+                this.requestKeyframe();
+                return;
+            }
+            this.videoDecoder = this.createVideoDecoder(
+                header.codec === FRAME_CODEC_VP8 ? 'vp8' : avcCodecString(data)
+            );
+            if (!this.videoDecoder) return;
+        }
+        if (isKey) {
+            this.hasKeyframe = true;
+            this.keyframeRequested = false;
+        }
+
+        // 청크 timestamp에 프레임 번호를 실어 디코더 출력에서 frame_ack에 사용
+        this.videoDecodeStarts.set(header.frameId, performance.now());
+        this.videoDecoder.decode(new EncodedVideoChunk({
+            type: isKey ? 'key' : 'delta',
+            timestamp: header.frameId,
+            data
+        }));
+        this.lastFrameId = header.frameId;
+    }
+
+    createVideoDecoder(codec) {
+        try {
+            const decoder = new VideoDecoder({
+                output: (frame) => {
+                    this.videoFramesDecoded++;
+                    this.drawImage(frame);
+                    const frameId = frame.timestamp;
+                    const start = this.videoDecodeStarts.get(frameId);
+                    // 출력되지 않은 이전 청크 정리
+                    for (const id of this.videoDecodeStarts.keys()) {
+                        if (id > frameId) break;
+                        this.videoDecodeStarts.delete(id);
+                    }
+                    frame.close();
+                    if (start !== undefined) {
+                        this.notifyPainted(frameId, performance.now() - start);
+                    }
+                },
+                error: (e) => this.handleVideoError(e)
+            });
+            decoder.configure({ codec, optimizeForLatency: true });
+            console.log(`Video decoder configured: ${codec}`);
+            return decoder;
+        } catch (e) {
+            this.handleVideoError(e);
+            return null;
+        }
+    }
+
+    handleVideoError(e) {
+        console.error('Video decode error:', e);
+        const decodedAny = this.videoFramesDecoded > 0;
+        this.resetVideoDecoder();
+        this.hasKeyframe = false;
+        if (!decodedAny && this.onVideoUnsupported) {
+            // 한 프레임도 디코딩하지 못함: 코덱 미지원으로 보고 JPEG 스트림으로 전환
+            this.onVideoUnsupported();
+        } else {
+            this.requestKeyframe();
+        }
+    }
+
+    resetVideoDecoder() {
+        if (this.videoDecoder && this.videoDecoder.state !== 'closed') {
+            this.videoDecoder.close();
+        }
+        this.videoDecoder = null;
+        this.videoFramesDecoded = 0;
+        this.videoDecodeStarts.clear();
+    }
+
+    async drawTiles(buffer, mime) {
+        const view = new DataView(buffer, FRAME_HEADER_SIZE);
+        const count = view.getUint16(0, true);
+        let offset = 2;
+
+        // 모든 타일을 먼저 디코딩한 뒤 한 번에 그려 부분 갱신이 보이지 않게 함
+        const pending = [];
+        for (let i = 0; i < count; i++) {
+            const x = view.getUint16(offset, true);
+            const y = view.getUint16(offset + 2, true);
+            const length = view.getUint32(offset + 8, true);
+            offset += TILE_HEADER_SIZE;
+
+            const bytes = new Uint8Array(buffer, FRAME_HEADER_SIZE + offset, length);
+            offset += length;
+            pending.push(
+                createImageBitmap(new Blob([bytes], { type: mime }))
+                    .then((bitmap) => ({ x, y, bitmap }))
+            );
+        }
+
+        const tiles = await Promise.all(pending);
+        for (const { x, y, bitmap } of tiles) {
+            this.ctx.drawImage(bitmap, x, y);
+            bitmap.close();
+        }
+    }
+
+    drawImage(img) {
+        // VideoFrame은 width/height 대신 displayWidth/displayHeight를 가짐
+        const width = img.displayWidth || img.width;
+        const height = img.displayHeight || img.height;
+
+        // 캔버스 크기 조정 (최초 또는 해상도 변경 시)
+        if (this.canvas.width !== width || this.canvas.height !== height) {
+            this.canvas.width = width;
+            this.canvas.height = height;
+            console.log(`Canvas resized to ${width}x${height}`);
+            this.positionCursor();
+        }
+
+        // 화면 그리기
+        this.ctx.drawImage(img, 0, 0);
+
+        // FPS 계산
+        this.calculateFPS();
+        this.frameCount++;
+    }
+
+    handleHeartbeat() {
+        this.lastHeartbeatAt = performance.now();
+    }
+
+    /**
+     * 화면 변화가 없어 하트비트만 받고 있는지
+     */
+    isIdle() {
+        return this.lastHeartbeatAt > this.lastFrameAt;
+    }
+
+    /**
+     * 마지막 프레임 또는 하트비트 이후 경과 시간 (ms)
+     */
+    getSilenceMs() {
+        const last = Math.max(this.lastFrameAt, this.lastHeartbeatAt);
+        return last ? performance.now() - last : 0;
     }
 
     calculateFPS() {
         const now = performance.now();
+        this.lastFrameAt = now;
         if (this.lastFrameTime) {
             const delta = now - this.lastFrameTime;
             const instantFps = 1000 / delta;
@@ -101,6 +490,19 @@ class ScreenRenderer {
         }, 200);
     }
 
+    /**
+     * 화면이 표시되는 영역 크기 (기기 픽셀)
+     * 서버는 이 크기를 채우는 해상도 단계로 인코딩한다.
+     */
+    getViewportSize() {
+        const container = this.canvas.parentElement || this.canvas;
+        const dpr = window.devicePixelRatio || 1;
+        return {
+            width: Math.round(container.clientWidth * dpr),
+            height: Math.round(container.clientHeight * dpr)
+        };
+    }
+
     getFPS() {
         return this.fps;
     }
@@ -121,5 +523,15 @@ class ScreenRenderer {
         this.frameCount = 0;
         this.fps = 0;
         this.fpsHistory = [];
+        this.lastFrameId = 0;
+        this.hasKeyframe = false;
+        this.keyframeRequested = false;
+        this.lastFrameAt = 0;
+        this.lastHeartbeatAt = 0;
+        this.decodeMs = null;
+        this.resetVideoDecoder();
+        this.cursor.visible = false;
+        this.drawDefaultCursor(this.cursorOverlay);
+        this.positionCursor();
     }
 }
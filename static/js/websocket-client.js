@@ -12,6 +12,7 @@ class WebSocketClient {
         this.callbacks = {
             onOpen: null,
             onMessage: null,
+            onBinary: null,
             onError: null,
             onClose: null
         };
@@ -25,7 +26,9 @@ class WebSocketClient {
 
         console.log(`Connecting to ${this.url}`);
         this.isManualClose = false;
-        this.ws = new WebSocket(this.url);
+        const ws = new WebSocket(this.url);
+        ws.binaryType = 'arraybuffer';
+        this.ws = ws;
 
         this.ws.onopen = (event) => {
             console.log('WebSocket connected');
@@ -36,6 +39,13 @@ class WebSocketClient {
         };
 
         this.ws.onmessage = (event) => {
+            // 바이너리 프레임은 파싱 없이 그대로 전달
+            if (event.data instanceof ArrayBuffer || event.data instanceof Blob) {
+                if (this.callbacks.onBinary) {
+                    this.callbacks.onBinary(event.data);
+                }
+                return;
+            }
             try {
                 const data = JSON.parse(event.data);
                 if (this.callbacks.onMessage) {
@@ -55,6 +65,8 @@ class WebSocketClient {
 
         this.ws.onclose = (event) => {
             console.log('WebSocket closed:', event.code, event.reason);
+            // 다른 URL로 다시 연결한 경우 이전 소켓의 종료는 무시
+            if (this.ws !== null && this.ws !== ws) return;
             if (this.callbacks.onClose) {
                 this.callbacks.onClose(event);
             }
@@ -74,6 +86,16 @@ class WebSocketClient {
         }
     }
 
+    /**
+     * 다른 URL로 다시 연결 (예: 모니터 변경)
+     */
+    reconnect(url) {
+        this.disconnect();
+        this.url = url;
+        this.reconnectAttempts = 0;
+        this.connect();
+    }
+
     send(data) {
         if (this.ws && this.ws.readyState === WebSocket.OPEN) {
             this.ws.send(JSON.stringify(data));
@@ -84,6 +106,20 @@ class WebSocketClient {
         }
     }
 
+    /**
+     * 여러 액션을 매크로 하나로 전송 (서버가 한 번에 검증하고 연달아 실행)
+     * @param {Array<Object>} actions - {action_type, ..., delay_ms} 목록
+     * @param {Object} options - {id, stop_on_error}
+     */
+    sendActionBatch(actions, options = {}) {
+        return this.send({
+            type: 'action_batch',
+            id: options.id,
+            stop_on_error: options.stop_on_error !== false,
+            actions
+        });
+    }
+
     attemptReconnect() {
         if (this.reconnectAttempts >= this.maxReconnectAttempts) {
             console.error('Max reconnection attempts reached');
@@ -105,6 +141,7 @@ class WebSocketClient {
         const eventMap = {
             'open': 'onOpen',
             'message': 'onMessage',
+            'binary': 'onBinary',
             'error': 'onError',
             'close': 'onClose'
         };
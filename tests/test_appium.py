@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Web Player - Appium 제어 모드 테스트
+로컬 스텁 WebDriver/MJPEG 서버로 세션 재사용, keep-alive 연결, W3C Actions 묶음, JPEG 전달, 회전을 확인
+"""
+import asyncio
+import base64
+import io
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.action_handler import ActionHandler  # noqa: E402
+from src.server.appium_client import AppiumSession  # noqa: E402
+from src.server import appium_controller  # noqa: E402
+from src.server.appium_controller import (  # noqa: E402
+    AppiumBackend, MjpegCaptureWorker, ScreenshotCaptureWorker, create_appium_pipeline
+)
+from src.server.config import settings  # noqa: E402
+from src.server.mjpeg_stream import MjpegReader  # noqa: E402
+from src.server.models import ActionBatchRequest, ActionRequest  # noqa: E402
+from src.server.screen_controller import ScreenController  # noqa: E402
+
+# 스크린샷은 뷰포트의 2배 (iOS 레티나처럼 픽셀 ≠ 포인트)
+SCREEN_SIZE = (200, 400)
+VIEWPORT = (100, 200)
+
+
+class StubWebDriver(BaseHTTPRequestHandler):
+    """요청을 기록하고 최소한의 W3C 응답을 돌려주는 스텁 Appium 서버"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        server.log.append((method, self.path, body, self.client_address[1]))
+
+        status, value = 200, None
+        if method == "POST" and self.path == "/session":
+            server.sessions += 1
+            value = {"sessionId": f"s{server.sessions}", "capabilities": body["capabilities"]["alwaysMatch"]}
+        elif not self.path.startswith(f"/session/s{server.sessions}"):
+            status, value = 404, {"error": "invalid session id", "message": "session not found"}
+        elif self.path.endswith("/window/rect"):
+            value = {"x": 0, "y": 0, "width": server.viewport[0], "height": server.viewport[1]}
+        elif self.path.endswith("/screenshot"):
+            output = io.BytesIO()
+            Image.new("RGB", SCREEN_SIZE, (10, 20, 30)).save(output, format="PNG")
+            value = base64.b64encode(output.getvalue()).decode()
+
+        data = json.dumps({"value": value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubMjpeg(BaseHTTPRequestHandler):
+    """같은 JPEG을 multipart/x-mixed-replace로 계속 보내는 스텁 MJPEG 서버"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+        self.end_headers()
+        try:
+            while True:
+                self.wfile.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    + f"Content-Length: {len(self.server.jpeg)}\r\n\r\n".encode()
+                    + self.server.jpeg + b"\r\n"
+                )
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+
+def make_jpeg(size=SCREEN_SIZE) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", size, (10, 20, 30)).save(output, format="JPEG", quality=70)
+    return output.getvalue()
+
+
+@pytest.fixture
+def mjpeg():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubMjpeg)
+    server.daemon_threads = True
+    server.jpeg = make_jpeg()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def driver():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebDriver)
+    server.log = []
+    server.sessions = 0
+    server.viewport = VIEWPORT
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session(driver):
+    session = AppiumSession(f"http://127.0.0.1:{driver.server_port}", {"platformName": "Android"})
+    yield session
+    session.quit()
+
+
+def make_handler(session: AppiumSession) -> ActionHandler:
+    backend = AppiumBackend(session, viewport=VIEWPORT, scale=(0.5, 0.5))
+    return ActionHandler(*SCREEN_SIZE, backend=backend)
+
+
+def actions_requests(driver) -> list:
+    return [body["actions"] for method, path, body, _ in driver.log if path.endswith("/actions")]
+
+
+def test_session_and_connection_reused(driver, session):
+    """세션 하나와 keep-alive 연결 하나로 여러 명령 처리"""
+    for _ in range(3):
+        session.window_rect()
+    session.screenshot()
+
+    assert driver.sessions == 1
+    assert session.pool.connections_opened == 1
+    assert len({port for *_, port in driver.log}) == 1
+
+
+def test_lost_session_recreated(driver, session):
+    """세션이 없어지면 새 세션을 만들어 재시도"""
+    session.window_rect()
+    driver.sessions += 1  # 서버 쪽에서 세션 만료 (현재 세션 ID가 s2가 됨)
+
+    assert session.window_rect()["width"] == VIEWPORT[0]
+    assert session.session_id == "s3"
+    assert session.sessions_created == 2
+
+
+def test_tap_is_one_actions_request(driver, session):
+    """탭 하나가 /actions 요청 하나, 좌표는 뷰포트 단위"""
+    handler = make_handler(session)
+    response = asyncio.run(handler.process_action(ActionRequest(action_type="click", x=100, y=200)))
+    handler.worker.stop()
+
+    assert response.status == "success"
+    requests = actions_requests(driver)
+    assert len(requests) == 1
+    (pointer,) = requests[0]
+    assert pointer["parameters"]["pointerType"] == "touch"
+    assert [a["type"] for a in pointer["actions"]] == ["pointerMove", "pointerDown", "pause", "pointerUp"]
+    assert (pointer["actions"][0]["x"], pointer["actions"][0]["y"]) == (50, 100)
+
+
+def test_batch_is_one_actions_request(driver, session):
+    """매크로의 탭, 입력, 스와이프, 대기가 /actions 요청 하나로 순서대로"""
+    handler = make_handler(session)
+    batch = ActionBatchRequest(actions=[
+        {"action_type": "click", "x": 20, "y": 40, "delay_ms": 300},
+        {"action_type": "type", "text": "hi"},
+        {"action_type": "hotkey", "key": "enter"},
+        {"action_type": "drag", "start_x": 100, "start_y": 300, "end_x": 100, "end_y": 100},
+    ])
+    response = asyncio.run(handler.process_batch(batch))
+    handler.worker.stop()
+
+    assert response.status == "success"
+    requests = actions_requests(driver)
+    assert len(requests) == 1
+    pointer, keys = requests[0]
+    assert len(pointer["actions"]) == len(keys["actions"])
+    assert {"type": "pause", "duration": 300} in pointer["actions"]
+    typed = [a["value"] for a in keys["actions"] if a["type"] == "keyDown"]
+    assert typed == ["h", "i", "\ue007"]  # Enter
+    # 키 입력은 탭 뒤, 스와이프 앞에서 실행
+    ticks = list(zip(pointer["actions"], keys["actions"]))
+    first_key = next(i for i, (_, k) in enumerate(ticks) if k["type"] == "keyDown")
+    downs = [i for i, (p, _) in enumerate(ticks) if p["type"] == "pointerDown"]
+    assert downs[0] < first_key < downs[1]
+
+
+def test_batch_step_error_stops(driver, session):
+    """알 수 없는 키가 있는 매크로는 stop_on_error로 멈추고, 쌓은 단계는 보냄"""
+    handler = make_handler(session)
+    batch = ActionBatchRequest(actions=[
+        {"action_type": "click", "x": 20, "y": 40},
+        {"action_type": "hotkey", "key": "nosuchkey"},
+        {"action_type": "click", "x": 30, "y": 40},
+    ])
+    response = asyncio.run(handler.process_batch(batch))
+    handler.worker.stop()
+
+    assert [r.status for r in response.results] == ["success", "error", "skipped"]
+    assert len(actions_requests(driver)) == 1
+
+
+def test_screenshot_capture_frame(driver, session):
+    """스크린샷 캡처 워커가 BGRX 프레임을 게시"""
+    worker = ScreenshotCaptureWorker(session, fps=5, width=SCREEN_SIZE[0], height=SCREEN_SIZE[1])
+    try:
+        raw = worker.wait_for_frame(0, timeout=5.0)
+    finally:
+        worker.stop()
+
+    assert raw is not None
+    assert (raw.width, raw.height) == SCREEN_SIZE
+    assert raw.shot.raw[:3] == bytes((30, 20, 10))
+
+
+def test_mjpeg_frames_passed_through(driver, session, mjpeg):
+    """MJPEG 프레임은 디코딩/재인코딩 없이 같은 JPEG 바이트로 전달"""
+    reader = MjpegReader(f"http://127.0.0.1:{mjpeg.server_port}/")
+    worker = MjpegCaptureWorker(reader, session, fps=5, width=SCREEN_SIZE[0], height=SCREEN_SIZE[1])
+    screen = ScreenController(capture=worker)
+    try:
+        frame = asyncio.run(screen.get_frame(max_age_ms=0))
+    finally:
+        screen.shutdown()
+
+    assert base64.b64decode(frame.data) == mjpeg.jpeg
+    assert (frame.width, frame.height) == SCREEN_SIZE
+    assert screen.passthrough_frames == 1
+    assert worker.latest.shot._raw is None  # 픽셀로 디코딩하지 않음
+    assert not [path for _, path, *_ in driver.log if path.endswith("/screenshot")]
+
+
+def test_pipeline_prefers_mjpeg(driver, session, mjpeg, monkeypatch):
+    """MJPEG 스트림이 있으면 그 프레임 크기로 파이프라인 구성"""
+    monkeypatch.setattr(settings, "appium_mjpeg_url", f"http://127.0.0.1:{mjpeg.server_port}/")
+    screen, handler = create_appium_pipeline(session)
+    handler.worker.stop()
+
+    assert isinstance(screen._capture, MjpegCaptureWorker)
+    assert (screen.screen_width, screen.screen_height) == SCREEN_SIZE
+    assert handler.backend.scale == (0.5, 0.5)
+
+
+def test_pipeline_falls_back_to_screenshot(driver, session, monkeypatch):
+    """MJPEG 서버에 연결할 수 없으면 /screenshot 폴링"""
+    monkeypatch.setattr(settings, "appium_mjpeg_url", "http://127.0.0.1:9/")
+    monkeypatch.setattr(appium_controller, "MJPEG_PROBE_TIMEOUT", 0.5)
+    screen, handler = create_appium_pipeline(session)
+    handler.worker.stop()
+
+    assert isinstance(screen._capture, ScreenshotCaptureWorker)
+    assert (screen.screen_width, screen.screen_height) == SCREEN_SIZE
+
+
+def test_rotation_updates_geometry(driver, session, mjpeg, monkeypatch):
+    """기기 회전으로 프레임 크기가 바뀌면 화면 크기, 액션 범위, 좌표 배율을 새 크기로 갱신"""
+    monkeypatch.setattr(settings, "appium_mjpeg_url", f"http://127.0.0.1:{mjpeg.server_port}/")
+    screen, handler = create_appium_pipeline(session)
+    rotated = SCREEN_SIZE[::-1]
+
+    async def rotate():
+        frame = await screen.get_frame(max_age_ms=0)
+        assert (frame.width, frame.height) == SCREEN_SIZE
+        driver.viewport = VIEWPORT[::-1]
+        mjpeg.jpeg = make_jpeg(rotated)
+        deadline = time.monotonic() + 5.0
+        while (frame.width, frame.height) != rotated and time.monotonic() < deadline:
+            frame = await screen.get_frame(max_age_ms=0)
+        # 회전 전 화면 밖이던 좌표
+        return frame, await handler.process_action(ActionRequest(action_type="click", x=390, y=20))
+
+    try:
+        frame, response = asyncio.run(rotate())
+    finally:
+        handler.worker.stop()
+        screen.shutdown()
+
+    assert (frame.width, frame.height) == rotated
+    assert (screen.screen_width, screen.screen_height) == rotated
+    assert (handler.screen_width, handler.screen_height) == rotated
+    assert handler.backend.viewport == VIEWPORT[::-1]
+    assert handler.backend.scale == (0.5, 0.5)
+    assert response.status == "success"
+    (pointer,) = actions_requests(driver)[-1]
+    assert (pointer["actions"][0]["x"], pointer["actions"][0]["y"]) == (195, 10)
@@ -62,9 +62,41 @@ async def test_screen_streaming():
         return False
 
 
+async def test_binary_screen_streaming():
+    """바이너리 프레임 스트리밍 테스트"""
+    print("\n=== Test 3: Binary Screen Streaming ===")
+    try:
+        from src.server.frame_protocol import HEADER, KIND_FRAME, unpack_header
+
+        async with websockets.connect("ws://localhost:8000/ws?transport=binary") as ws:
+            # 연결 상태 메시지 스킵
+            await ws.recv()
+
+            frame_count = 0
+            for _ in range(5):
+                response = await asyncio.wait_for(ws.recv(), timeout=2)
+                if not isinstance(response, bytes):
+                    continue
+
+                header = unpack_header(response)
+                assert header["kind"] == KIND_FRAME, f"Unexpected kind: {header}"
+                assert len(response) > HEADER.size, "Empty frame payload"
+                frame_count += 1
+                print(f"  Frame {header['frame_id']}: {header['width']}x{header['height']}, "
+                      f"{len(response) - HEADER.size} bytes")
+
+            assert frame_count >= 3, f"Expected at least 3 frames, got: {frame_count}"
+            print(f"✓ Binary streaming working ({frame_count} frames received)")
+            return True
+
+    except Exception as e:
+        print(f"✗ Binary streaming failed: {e}")
+        return False
+
+
 async def test_ai_command_without_api_key():
     """API 키 없이 AI 명령 테스트"""
-    print("\n=== Test 3: AI Command (without API key) ===")
+    print("\n=== Test 4: AI Command (without API key) ===")
     try:
         async with websockets.connect("ws://localhost:8000/ws") as ws:
             # 연결 상태 메시지 스킵
@@ -110,7 +142,7 @@ async def test_ai_command_without_api_key():
 
 async def test_direct_action():
     """직접 액션 테스트 (마우스 호버)"""
-    print("\n=== Test 4: Direct Action (Hover) ===")
+    print("\n=== Test 5: Direct Action (Hover) ===")
     try:
         async with websockets.connect("ws://localhost:8000/ws") as ws:
             # 연결 상태 메시지 스킵
@@ -152,6 +184,7 @@ async def run_all_tests():
 
     results.append(await test_websocket_connection())
     results.append(await test_screen_streaming())
+    results.append(await test_binary_screen_streaming())
     results.append(await test_ai_command_without_api_key())
     results.append(await test_direct_action())
 
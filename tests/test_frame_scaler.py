@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Web Player - 프레임 축소 테스트
+배율별 numpy 축소 결과, 버퍼 재사용, Pillow reduce()와의 차이를 확인
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.capture_worker import RawFrame  # noqa: E402
+from src.server.frame_scaler import FrameScaler, make_surface  # noqa: E402
+
+
+def make_raw(pixels: np.ndarray, frame_id: int = 1) -> RawFrame:
+    height, width = pixels.shape
+    shot = SimpleNamespace(raw=pixels.astype(np.uint32).tobytes(), width=width, height=height)
+    return RawFrame(frame_id=frame_id, width=width, height=height, shot=shot, captured_at=0.0, timestamp=0.0)
+
+
+def noise(width: int, height: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 2 ** 32, (height, width), dtype=np.uint32)
+
+
+def channels(pixels: np.ndarray) -> np.ndarray:
+    return pixels.view(np.uint8).reshape(pixels.shape + (4,)).astype(int)
+
+
+def test_three_quarter_pattern():
+    """75%: 4픽셀 묶음의 양 끝은 그대로, 가운데 두 픽셀은 평균 (나머지 가장자리는 버림)"""
+    pixels = np.arange(25, dtype=np.uint32).reshape(5, 5) * 2
+    surface = make_surface(make_raw(pixels), 0.75)
+    assert surface.pixels.tolist() == [[0, 3, 6], [15, 18, 21], [30, 33, 36]]
+
+
+@pytest.mark.parametrize("size", [(64, 48), (63, 47)])
+def test_half_matches_pillow_reduce(size):
+    """50%: 채널별 평균이 Pillow reduce(2)와 1 이내"""
+    width, height = size
+    pixels = noise(width, height)
+    surface = make_surface(make_raw(pixels), 0.5)
+    source = Image.frombuffer('RGBX', size, pixels, 'raw', 'RGBX', 0, 1)
+    expected = np.asarray(source.reduce(2)).astype(int)[:height // 2, :width // 2]
+
+    assert surface.pixels.shape == (height // 2, width // 2)
+    assert np.abs(channels(surface.pixels)[..., :3] - expected[..., :3]).max() <= 1
+
+
+def test_channels_do_not_carry():
+    """바이트별 평균이 이웃 채널로 넘치지 않음"""
+    pixels = np.full((6, 6), 0xFFFFFFFF, dtype=np.uint32)
+    pixels[:, 1::2] = 0x01FF01FF
+    for scale in (0.75, 0.5, 0.33):
+        result = channels(make_surface(make_raw(pixels), scale).pixels)
+        assert result.max() <= 0xFF and result.min() >= 0x01
+
+
+@pytest.mark.parametrize("scale", [0.75, 0.5, 0.33, 0.6])
+def test_scaler_reuses_buffers(scale):
+    """같은 배율/크기에서는 버퍼를 한 번만 할당하고 결과는 make_surface와 같음"""
+    scaler = FrameScaler()
+    surfaces = []
+    for seed in range(3):
+        pixels = noise(97, 61, seed)
+        surface = scaler.surface(make_raw(pixels, seed + 1), scale)
+        assert np.array_equal(surface.pixels, make_surface(make_raw(pixels), scale).pixels)
+        surfaces.append(surface.pixels)
+
+    assert scaler.allocations == 1
+    assert all(np.shares_memory(surfaces[0], other) for other in surfaces[1:])
+
+    scaler.surface(make_raw(noise(61, 97)), scale)  # 캡처 크기가 바뀌면 다시 할당
+    assert scaler.allocations == 2
+    scaler.retain(set())
+    scaler.surface(make_raw(noise(61, 97)), scale)
+    assert scaler.allocations == 3
+
+
+def test_tiny_frame():
+    """묶음보다 작은 프레임도 최소 1픽셀로 축소"""
+    surface = make_surface(make_raw(noise(3, 1)), 0.25)
+    assert surface.pixels.shape == (1, 1)
+    surface = make_surface(make_raw(noise(2, 2)), 0.33)
+    assert surface.pixels.shape == (1, 1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Web Player - 프레임 스케줄러 테스트
+시각(now)을 직접 넣어 절대 데드라인 유지, 놓친 데드라인 건너뛰기, FPS 변경, 지터 집계를 확인
+"""
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.frame_scheduler import FrameScheduler  # noqa: E402
+
+
+def test_late_frame_keeps_phase():
+    """한 간격 안에서 늦은 프레임은 다음 데드라인을 밀지 않음"""
+    scheduler = FrameScheduler(10)
+    scheduler.reset(now=100.0)
+    assert scheduler.time_until_due(now=100.0) == 0.0
+
+    scheduler.tick(now=100.0)
+    assert scheduler.time_until_due(now=100.0) == pytest.approx(0.1)
+
+    scheduler.tick(now=100.13)  # 30ms 늦음
+    assert scheduler.time_until_due(now=100.13) == pytest.approx(0.07)  # 데드라인은 100.2 그대로
+    assert scheduler.missed == 0
+
+
+def test_missed_deadlines_skipped():
+    """한 간격 이상 밀리면 놓친 데드라인을 건너뛰고 다음 격자 위치에서 다시 시작"""
+    scheduler = FrameScheduler(10)
+    scheduler.reset(now=0.0)
+    scheduler.tick(now=0.0)  # 다음 데드라인 0.1
+
+    scheduler.tick(now=0.35)  # 0.1, 0.2, 0.3 중 0.1에 시작한 것으로 보고 0.2, 0.3을 건너뜀
+    assert scheduler.missed == 2
+    assert scheduler.time_until_due(now=0.35) == pytest.approx(0.05)  # 다음 데드라인 0.4
+
+    scheduler.tick(now=0.4)
+    assert scheduler.missed == 2
+    assert scheduler.frames == 3
+
+
+def test_deadline_due_now_or_past():
+    """데드라인이 지나면 남은 시간은 0 이하"""
+    scheduler = FrameScheduler(20)
+    scheduler.reset(now=5.0)
+    scheduler.tick(now=5.0)
+    assert scheduler.time_until_due(now=5.05) == pytest.approx(0.0)
+    assert scheduler.time_until_due(now=5.07) < 0
+
+
+def test_fps_change_moves_next_deadline():
+    """FPS를 바꾸면 다음 데드라인은 마지막 데드라인 + 새 간격"""
+    scheduler = FrameScheduler(10)
+    scheduler.reset(now=0.0)
+    scheduler.tick(now=0.0)  # 다음 데드라인 0.1 (마지막 데드라인 0.0)
+
+    scheduler.fps = 4
+    assert scheduler.interval == pytest.approx(0.25)
+    assert scheduler.time_until_due(now=0.0) == pytest.approx(0.25)
+
+
+def test_reset_after_idle_is_not_jitter():
+    """유휴 후 reset()하면 쉰 시간을 지터나 놓친 데드라인으로 세지 않음"""
+    scheduler = FrameScheduler(10)
+    scheduler.reset(now=0.0)
+    scheduler.tick(now=0.0)
+
+    scheduler.reset(now=60.0)
+    scheduler.tick(now=60.0)
+    assert scheduler.missed == 0
+    assert scheduler.max_jitter_ms == 0.0
+    assert scheduler.actual_fps == 0.0  # 재개 전 프레임은 실제 FPS 계산에서 빠짐
+
+
+def test_jitter_histogram_and_rate():
+    """지터를 경계별로 집계하고 최근 프레임 간격으로 실제 FPS 계산"""
+    scheduler = FrameScheduler(10)
+    scheduler.reset(now=0.0)
+    for index, late_ms in enumerate([0.5, 3, 30, 0.2, 0.2]):
+        scheduler.tick(now=index * 0.1 + late_ms / 1000)
+
+    stats = scheduler.get_stats()
+    assert stats["frames"] == 5
+    assert stats["missed_deadlines"] == 0
+    assert stats["max_jitter_ms"] == pytest.approx(30)
+    histogram = stats["jitter_histogram"]
+    assert (histogram["<1ms"], histogram["<5ms"], histogram["<50ms"]) == (3, 1, 1)
+    assert sum(histogram.values()) == 5
+    assert stats["actual_fps"] == pytest.approx(10, rel=0.05)
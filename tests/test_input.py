@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Web Player - 입력 워커/액션 처리 테스트
+기록 전용 백엔드(RecordingBackend)로 실행 순서, 매크로, 호버/스크롤 합치기를 확인
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.action_handler import ActionHandler  # noqa: E402
+from src.server.input_backends import RecordingBackend  # noqa: E402
+from src.server.input_worker import InputWorker  # noqa: E402
+from src.server.models import ActionBatchRequest, ActionRequest  # noqa: E402
+
+SCREEN_SIZE = (1920, 1080)
+
+
+class ScriptedBackend(RecordingBackend):
+    """단계 사이 대기도 기록하고, "boom" 키 입력은 실패하는 기록 백엔드"""
+
+    def pause(self, seconds: float):
+        self._record("pause", seconds)
+
+    def press(self, key: str):
+        if key == "boom":
+            raise RuntimeError("boom")
+        super().press(key)
+
+
+@pytest.fixture
+def backend():
+    # 호출마다 지연을 두어 뒤따른 요청이 대기열에 쌓이게 함
+    return ScriptedBackend(delay_ms=50)
+
+
+@pytest.fixture
+def worker():
+    worker = InputWorker()
+    yield worker
+    worker.stop()
+
+
+def make_handler(backend, worker, offset_x: int = 0) -> ActionHandler:
+    return ActionHandler(*SCREEN_SIZE, offset_x=offset_x, worker=worker, backend=backend)
+
+
+async def submit_all(pairs):
+    """(핸들러, 액션)을 순서대로 대기열에 넣고 모두 기다림"""
+    return await asyncio.gather(*(handler.process_action(action) for handler, action in pairs))
+
+
+def test_hover_not_coalesced_across_handlers(backend, worker):
+    """다른 모니터 핸들러의 호버는 합치지 않고 각자의 원점으로 실행"""
+    primary = make_handler(backend, worker)
+    secondary = make_handler(backend, worker, offset_x=1920)
+    asyncio.run(submit_all([
+        (primary, ActionRequest(action_type="click", x=10, y=10)),
+        (primary, ActionRequest(action_type="hover", x=100, y=100)),
+        (secondary, ActionRequest(action_type="hover", x=200, y=200)),
+    ]))
+
+    assert backend.events == [
+        ("click", (10, 10, "left", 1)),
+        ("move", (100, 100)),
+        ("move", (2120, 200)),
+    ]
+    assert worker.coalesced == {}
+
+
+def test_mixed_actions_run_in_order(backend, worker):
+    """클릭 사이의 호버는 합치지 않고 도착 순서대로 실행"""
+    handler = make_handler(backend, worker, offset_x=100)
+    responses = asyncio.run(submit_all([
+        (handler, ActionRequest(action_type="click", x=1, y=1)),
+        (handler, ActionRequest(action_type="hover", x=2, y=2)),
+        (handler, ActionRequest(action_type="click", x=3, y=3)),
+        (handler, ActionRequest(action_type="hover", x=4, y=4)),
+        (handler, ActionRequest(action_type="right_click", x=5, y=5)),
+    ]))
+
+    assert [r.status for r in responses] == ["success"] * 5
+    assert backend.events == [
+        ("click", (101, 1, "left", 1)),
+        ("move", (102, 2)),
+        ("click", (103, 3, "left", 1)),
+        ("move", (104, 4)),
+        ("click", (105, 5, "right", 1)),
+    ]
+    assert worker.coalesced == {}
+
+
+def test_hover_and_scroll_coalesced(backend, worker):
+    """대기 중인 호버는 마지막 위치로, 스크롤은 방향을 부호로 양을 더해 한 번 실행"""
+    handler = make_handler(backend, worker)
+    responses = asyncio.run(submit_all([
+        (handler, ActionRequest(action_type="click", x=1, y=1)),
+        (handler, ActionRequest(action_type="hover", x=10, y=10)),
+        (handler, ActionRequest(action_type="hover", x=20, y=20)),
+        (handler, ActionRequest(action_type="hover", x=30, y=30)),
+        (handler, ActionRequest(action_type="scroll", direction="up", amount=1)),
+        (handler, ActionRequest(action_type="scroll", direction="up", amount=2)),
+        (handler, ActionRequest(action_type="scroll", direction="down", amount=1)),
+        (handler, ActionRequest(action_type="scroll", x=50, y=50, direction="down", amount=1)),
+    ]))
+
+    assert [r.status for r in responses] == ["success"] * 8
+    assert backend.events == [
+        ("click", (1, 1, "left", 1)),
+        ("move", (30, 30)),
+        ("scroll", (10, None, None)),  # 위로 2단계
+        ("scroll", (-5, 50, 50)),  # 위치 지정 여부가 달라 따로 실행
+    ]
+    assert worker.coalesced == {"hover": 2, "scroll": 2}
+
+
+def test_scroll_coalescing_respects_amount_limit(backend, worker):
+    """합친 스크롤 양이 모델 한도(MAX_SCROLL_AMOUNT)를 넘으면 따로 실행"""
+    handler = make_handler(backend, worker)
+    responses = asyncio.run(submit_all(
+        [(handler, ActionRequest(action_type="click", x=1, y=1))]
+        + [(handler, ActionRequest(action_type="scroll", direction="down", amount=40)) for _ in range(5)]
+    ))
+
+    assert [r.status for r in responses] == ["success"] * 6
+    assert backend.events[1:] == [  # 80, 80, 40단계
+        ("scroll", (-400, None, None)), ("scroll", (-400, None, None)), ("scroll", (-200, None, None))
+    ]
+    assert worker.coalesced == {"scroll": 2}
+
+
+def test_batch_order_and_delays(backend, worker):
+    """매크로 단계와 delay_ms가 순서대로, 뒤에 온 액션은 매크로가 끝난 뒤 실행"""
+    handler = make_handler(backend, worker)
+    batch = ActionBatchRequest(actions=[
+        {"action_type": "click", "x": 1, "y": 1, "delay_ms": 200},
+        {"action_type": "type", "text": "hi", "delay_ms": 100},
+        {"action_type": "hotkey", "key": "ctrl c", "delay_ms": 300},
+    ])
+
+    async def run():
+        return await asyncio.gather(
+            handler.process_batch(batch),
+            handler.process_action(ActionRequest(action_type="hover", x=9, y=9))
+        )
+
+    response, hover = asyncio.run(run())
+
+    assert response.status == "success"
+    assert (response.executed, response.failed, response.skipped) == (3, 0, 0)
+    assert hover.status == "success"
+    # 마지막 단계의 delay_ms는 기다리지 않음
+    assert backend.events == [
+        ("click", (1, 1, "left", 1)),
+        ("pause", (0.2,)),
+        ("type_text", ("hi",)),
+        ("pause", (0.1,)),
+        ("hotkey", ("ctrl", "c")),
+        ("move", (9, 9)),
+    ]
+
+
+def test_batch_stop_on_error(backend, worker):
+    """실패한 단계 이후는 skipped, 대기도 하지 않음"""
+    handler = make_handler(backend, worker)
+    batch = ActionBatchRequest(actions=[
+        {"action_type": "click", "x": 1, "y": 1, "delay_ms": 100},
+        {"action_type": "hotkey", "key": "boom", "delay_ms": 100},
+        {"action_type": "click", "x": 2, "y": 2},
+    ])
+    response = asyncio.run(handler.process_batch(batch))
+
+    assert response.status == "partial"
+    assert (response.executed, response.failed, response.skipped) == (1, 1, 1)
+    assert [r.status for r in response.results] == ["success", "error", "skipped"]
+    assert response.results[1].code == "EXECUTION_ERROR"
+    assert backend.events == [("click", (1, 1, "left", 1)), ("pause", (0.1,))]
+
+
+def test_batch_continue_on_error(backend, worker):
+    """stop_on_error=False면 실패한 단계만 error, 나머지는 실행"""
+    handler = make_handler(backend, worker)
+    batch = ActionBatchRequest(stop_on_error=False, actions=[
+        {"action_type": "hotkey", "key": "boom"},
+        {"action_type": "click", "x": 2, "y": 2},
+    ])
+    response = asyncio.run(handler.process_batch(batch))
+
+    assert response.status == "partial"
+    assert [r.status for r in response.results] == ["error", "success"]
+    assert backend.events == [("click", (2, 2, "left", 1))]
+
+
+def test_batch_validation_error_runs_nothing(backend, worker):
+    """검증에 실패한 단계가 있으면 아무 단계도 실행하지 않음"""
+    handler = make_handler(backend, worker)
+    batch = ActionBatchRequest(actions=[
+        {"action_type": "click", "x": 1, "y": 1},
+        {"action_type": "click", "x": 99999, "y": 1},
+    ])
+    response = asyncio.run(handler.process_batch(batch))
+
+    assert response.status == "error"
+    assert response.code == "INVALID_INPUT"
+    assert response.skipped == 2
+    assert backend.events == []
+
+
+def test_pointer_action_requires_coordinates(backend, worker):
+    """좌표 없는 클릭/호버는 실행하지 않고 INVALID_INPUT"""
+    handler = make_handler(backend, worker, offset_x=100)
+    responses = asyncio.run(submit_all([
+        (handler, ActionRequest(action_type="click")),
+        (handler, ActionRequest(action_type="right_click", x=5)),
+        (handler, ActionRequest(action_type="hover", y=5)),
+        (handler, ActionRequest(action_type="scroll", direction="down")),
+    ]))
+
+    assert [r.code for r in responses[:3]] == ["INVALID_INPUT"] * 3
+    assert "requires x and y" in responses[0].message
+    assert responses[3].status == "success"
+    assert backend.events == [("scroll", (-5, None, None))]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Web Player - 병렬 JPEG 인코딩 테스트
+띠로 나눠 인코딩해 재시작 마커로 이은 JPEG이 한 번에 인코딩한 것과 픽셀이 같은지 확인
+"""
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.encoders import create_encoder  # noqa: E402
+from src.server.frame_scaler import FrameSurface  # noqa: E402
+from src.server.parallel_encoder import ParallelEncoder, stitch_jpeg_bands  # noqa: E402
+
+QUALITY = 70
+WORKERS = 4
+
+
+def make_surface(width: int, height: int) -> FrameSurface:
+    """그라데이션 위에 노이즈 블록이 있는 화면 (띠 경계마다 내용이 다름)"""
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = ((x * 255 // width) | ((y * 255 // height) << 8) | (((x ^ y) & 0xFF) << 16)).astype(np.uint32)
+    rng = np.random.default_rng(width * height)
+    block = rng.integers(0, 2 ** 32, (min(64, height), min(64, width)), dtype=np.uint32)
+    pixels[:block.shape[0], :block.shape[1]] = block
+    pixels[-block.shape[0]:, -block.shape[1]:] = block
+    return FrameSurface(pixels=pixels, rawmode='BGRX', scale=1.0)
+
+
+def decode(data: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+@pytest.fixture(params=["JPEG", "TURBOJPEG"])
+def encoders(request):
+    single = create_encoder(request.param)
+    if single.name != request.param:
+        pytest.skip(f"{request.param} backend unavailable")
+    parallel = ParallelEncoder(request.param, workers=WORKERS, min_pixels=0)
+    yield parallel, single
+    parallel.close()
+
+
+@pytest.mark.parametrize("size", [(3840, 2160), (1920, 1080), (1366, 768), (1001, 999)])
+def test_band_stitched_jpeg_matches_single_encode(encoders, size):
+    """띠 병렬 인코딩 결과가 한 번에 인코딩한 JPEG과 디코딩 픽셀까지 같음"""
+    parallel, single = encoders
+    surface = make_surface(*size)
+    stitched = parallel.encode(surface, QUALITY)
+
+    assert parallel.parallel_frames == 1
+    assert parallel.bands_encoded == WORKERS
+    with Image.open(io.BytesIO(stitched)) as image:
+        assert image.size == size
+    assert np.array_equal(decode(stitched), decode(single.encode(surface, QUALITY)))
+
+
+def test_cropped_surface(encoders):
+    """원본 버퍼 위의 보기(행 간격이 너비보다 큼)도 띠로 나눠 같은 결과"""
+    parallel, single = encoders
+    surface = make_surface(1366, 1100).crop(17, 50, 1001, 999)
+    stitched = parallel.encode(surface, QUALITY)
+
+    assert parallel.parallel_frames == 1
+    assert np.array_equal(decode(stitched), decode(single.encode(surface, QUALITY)))
+
+
+def test_small_frame_not_split():
+    """min_pixels보다 작은 프레임은 한 번에 인코딩"""
+    parallel = ParallelEncoder("JPEG", workers=WORKERS, min_pixels=1000000)
+    try:
+        parallel.encode(make_surface(640, 480), QUALITY)
+    finally:
+        parallel.close()
+    assert parallel.parallel_frames == 0
+
+
+def test_bands_with_different_tables_rejected():
+    """품질(양자화 테이블)이 다른 띠는 이어 붙이지 않음"""
+    encoder = create_encoder("JPEG")
+    surface = make_surface(256, 64)
+    bands = [
+        encoder.encode(surface.crop(0, 0, 256, 32), QUALITY),
+        encoder.encode(surface.crop(0, 32, 256, 32), QUALITY - 20),
+    ]
+    with pytest.raises(ValueError, match="different tables"):
+        stitch_jpeg_bands(bands, 256, 64, 32)
+    with pytest.raises(ValueError, match="MCU height"):
+        stitch_jpeg_bands(bands[:1], 256, 64, 24)
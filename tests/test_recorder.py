@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Web Player - 세션 녹화/재생 테스트
+녹화 → 세그먼트 파일 → Recording 왕복, 세그먼트 교체, 키프레임 이분 탐색, 빈/잘린 세션 처리를 확인
+"""
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.capture_worker import RawFrame  # noqa: E402
+from src.server.frame_protocol import FLAG_KEYFRAME, unpack_header  # noqa: E402
+from src.server.recorder import RECORD_ACTION, RECORD_FRAME, Recording, SessionRecorder  # noqa: E402
+
+FRAME_SIZE = (64, 64)
+START = 1_700_000_000.0
+FRAMES = 12
+ACTION_AFTER = 5
+
+
+def make_frame(index: int) -> RawFrame:
+    """매 프레임 전체가 바뀌는 노이즈 화면 (모든 타일이 변경됨)"""
+    width, height = FRAME_SIZE
+    pixels = np.random.default_rng(index).integers(0, 256, (height, width, 4), dtype=np.uint8)
+    shot = SimpleNamespace(raw=pixels.tobytes(), width=width, height=height)
+    return RawFrame(
+        frame_id=index + 1,
+        width=width,
+        height=height,
+        shot=shot,
+        captured_at=1.0 + index,
+        timestamp=START + index
+    )
+
+
+@pytest.fixture
+def session(tmp_path):
+    """프레임 몇 장마다 세그먼트가 바뀌는 녹화 세션"""
+    recorder = SessionRecorder(
+        directory=str(tmp_path),
+        name="test",
+        fps=10,
+        quality=60,
+        segment_bytes=12 * 1024,
+        keyframe_interval=3600.0  # 키프레임은 세그먼트 시작에서만
+    )
+    recorder.start()
+    for index in range(FRAMES):
+        recorder.submit_frame(make_frame(index))
+        if index == ACTION_AFTER:
+            recorder.record_action({"action_type": "click", "x": 1, "y": 2})
+    recorder.stop()
+    assert recorder.frames_recorded == FRAMES
+    return tmp_path, recorder.session
+
+
+def keyframe_times(recording: Recording) -> list:
+    return [
+        recorded_at for kind, recorded_at, payload in recording.records(recording.start)
+        if kind == RECORD_FRAME and unpack_header(payload)["flags"] & FLAG_KEYFRAME
+    ]
+
+
+def test_round_trip_with_segment_rollover(session):
+    """녹화한 프레임/액션이 순서대로 읽히고, 세그먼트마다 키프레임으로 시작"""
+    directory, name = session
+    assert len(list((directory / name).glob("seg-*.dat"))) > 1
+
+    with Recording(str(directory), name) as recording:
+        records = list(recording.records(recording.start))
+        assert recording.start == START
+        assert recording.end == keyframe_times(recording)[-1]
+
+    frames = [(t, payload) for kind, t, payload in records if kind == RECORD_FRAME]
+    actions = [(t, json.loads(payload)) for kind, t, payload in records if kind == RECORD_ACTION]
+    assert [t for t, _ in frames] == [START + i for i in range(FRAMES)]
+    assert [unpack_header(payload)["frame_id"] for _, payload in frames] == list(range(1, FRAMES + 1))
+    assert [action for _, action in actions] == [{"action_type": "click", "x": 1, "y": 2}]
+    assert unpack_header(frames[0][1])["flags"] & FLAG_KEYFRAME
+
+
+def test_seek_starts_at_previous_keyframe(session):
+    """임의 시각은 그 이전의 가장 가까운 키프레임부터 재생"""
+    directory, name = session
+    with Recording(str(directory), name) as recording:
+        keys = keyframe_times(recording)
+        assert len(keys) > 1
+        for target in [START - 5, START, START + 0.5, keys[1], keys[1] + 0.5, START + FRAMES + 10]:
+            expected = max([t for t in keys if t <= target], default=keys[0])
+            kind, recorded_at, payload = next(recording.records(target))
+            assert kind == RECORD_FRAME
+            assert unpack_header(payload)["flags"] & FLAG_KEYFRAME
+            assert recorded_at == expected
+
+
+def test_time_at_validation(session, tmp_path):
+    """빈 세션과 잘못된 재생 시각은 재생 전에 ValueError"""
+    directory, name = session
+    with Recording(str(directory), name) as recording:
+        assert recording.time_at(2.5) == START + 2.5
+        for offset in [-1.0, float("nan"), float("inf")]:
+            with pytest.raises(ValueError):
+                recording.time_at(offset)
+
+    (tmp_path / "empty").mkdir()
+    with Recording(str(tmp_path), "empty") as recording:
+        with pytest.raises(ValueError, match="empty"):
+            recording.time_at(0)
+        with pytest.raises(ValueError, match="empty"):
+            recording.seek(START)
+
+    with pytest.raises(ValueError, match="not found"):
+        Recording(str(tmp_path), "../empty")
+
+
+def test_truncated_recording(session):
+    """기록 중 잘린 마지막 레코드와 색인 없는 세그먼트는 건너뛰고 재생"""
+    directory, name = session
+    segments = sorted((directory / name).glob("seg-*.dat"))
+    last = segments[-1]
+    with open(last, "r+b") as f:
+        f.truncate(last.stat().st_size - 10)
+    segments[0].with_suffix(".idx").unlink()
+
+    with Recording(str(directory), name) as recording:
+        records = list(recording.records(recording.start))
+
+    timestamps = [t for kind, t, _ in records if kind == RECORD_FRAME]
+    assert timestamps
+    assert timestamps == sorted(timestamps)
+    assert timestamps[0] > START  # 첫 세그먼트는 건너뜀
+    assert timestamps[-1] < START + FRAMES - 1  # 잘린 마지막 프레임은 빠짐
+
+
+def test_concurrent_sessions_do_not_share_files(tmp_path):
+    """같은 이름으로 동시에 시작한 기록기는 서로 다른 세션 디렉터리에 씀"""
+    recorders = [
+        SessionRecorder(directory=str(tmp_path), name="main", fps=10, quality=60, segment_bytes=1 << 20)
+        for _ in range(3)
+    ]
+    for recorder in recorders:
+        recorder.session = recorders[0].session  # 같은 ms에 만든 경우
+        recorder.start()
+    for offset, recorder in enumerate(recorders):
+        for index in range(3):
+            recorder.submit_frame(make_frame(index * 3 + offset))
+    for recorder in recorders:
+        recorder.stop()
+
+    sessions = [recorder.session for recorder in recorders]
+    assert len(set(sessions)) == 3
+    assert sessions[1] == f"{sessions[0]}-2"
+    for recorder in recorders:
+        with Recording(str(tmp_path), recorder.session) as recording:
+            frames = [t for kind, t, _ in recording.records(recording.start) if kind == RECORD_FRAME]
+        assert len(frames) == recorder.frames_recorded == 3
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Web Player - 타일 델타 테스트
+변경 타일 감지/사각형 병합, 대기 중인 델타에 새 델타를 이어 붙인 병합, 재동기화를 확인
+(클라이언트처럼 키프레임 위에 타일을 그려 복원한 화면을 원본 프레임과 비교)
+"""
+import io
+import os
+import sys
+import numpy as np
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server import broadcaster  # noqa: E402
+from src.server.broadcaster import StreamSubscriber  # noqa: E402
+from src.server.capture_worker import RawFrame  # noqa: E402
+from src.server.frame_protocol import (  # noqa: E402
+    CODEC_JPEG, HEADER, KIND_FRAME, KIND_TILES, EncodedFrame, merge_tile_messages, pack_frame, unpack_header,
+    unpack_tiles
+)
+from src.server.frame_scaler import FrameSurface  # noqa: E402
+from src.server.tile_encoder import TileDeltaEncoder  # noqa: E402
+
+WIDTH, HEIGHT = 250, 150  # 마지막 타일 열/행은 타일보다 작음
+TILE = 32
+
+
+def gray(level) -> np.ndarray:
+    """회색 BGRX 픽셀 (색차가 없어 JPEG 오차가 작음)"""
+    level = np.asarray(level, dtype=np.uint32)
+    return level | (level << 8) | (level << 16)
+
+
+class Stream:
+    """프레임을 바꿔 가며 키프레임/델타를 만드는 서버 쪽 절반 (회색 그라데이션 위에 회색 사각형)"""
+
+    def __init__(self):
+        self.tiles = TileDeltaEncoder(tile_size=TILE, keyframe_interval=3600.0)
+        y, x = np.mgrid[0:HEIGHT, 0:WIDTH]
+        self.pixels = gray((x + y) // 2)
+        self.frame_id = 0
+
+    def paint(self, x: int, y: int, w: int, h: int, level: int):
+        self.pixels[y:y + h, x:x + w] = gray(level)
+
+    def surface(self) -> FrameSurface:
+        return FrameSurface(pixels=self.pixels.copy(), rawmode='BGRX', scale=1.0)
+
+    def raw(self) -> RawFrame:
+        self.frame_id += 1
+        return RawFrame(self.frame_id, WIDTH, HEIGHT, None, captured_at=0.0, timestamp=float(self.frame_id))
+
+    def keyframe(self) -> bytes:
+        surface, raw = self.surface(), self.raw()
+        self.tiles.mark_keyframe(surface)
+        buffered = io.BytesIO()
+        surface.to_image().save(buffered, format='JPEG', quality=100)
+        return pack_frame(EncodedFrame(
+            frame_id=raw.frame_id, timestamp=raw.timestamp, width=WIDTH, height=HEIGHT,
+            codec=CODEC_JPEG, data=buffered.getvalue()
+        ))
+
+    def delta(self) -> bytes:
+        frame = self.tiles.encode_delta(self.raw(), self.surface(), 100)
+        assert frame is not None and frame.kind == KIND_TILES
+        return pack_frame(frame)
+
+    def expected(self) -> np.ndarray:
+        return np.asarray(self.surface().to_image())
+
+
+def decode(data: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def apply(canvas: np.ndarray, message: bytes) -> np.ndarray:
+    """클라이언트처럼 키프레임은 전체를, 타일은 순서대로 그 위치에 그림"""
+    header = unpack_header(message)
+    payload = message[HEADER.size:]
+    if header["kind"] == KIND_FRAME:
+        return decode(payload).copy()
+    for x, y, w, h, data in unpack_tiles(payload):
+        canvas[y:y + h, x:x + w] = decode(data)
+    return canvas
+
+
+def drain(subscriber: StreamSubscriber, canvas=None):
+    while subscriber.has_pending:
+        message, _ = subscriber.take()
+        canvas = apply(canvas, message)
+    return canvas
+
+
+def same_screen(canvas: np.ndarray, expected: np.ndarray) -> bool:
+    """JPEG 오차 이내로 같은 화면 (회색 화면은 색차 손실이 없어 픽셀당 1~2 이내)"""
+    return np.abs(canvas.astype(int) - expected).max() <= 2
+
+
+@pytest.fixture
+def stream():
+    return Stream()
+
+
+def test_changed_tiles_merged_into_rects(stream):
+    """같은 타일 행의 연속 변경 타일은 사각형 하나, 가장자리 타일은 잘린 크기"""
+    stream.keyframe()
+    stream.paint(40, 10, 60, 10, level=255)  # 타일 (0, 1..3)
+    stream.paint(240, 140, 10, 10, level=40)  # 오른쪽 아래 가장자리 타일 (26x22)
+    tiles = unpack_tiles(stream.delta()[HEADER.size:])
+
+    assert [tile[:4] for tile in tiles] == [(32, 0, 96, 32), (224, 128, 26, 22)]
+    assert stream.tiles.tiles_sent == 2
+
+
+def test_unchanged_and_mostly_changed_frames(stream):
+    """변경이 없으면 건너뛰고, 대부분 바뀌면 델타 대신 키프레임 요청"""
+    stream.keyframe()
+    assert stream.tiles.encode_delta(stream.raw(), stream.surface(), 100) is None
+    assert stream.tiles.skipped_frames == 1
+    assert not stream.tiles.needs_keyframe(stream.surface())
+
+    stream.paint(0, 0, WIDTH, HEIGHT - 40, level=255)
+    assert stream.tiles.encode_delta(stream.raw(), stream.surface(), 100) is None
+    assert stream.tiles.needs_keyframe(stream.surface())
+
+
+def test_deltas_restore_screen(stream):
+    """키프레임 뒤 델타를 차례로 적용하면 변경 타일만 바뀌고 마지막 화면과 같음 (JPEG 오차 이내)"""
+    canvas = apply(None, stream.keyframe())
+    before = canvas.copy()
+    for level, rect in zip((60, 120, 220), [(0, 0, 40, 40), (30, 30, 40, 40), (200, 100, 50, 50)]):
+        stream.paint(*rect, level=level)
+        message = stream.delta()
+        assert unpack_header(message)["frame_id"] == stream.frame_id
+        canvas = apply(canvas, message)
+
+    assert same_screen(canvas, stream.expected())
+    untouched = np.ones((HEIGHT, WIDTH), dtype=bool)
+    untouched[0:96, 0:96] = untouched[96:, 192:] = False  # 변경된 타일
+    assert np.array_equal(canvas[untouched], before[untouched])
+
+
+def test_deltas_merged_behind_pending_keyframe(stream):
+    """보내지 못한 키프레임 뒤에 델타 둘이 하나로 병합되고, 복원한 화면은 마지막 프레임과 같음"""
+    subscriber = StreamSubscriber(binary=True, delta=True)
+    assert subscriber.offer(stream.keyframe(), keyframe=True)
+    stream.paint(40, 10, 60, 10, level=255)
+    assert subscriber.offer(stream.delta(), keyframe=False)
+    stream.paint(50, 15, 100, 60, level=160)  # 앞 델타와 겹치는 영역을 다시 바꿈
+    last = stream.delta()
+    assert subscriber.offer(last, keyframe=False)
+
+    assert subscriber.frames_merged == 1
+    assert subscriber.frames_dropped == 0
+    message, _ = subscriber.take()
+    assert unpack_header(message)["kind"] == KIND_FRAME
+    merged, _ = subscriber.take()
+    assert merged[:HEADER.size] == last[:HEADER.size]  # 헤더는 새 델타를 따름
+    assert same_screen(drain(subscriber, apply(apply(None, message), merged)), stream.expected())
+
+
+def test_deltas_merged_into_pending_delta(stream):
+    """키프레임을 보낸 뒤 밀린 델타 여러 개가 한 칸에 병합되고, 그것만으로 마지막 화면 복원"""
+    subscriber = StreamSubscriber(binary=True, delta=True)
+    subscriber.offer(stream.keyframe(), keyframe=True)
+    canvas = drain(subscriber)
+
+    for level, rect in zip((60, 120, 220), [(0, 0, 40, 40), (30, 30, 40, 40), (200, 100, 50, 50)]):
+        stream.paint(*rect, level=level)
+        assert subscriber.offer(stream.delta(), keyframe=False)
+
+    assert subscriber.frames_merged == 2
+    message, _ = subscriber.take()
+    assert not subscriber.has_pending
+    assert unpack_header(message)["frame_id"] == stream.frame_id
+    assert same_screen(apply(canvas, message), stream.expected())
+
+
+def test_merge_too_large_resyncs(stream, monkeypatch):
+    """병합 결과가 너무 크면 대기 중인 델타를 버리고 다음 키프레임까지 델타를 받지 않음"""
+    monkeypatch.setattr(broadcaster, "MAX_MERGED_BYTES", 1)
+    subscriber = StreamSubscriber(binary=True, delta=True)
+    subscriber.offer(stream.keyframe(), keyframe=True)
+    drain(subscriber)
+    stream.paint(0, 0, 40, 40, level=255)
+    assert subscriber.offer(stream.delta(), keyframe=False)
+    stream.paint(100, 0, 40, 40, level=160)
+
+    assert not subscriber.offer(stream.delta(), keyframe=False)
+    assert subscriber.awaiting_keyframe
+    assert not subscriber.has_pending
+    stream.paint(200, 0, 40, 40, level=40)
+    assert not subscriber.offer(stream.delta(), keyframe=False)
+    assert subscriber.offer(stream.keyframe(), keyframe=True)
+    assert same_screen(drain(subscriber), stream.expected())
+
+
+def test_merge_tile_messages_rejects_other_kinds(stream):
+    """전체 프레임과는 병합하지 않음"""
+    key = stream.keyframe()
+    stream.paint(0, 0, 10, 10, level=255)
+    delta = stream.delta()
+    assert merge_tile_messages(key, delta) is None
+    assert merge_tile_messages(delta, key) is None
+    merged = merge_tile_messages(delta, delta)
+    assert len(unpack_tiles(merged[HEADER.size:])) == 2
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+이미지 인코더 벤치마크
+샘플 프레임으로 인코더별 프레임당 인코딩 시간(ms)과 크기(bytes)를 측정합니다.
+호스트마다 SCREEN_FORMAT을 고를 때 사용하세요.
+
+사용법:
+    python tools/encode_benchmark.py                       # data/*.png
+    python tools/encode_benchmark.py shot1.png shot2.png --quality 60 --repeat 20
+    python tools/encode_benchmark.py --formats JPEG,TURBOJPEG
+    python tools/encode_benchmark.py --alloc --scale 0.5     # 프레임당 할당량 측정
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.encoders import ENCODERS, PillowJpegEncoder  # noqa: E402
+from src.server.frame_scaler import FrameScaler, FrameSurface  # noqa: E402
+
+
+class OptimizedJpegEncoder(PillowJpegEncoder):
+    """비교용: 이전 방식 (optimize=True)"""
+
+    name = "JPEG+optimize"
+
+    def encode(self, surface: FrameSurface, quality: int) -> bytes:
+        return self._save(self._decode(surface), format="JPEG", quality=quality, optimize=True)
+
+
+def load_frame(path: str):
+    """이미지 파일을 캡처 버퍼(mss BGRA)와 같은 형태의 RawFrame 대용 객체로 로드"""
+    rgba = np.asarray(Image.open(path).convert("RGBA"))
+    bgrx = np.ascontiguousarray(rgba[..., [2, 1, 0, 3]])
+    height, width = bgrx.shape[:2]
+    return SimpleNamespace(shot=SimpleNamespace(raw=bgrx.tobytes()), width=width, height=height)
+
+
+def benchmark(encoder, frames, quality: int, repeat: int, scale: float):
+    """(프레임당 평균 ms, 프레임당 평균 bytes) - 축소 시간 포함"""
+    scalers = [FrameScaler() for _ in frames]  # 스트림마다 해상도가 고정이므로 프레임별 축소기
+    encoder.encode(scalers[0].surface(frames[0], scale), quality)  # 워밍업
+    total_ms = 0.0
+    total_bytes = 0
+    for _ in range(repeat):
+        for frame, scaler in zip(frames, scalers):
+            start = time.perf_counter()
+            data = encoder.encode(scaler.surface(frame, scale), quality)
+            total_ms += (time.perf_counter() - start) * 1000
+            total_bytes += len(data)
+    count = repeat * len(frames)
+    return total_ms / count, total_bytes / count
+
+
+def measure_allocations(encoder, frames, quality: int, repeat: int, scale: float):
+    """
+    (프레임당 최대 Python/NumPy 할당 KB, 프레임당 새 Pillow 이미지 수)
+
+    tracemalloc은 Pillow 내부 이미지 메모리를 보지 못하므로 Pillow 할당은
+    Image.core.get_stats()의 new_count로 따로 센다. 결과 바이트 자체도 할당량에 포함된다.
+    """
+    scalers = [FrameScaler() for _ in frames]
+    for frame, scaler in zip(frames, scalers):
+        encoder.encode(scaler.surface(frame, scale), quality)  # 재사용 버퍼 워밍업
+
+    peak_total = 0
+    images_before = Image.core.get_stats()["new_count"]
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            for frame, scaler in zip(frames, scalers):
+                tracemalloc.reset_peak()
+                current, _ = tracemalloc.get_traced_memory()
+                data = encoder.encode(scaler.surface(frame, scale), quality)
+                peak_total += tracemalloc.get_traced_memory()[1] - current
+                del data
+    finally:
+        tracemalloc.stop()
+    count = repeat * len(frames)
+    images = Image.core.get_stats()["new_count"] - images_before
+    return peak_total / count / 1024, images / count
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Image encoder benchmark")
+    parser.add_argument("images", nargs="*", help="샘플 프레임 이미지 (기본값: data/*.png)")
+    parser.add_argument("--quality", type=int, default=70, help="인코딩 품질 (기본값: 70)")
+    parser.add_argument("--repeat", type=int, default=10, help="반복 횟수 (기본값: 10)")
+    parser.add_argument("--formats", default=",".join(ENCODERS), help="측정할 인코더 (쉼표 구분)")
+    parser.add_argument("--scale", type=float, default=1.0, help="인코딩 전 축소 배율 (기본값: 1.0)")
+    parser.add_argument("--alloc", action="store_true", help="프레임당 메모리 할당량도 측정")
+    args = parser.parse_args()
+
+    paths = args.images or sorted(glob.glob(os.path.join(root, "data", "*.png")))
+    if not paths:
+        print("샘플 프레임이 없습니다.")
+        sys.exit(1)
+
+    frames = [load_frame(path) for path in paths]
+    sizes = ", ".join(f"{f.width}x{f.height}" for f in frames)
+    print(f"{len(frames)} frames ({sizes}), quality {args.quality}, scale {args.scale}, repeat {args.repeat}\n")
+    header = f"{'Encoder':<16}{'ms/frame':>10}{'bytes/frame':>14}"
+    if args.alloc:
+        header += f"{'peak KB/frame':>16}{'PIL images/frame':>18}"
+    print(header)
+
+    encoders = [OptimizedJpegEncoder()]
+    for name in args.formats.split(","):
+        cls = ENCODERS.get(name.strip().upper())
+        if cls is None:
+            print(f"{name:<16}{'unknown':>10}")
+            continue
+        try:
+            encoders.append(cls())
+        except Exception as e:
+            print(f"{cls.name:<16}{'n/a':>10}  ({e})")
+
+    for encoder in encoders:
+        ms, size = benchmark(encoder, frames, args.quality, args.repeat, args.scale)
+        line = f"{encoder.name:<16}{ms:>10.2f}{size:>14.0f}"
+        if args.alloc:
+            peak_kb, images = measure_allocations(encoder, frames, args.quality, args.repeat, args.scale)
+            line += f"{peak_kb:>16.1f}{images:>18.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
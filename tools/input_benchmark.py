@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+입력 백엔드 벤치마크
+같은 액션 스크립트를 백엔드별로 실행해 액션 종류별 실행 시간(p50/p99 ms)을 측정합니다.
+INPUT_BACKEND를 고를 때 사용하세요. recording 외의 백엔드는 실제로 마우스/키보드를 움직입니다.
+
+사용법:
+    python tools/input_benchmark.py                                 # recording만
+    python tools/input_benchmark.py --backends pyautogui,xtest --repeat 5
+"""
+import argparse
+import os
+import sys
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.action_handler import ActionHandler  # noqa: E402
+from src.server.input_backends import BACKENDS  # noqa: E402
+from src.server.models import ActionRequest  # noqa: E402
+
+# 화면 좌상단 200x200 안에서만 움직이는 스크립트 (입력 필드 없이도 안전한 키만 사용)
+SCRIPT = [
+    ActionRequest(action_type="hover", x=100, y=100),
+    ActionRequest(action_type="click", x=120, y=100),
+    ActionRequest(action_type="double_click", x=120, y=120),
+    ActionRequest(action_type="drag", start_x=100, start_y=100, end_x=180, end_y=160),
+    ActionRequest(action_type="scroll", x=100, y=100, direction="down"),
+    ActionRequest(action_type="scroll", x=100, y=100, direction="up"),
+    ActionRequest(action_type="hotkey", key="shift"),
+]
+
+
+def benchmark(backend, repeat: int) -> int:
+    """스크립트를 repeat번 실행 (실패한 액션 수 반환, 시간은 backend.latency에 기록됨)"""
+    handler = ActionHandler(200, 200, backend=backend)
+    failures = 0
+    for _ in range(repeat):
+        for action in SCRIPT:
+            try:
+                handler._execute(action)
+            except Exception:
+                failures += 1
+    return failures
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Input backend benchmark")
+    parser.add_argument("--backends", default="recording", help=f"측정할 백엔드 (쉼표 구분: {','.join(BACKENDS)})")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수 (기본값: 20)")
+    args = parser.parse_args()
+
+    print(f"{len(SCRIPT)} actions, repeat {args.repeat}\n")
+    print(f"{'backend':<12}{'action':<14}{'count':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+
+    for name in args.backends.split(","):
+        cls = BACKENDS.get(name.strip().lower())
+        if cls is None:
+            print(f"{name:<12}unknown")
+            continue
+        try:
+            backend = cls()
+        except Exception as e:
+            print(f"{cls.name:<12}n/a  ({e})")
+            continue
+        try:
+            failures = benchmark(backend, args.repeat)
+        finally:
+            backend.close()
+        for action_type, stats in backend.latency.get_stats().items():
+            print(
+                f"{backend.name:<12}{action_type:<14}{stats['count']:>7}"
+                f"{stats['p50']:>10.2f}{stats['p99']:>10.2f}{stats['max']:>10.2f}"
+            )
+        if failures:
+            print(f"{backend.name:<12}{failures} actions failed")
+
+
+if __name__ == "__main__":
+    main()